@@ -0,0 +1,73 @@
+"""
+Import-time benchmark
+======================
+Measures cold-start time: how long a fresh Python process takes to import a
+module. Each run is a new interpreter, so nothing is cached in memory.
+
+By default it times `config` (should be near-instant: no client, no SDK
+imports) and `project.main` (the pipeline entry point), and lists the
+slowest imports reported by `python -X importtime`.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 20 project.main lessons_module
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def time_import(module: str, runs: int) -> list[float]:
+    """Wall-clock seconds to import `module` in `runs` fresh interpreters."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def slowest_imports(module: str, top: int) -> list[tuple[int, str]]:
+    """The `top` imports with the largest cumulative time (microseconds)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Only report the module and its direct imports (2 spaces per nesting level)
+        if len(name) - len(name.lstrip()) <= 3:
+            rows.append((int(parts[1]), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time.")
+    parser.add_argument("modules", nargs="*", default=["config", "project.main"])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_import("sys", args.runs))
+    print(f"Interpreter startup (median of {args.runs}): {baseline * 1000:.0f} ms\n")
+
+    for module in args.modules:
+        timings = time_import(module, args.runs)
+        median = statistics.median(timings)
+        print(f"import {module}")
+        print(f"  median {median * 1000:.0f} ms · min {min(timings) * 1000:.0f} ms · "
+              f"max {max(timings) * 1000:.0f} ms · over startup {(median - baseline) * 1000:.0f} ms")
+        for cumulative, name in slowest_imports(module, args.top):
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        print()
@@ -0,0 +1,71 @@
+"""
+Search backend benchmark
+========================
+Times a batch of queries against the local stand-in search API
+(project/tools/search_server.py), which adds a fixed latency per request:
+
+  • naive   — one query after another, a new HTTP client (and connection)
+              per query
+  • pooled  — HttpBackend: shared keep-alive pool, queries in parallel up
+              to --concurrency
+
+Usage:
+    python benchmarks/search_backend_bench.py
+    python benchmarks/search_backend_bench.py --queries 64 --latency 0.2 --fail-rate 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import httpx  # noqa: E402
+
+from project.tools.search_backends import HttpBackend  # noqa: E402
+from project.tools.search_server import start_server  # noqa: E402
+
+TOPICS = ["quantum computing", "renewable energy", "artificial intelligence", "energy storage"]
+
+
+async def naive(url: str, queries: list[str], k: int) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{url}/search", params={"q": query, "k": k})
+            response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def pooled(url: str, queries: list[str], k: int, concurrency: int) -> tuple[float, dict]:
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency)) as client:
+        backend = HttpBackend(url, client=client, concurrency=concurrency, retries=3)
+        started = time.perf_counter()
+        await backend.search_many(queries, k)
+        return time.perf_counter() - started, backend.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark naive vs pooled HTTP search.")
+    parser.add_argument("--queries", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.1, help="Server latency per request, seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of 503s (pooled run only)")
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    queries = [f"{TOPICS[i % len(TOPICS)]} {i}" for i in range(args.queries)]
+
+    server = start_server(latency=args.latency)
+    naive_seconds = asyncio.run(naive(server.url, queries, args.k))
+    server.fail_rate = args.fail_rate
+    pooled_seconds, stats = asyncio.run(pooled(server.url, queries, args.k, args.concurrency))
+    server.shutdown()
+
+    print(f"{args.queries} queries, {args.latency * 1000:.0f} ms server latency")
+    print(f"  naive   {naive_seconds:6.2f} s  ({naive_seconds / args.queries * 1000:.0f} ms/query)")
+    print(f"  pooled  {pooled_seconds:6.2f} s  ({pooled_seconds / args.queries * 1000:.0f} ms/query), "
+          f"{stats['requests']} requests, {stats['retried']} retries")
+    print(f"  speedup {naive_seconds / pooled_seconds:.1f}x")
@@ -0,0 +1,122 @@
+"""
+Search benchmark
+================
+Compares query latency of the BM25 inverted index (project/tools/search_index.py)
+with the linear substring scan web_search used before, on synthetic corpora.
+
+Documents are made of words drawn from a Zipf-like vocabulary, so a few
+words are very common and most are rare — roughly like real text. Queries
+are 2-3 words picked uniformly from the vocabulary, i.e. mostly specific
+content words, like real searches. Pass --zipf-queries to draw them like
+document text instead (common words behave like stopwords and are slow for
+both approaches).
+
+The scan is the old algorithm applied per document: walk the corpus and
+keep every document containing any query word as a substring, stopping once
+k are found. It gets pre-lowercased text for free and does no ranking, but
+has to touch most of the corpus whenever the query words are rare.
+
+Usage:
+    python benchmarks/search_bench.py
+    python benchmarks/search_bench.py --sizes 10000 100000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from project.tools.search_index import SearchIndex  # noqa: E402
+
+
+def make_vocabulary(size: int, rng: random.Random) -> tuple[list[str], list[float]]:
+    """`size` pseudo-words and cumulative Zipf weights for sampling them."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(letters, k=rng.randint(4, 10))))
+    cumulative, total = [], 0.0
+    for rank in range(1, size + 1):
+        total += 1 / rank
+        cumulative.append(total)
+    return list(words), cumulative
+
+
+def make_corpus(n: int, vocabulary, rng: random.Random) -> list[dict]:
+    words, cumulative = vocabulary
+    return [
+        {
+            "title": " ".join(rng.choices(words, cum_weights=cumulative, k=6)),
+            "snippet": " ".join(rng.choices(words, cum_weights=cumulative, k=30)),
+        }
+        for _ in range(n)
+    ]
+
+
+def linear_scan(texts: list[str], query: str, k: int) -> list[int]:
+    """The pre-index algorithm: substring match on any query word, first k wins."""
+    words = query.lower().split()
+    found = []
+    for doc_id, text in enumerate(texts):
+        if any(word in text for word in words):
+            found.append(doc_id)
+            if len(found) == k:
+                break
+    return found
+
+
+def time_queries(search, queries: list[str]) -> list[float]:
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(label: str, timings: list[float]) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (f"  {label:<6} mean {statistics.mean(timings) * 1000:9.3f} ms · "
+            f"p50 {statistics.median(timings) * 1000:9.3f} ms · p95 {p95 * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BM25 index vs linear scan.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--zipf-queries", action="store_true",
+                        help="Sample query words with document word frequencies")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    words, cumulative = vocabulary
+    weights = cumulative if args.zipf_queries else None
+    queries = [" ".join(rng.choices(words, cum_weights=weights, k=rng.randint(2, 3)))
+               for _ in range(args.queries)]
+
+    for n in args.sizes:
+        corpus = make_corpus(n, vocabulary, rng)
+        print(f"{n:,} documents")
+
+        started = time.perf_counter()
+        index = SearchIndex()
+        index.extend(corpus)
+        print(f"  index built in {time.perf_counter() - started:.1f} s")
+
+        texts = [f"{d['title']} {d['snippet']}".lower() for d in corpus]
+        scan = time_queries(lambda q: linear_scan(texts, q, args.k), queries)
+        bm25 = time_queries(lambda q: index.search(q, args.k), queries)
+        print(summarize("scan", scan))
+        print(summarize("bm25", bm25))
+        print(f"  speedup (mean) {statistics.mean(scan) / statistics.mean(bm25):.1f}x\n")
+
+        del corpus, texts, index
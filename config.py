@@ -4,67 +4,509 @@ All lessons import from here so you configure Azure OpenAI once.
 
 This uses the Chat Completions API path, which is widely supported
 across all Azure OpenAI deployments and API versions.
+
+Importing this module is cheap and has no side effects: .env is read, the
+settings are checked, and the Azure client is created the first time a model
+is actually called (or a setting is read). Missing settings raise ConfigError
+instead of exiting the process, so the pipeline can be embedded in workers
+and tests.
 """
 
+import logging
 import os
-import sys
 
-from dotenv import load_dotenv
+logger = logging.getLogger(__name__)
 
-# Load .env from project root (works from any lesson subfolder)
 _root = os.path.dirname(os.path.abspath(__file__))
-load_dotenv(os.path.join(_root, ".env"))
-
-# Suppress "OPENAI_API_KEY is not set, skipping trace export" warning.
-# We're using Azure, not a direct OpenAI key.
-if not os.environ.get("OPENAI_API_KEY"):
-    os.environ["OPENAI_API_KEY"] = "unused"
-
-from openai import AsyncAzureOpenAI
-from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
-from agents import set_tracing_disabled
-
-# Disable tracing export to OpenAI (we're using Azure, not an OpenAI API key).
-# Re-enable this if you set up a custom tracing backend.
-set_tracing_disabled(True)
-
-# ── Azure OpenAI settings ───────────────────────────────────────────
-AZURE_OPENAI_ENDPOINT = os.environ.get("AZURE_OPENAI_ENDPOINT", "")
-AZURE_OPENAI_API_KEY = os.environ.get("AZURE_OPENAI_API_KEY", "")
-AZURE_OPENAI_API_VERSION = os.environ.get("AZURE_OPENAI_API_VERSION", "2025-03-01-preview")
-AZURE_OPENAI_DEPLOYMENT = os.environ.get("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
-
-if not AZURE_OPENAI_ENDPOINT or not AZURE_OPENAI_API_KEY:
-    print("ERROR: Missing Azure OpenAI configuration.")
-    print("Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY in your .env file.")
-    print("See .env.example for details.")
-    sys.exit(1)
-
-# ── Create the Azure OpenAI async client ─────────────────────────────
-_client = AsyncAzureOpenAI(
-    api_key=AZURE_OPENAI_API_KEY,
-    api_version=AZURE_OPENAI_API_VERSION,
-    azure_endpoint=AZURE_OPENAI_ENDPOINT,
-)
+
+
+class ConfigError(RuntimeError):
+    """Raised when the Azure OpenAI configuration is missing or invalid."""
+
+
+# ── Settings ────────────────────────────────────────────────────────
+# name -> (environment variable, default). Read lazily via config.<name>.
+_SETTINGS = {
+    # Azure OpenAI settings
+    "AZURE_OPENAI_ENDPOINT": ("AZURE_OPENAI_ENDPOINT", ""),
+    "AZURE_OPENAI_API_KEY": ("AZURE_OPENAI_API_KEY", ""),
+    "AZURE_OPENAI_API_VERSION": ("AZURE_OPENAI_API_VERSION", "2025-03-01-preview"),
+    "AZURE_OPENAI_DEPLOYMENT": ("AZURE_OPENAI_DEPLOYMENT", "gpt-4o"),
+    # Several endpoints/deployments to load-balance across (JSON list, inline or
+    # in a file). When set, MODEL spreads calls over them with failover.
+    "AZURE_OPENAI_ENDPOINTS": ("AZURE_OPENAI_ENDPOINTS", ""),
+    "AZURE_OPENAI_ENDPOINTS_FILE": ("AZURE_OPENAI_ENDPOINTS_FILE", ""),
+    "BALANCE_STRATEGY": ("AZURE_OPENAI_BALANCE", "least_outstanding"),
+    "BALANCE_COOLDOWN": ("AZURE_OPENAI_COOLDOWN", "30"),
+    # Client-side quota per deployment (0 = no limit). Endpoint entries in
+    # AZURE_OPENAI_ENDPOINTS can override these with "rpm" / "tpm".
+    "RATE_LIMIT_RPM": ("AZURE_OPENAI_RPM", "0"),
+    "RATE_LIMIT_TPM": ("AZURE_OPENAI_TPM", "0"),
+    # Adaptive (AIMD) cap on in-flight calls per deployment, driven by latency and 429s
+    "ADAPTIVE_CONCURRENCY": ("AZURE_OPENAI_ADAPTIVE_CONCURRENCY", "0"),
+    "ADAPTIVE_INITIAL": ("AZURE_OPENAI_ADAPTIVE_INITIAL", "8"),
+    "ADAPTIVE_MIN": ("AZURE_OPENAI_ADAPTIVE_MIN", "1"),
+    "ADAPTIVE_MAX": ("AZURE_OPENAI_ADAPTIVE_MAX", "256"),
+    # Persistent response cache (SQLite). By default only temperature=0 calls
+    # are served from it; LLM_CACHE_MODE=always caches everything.
+    "LLM_CACHE": ("LLM_CACHE", "0"),
+    "LLM_CACHE_PATH": ("LLM_CACHE_PATH", os.path.join(_root, ".cache", "llm_responses.sqlite3")),
+    "LLM_CACHE_MODE": ("LLM_CACHE_MODE", "deterministic"),
+    "LLM_CACHE_TTL": ("LLM_CACHE_TTL", str(7 * 24 * 3600)),
+    "LLM_CACHE_MAX_MB": ("LLM_CACHE_MAX_MB", "512"),
+    # Search corpus for the web_search tool (JSONL), and an optional prebuilt
+    # memory-mapped index of it (python -m project.tools.corpus build ...)
+    "SEARCH_CORPUS": ("SEARCH_CORPUS", os.path.join(_root, "project", "data", "search_corpus.jsonl")),
+    "SEARCH_INDEX": ("SEARCH_INDEX", os.path.join(_root, "project", "data", "search_index")),
+    # keyword (BM25), semantic (NumPy embeddings) or hybrid (both, fused)
+    "SEARCH_MODE": ("SEARCH_MODE", "keyword"),
+    # Where web_search gets results: the local corpus, or an HTTP search API
+    "SEARCH_BACKEND": ("SEARCH_BACKEND", "local"),
+    "SEARCH_API_URL": ("SEARCH_API_URL", ""),
+    "SEARCH_API_KEY": ("SEARCH_API_KEY", ""),
+    "SEARCH_TIMEOUT": ("SEARCH_TIMEOUT", "10"),
+    "SEARCH_RETRIES": ("SEARCH_RETRIES", "2"),
+    "SEARCH_CONCURRENCY": ("SEARCH_CONCURRENCY", "16"),
+    # Search result cache: seconds a result stays fresh, and how many are kept
+    "SEARCH_CACHE_TTL": ("SEARCH_CACHE_TTL", "300"),
+    "SEARCH_CACHE_SIZE": ("SEARCH_CACHE_SIZE", "1024"),
+    # Research notes kept across runs (SQLite, opt-in), and how long they
+    # count as fresh enough to skip the research phase
+    "RESEARCH_STORE": ("RESEARCH_STORE", "0"),
+    "RESEARCH_STORE_PATH": ("RESEARCH_STORE_PATH", os.path.join(_root, ".cache", "research.sqlite3")),
+    "RESEARCH_MAX_AGE": ("RESEARCH_MAX_AGE", str(7 * 24 * 3600)),
+    # Revise → re-review loop after the first review. It stops early on a
+    # "publish" verdict or once the score gains less than REVISION_MIN_GAIN;
+    # token and time budgets are off when 0.
+    "REVISION_MAX_ITERATIONS": ("REVISION_MAX_ITERATIONS", "2"),
+    "REVISION_MAX_TOKENS": ("REVISION_MAX_TOKENS", "0"),
+    "REVISION_MAX_SECONDS": ("REVISION_MAX_SECONDS", "0"),
+    "REVISION_MIN_GAIN": ("REVISION_MIN_GAIN", "0.5"),
+    # What the project's handoffs pass on to the next agent (lab/handoff_filters.py):
+    # comma-separated drop_tools, last_turns:N, summary[:CHARS]; "none" = everything
+    "HANDOFF_FILTER": ("HANDOFF_FILTER", "drop_tools,last_turns:4"),
+    # HTTP transport settings. One connection pool is shared by every model.
+    # Under high concurrency a bigger keep-alive pool avoids re-doing TCP + TLS
+    # handshakes per LLM call.
+    "HTTP_MAX_CONNECTIONS": ("AZURE_OPENAI_MAX_CONNECTIONS", "100"),
+    "HTTP_MAX_KEEPALIVE": ("AZURE_OPENAI_MAX_KEEPALIVE", "50"),
+    "HTTP_KEEPALIVE_EXPIRY": ("AZURE_OPENAI_KEEPALIVE_EXPIRY", "60"),
+    "HTTP_TIMEOUT": ("AZURE_OPENAI_TIMEOUT", "120"),
+    "HTTP_CONNECT_TIMEOUT": ("AZURE_OPENAI_CONNECT_TIMEOUT", "10"),
+    "HTTP2": ("AZURE_OPENAI_HTTP2", "1"),
+    # Open connections at startup so the TLS handshake is off the critical path
+    "WARMUP": ("AZURE_OPENAI_WARMUP", "0"),
+}
+
+_INT_SETTINGS = {
+    "HTTP_MAX_CONNECTIONS", "HTTP_MAX_KEEPALIVE", "RATE_LIMIT_RPM", "RATE_LIMIT_TPM",
+    "ADAPTIVE_INITIAL", "ADAPTIVE_MIN", "ADAPTIVE_MAX", "SEARCH_CACHE_SIZE",
+    "SEARCH_RETRIES", "SEARCH_CONCURRENCY", "REVISION_MAX_ITERATIONS", "REVISION_MAX_TOKENS",
+}
+_FLOAT_SETTINGS = {
+    "HTTP_KEEPALIVE_EXPIRY", "HTTP_TIMEOUT", "HTTP_CONNECT_TIMEOUT", "BALANCE_COOLDOWN",
+    "LLM_CACHE_TTL", "LLM_CACHE_MAX_MB", "SEARCH_CACHE_TTL", "SEARCH_TIMEOUT",
+    "RESEARCH_MAX_AGE", "REVISION_MAX_SECONDS", "REVISION_MIN_GAIN",
+}
+_FLAG_SETTINGS = {"HTTP2", "WARMUP", "ADAPTIVE_CONCURRENCY", "LLM_CACHE", "RESEARCH_STORE"}
+
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load .env from the project root (works from any lesson subfolder). Runs once."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv(os.path.join(_root, ".env"))
+
+    # Suppress "OPENAI_API_KEY is not set, skipping trace export" warning.
+    # We're using Azure, not a direct OpenAI key.
+    if not os.environ.get("OPENAI_API_KEY"):
+        os.environ["OPENAI_API_KEY"] = "unused"
+    _env_loaded = True
+
+
+def setting(name: str):
+    """Read one setting (loading .env first), converted to its proper type."""
+    env_var, default = _SETTINGS[name]
+    load_env()
+    raw = os.environ.get(env_var, default)
+    try:
+        if name in _INT_SETTINGS:
+            return int(raw)
+        if name in _FLOAT_SETTINGS:
+            return float(raw)
+    except ValueError:
+        raise ConfigError(f"{env_var} must be a number, got {raw!r}") from None
+    if name in _FLAG_SETTINGS:
+        return raw.lower() in ("1", "true", "yes")
+    return raw
+
+
+def endpoint_settings() -> list[dict]:
+    """The load-balanced endpoints from AZURE_OPENAI_ENDPOINTS(_FILE), if any.
+
+    Each entry is an object with "endpoint" and optional "api_key",
+    "deployment", "api_version", "name", "rpm" and "tpm". Missing fields fall
+    back to the single-endpoint AZURE_OPENAI_* settings.
+    """
+    import json
+
+    raw = setting("AZURE_OPENAI_ENDPOINTS")
+    path = setting("AZURE_OPENAI_ENDPOINTS_FILE")
+    if not raw and path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw = f.read()
+        except OSError as e:
+            raise ConfigError(f"Cannot read AZURE_OPENAI_ENDPOINTS_FILE: {e}") from None
+    if not raw:
+        return []
+
+    try:
+        entries = json.loads(raw)
+    except ValueError as e:
+        raise ConfigError(f"AZURE_OPENAI_ENDPOINTS is not valid JSON: {e}") from None
+    if not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+        raise ConfigError("AZURE_OPENAI_ENDPOINTS must be a JSON list of objects")
+
+    def limit(i: int, entry: dict, field: str, default: str) -> int:
+        value = entry.get(field) or setting(default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ConfigError(f"AZURE_OPENAI_ENDPOINTS[{i}].{field} must be an integer, got {value!r}") from None
+
+    resolved = []
+    for i, entry in enumerate(entries):
+        if not entry.get("endpoint"):
+            raise ConfigError(f"Endpoint entry without an 'endpoint' URL: {entry}")
+        item = {
+            "endpoint": entry["endpoint"],
+            "api_key": entry.get("api_key") or setting("AZURE_OPENAI_API_KEY"),
+            "deployment": entry.get("deployment") or setting("AZURE_OPENAI_DEPLOYMENT"),
+            "api_version": entry.get("api_version") or setting("AZURE_OPENAI_API_VERSION"),
+            "rpm": limit(i, entry, "rpm", "RATE_LIMIT_RPM"),
+            "tpm": limit(i, entry, "tpm", "RATE_LIMIT_TPM"),
+        }
+        if not item["api_key"]:
+            raise ConfigError(f"No api_key for endpoint {item['endpoint']}")
+        item["name"] = entry.get("name") or f"{item['endpoint'].rstrip('/')}/{item['deployment']}"
+        resolved.append(item)
+    return resolved
+
+
+def validate_config() -> None:
+    """Raise ConfigError if the required Azure OpenAI settings are missing."""
+    if endpoint_settings():
+        return
+    if not setting("AZURE_OPENAI_ENDPOINT") or not setting("AZURE_OPENAI_API_KEY"):
+        raise ConfigError(
+            "Missing Azure OpenAI configuration. "
+            "Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY in your .env file. "
+            "See .env.example for details."
+        )
+
+
+# ── HTTP + Azure OpenAI clients (built on first use) ────────────────
+_http_client = None
+_endpoint_clients: dict = {}
+_http2 = False  # Whether the shared client actually negotiates HTTP/2
+_client = None
+
+
+def make_http_client():
+    """A new pooled httpx.AsyncClient with the HTTP_* settings.
+
+    An AsyncClient's connections belong to the event loop that opened them, so
+    code that outlives one asyncio.run (e.g. a cached search backend) builds
+    one per loop with this.
+    """
+    global _http2
+    import httpx
+
+    http2 = setting("HTTP2")
+    if http2:
+        try:
+            import h2  # noqa: F401 — HTTP/2 support in httpx needs the h2 package
+        except ImportError:
+            logger.warning(
+                "AZURE_OPENAI_HTTP2 is on but 'h2' is not installed; using HTTP/1.1. "
+                "Install it with: pip install 'httpx[http2]'"
+            )
+            http2 = False
+
+    _http2 = http2
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=setting("HTTP_MAX_CONNECTIONS"),
+            max_keepalive_connections=setting("HTTP_MAX_KEEPALIVE"),
+            keepalive_expiry=setting("HTTP_KEEPALIVE_EXPIRY"),
+        ),
+        timeout=httpx.Timeout(setting("HTTP_TIMEOUT"), connect=setting("HTTP_CONNECT_TIMEOUT")),
+    )
+
+
+def get_http_client():
+    """The shared, pooled httpx.AsyncClient used for every LLM call."""
+    global _http_client
+    if _http_client is None:
+        _http_client = make_http_client()
+    return _http_client
+
+
+def get_client():
+    """The shared AsyncAzureOpenAI client. Raises ConfigError if settings are missing."""
+    global _client
+    if _client is None:
+        validate_config()
+        from openai import AsyncAzureOpenAI
+
+        _client = AsyncAzureOpenAI(
+            api_key=setting("AZURE_OPENAI_API_KEY"),
+            api_version=setting("AZURE_OPENAI_API_VERSION"),
+            azure_endpoint=setting("AZURE_OPENAI_ENDPOINT"),
+            http_client=get_http_client(),
+        )
+    return _client
+
+
+def _endpoint_client(entry: dict):
+    """An AsyncAzureOpenAI client for one load-balanced endpoint (cached).
+
+    These clients don't retry on their own: BalancedModel fails over to the
+    next endpoint instead of retrying a throttled one.
+    """
+    key = (entry["endpoint"], entry["api_key"], entry["api_version"])
+    client = _endpoint_clients.get(key)
+    if client is None:
+        from openai import AsyncAzureOpenAI
+
+        client = _endpoint_clients[key] = AsyncAzureOpenAI(
+            api_key=entry["api_key"],
+            api_version=entry["api_version"],
+            azure_endpoint=entry["endpoint"],
+            http_client=get_http_client(),
+            max_retries=0,
+        )
+    return client
+
 
 # ── Model wrapper for the Agents SDK ─────────────────────────────────
-# This wraps the Azure client so the Agents SDK can use it.
-# Pass MODEL to any Agent(model=MODEL, ...) definition.
-MODEL = OpenAIChatCompletionsModel(
-    model=AZURE_OPENAI_DEPLOYMENT,
-    openai_client=_client,
-)
+# get_model() wraps the Azure client so the Agents SDK can use it.
+# Pass MODEL (or get_model("other-deployment")) to any Agent(model=...) definition.
+# The returned model is lazy: nothing is built until the first LLM call.
+
+# One lazy model per get_model() argument, and one built model stack per
+# deployment (get_model() and get_model(<the default deployment>) share it),
+# all sharing the same client and connection pool
+_models: dict = {}
+_model_stacks: dict = {}
+
+# One rate limiter per (endpoint, deployment), shared by every model using it
+_rate_limiters: dict = {}
+
+
+# One AIMD concurrency controller per (endpoint, deployment)
+_controllers: dict = {}
+
 
+def _with_limits(model, endpoint: str, deployment: str, rpm: int, tpm: int):
+    """Wrap `model` in the shared limiters for its deployment, if configured.
 
-def get_model(deployment: str | None = None) -> OpenAIChatCompletionsModel:
+    The adaptive concurrency controller sits closest to the API so it sees the
+    raw latency and 429s; the RPM/TPM limiter sits outside it.
+    """
+    key = (endpoint, deployment)
+    if setting("ADAPTIVE_CONCURRENCY"):
+        from lab.concurrency import AdaptiveConcurrencyModel, AIMDController
+
+        controller = _controllers.get(key)
+        if controller is None:
+            controller = _controllers[key] = AIMDController(
+                initial=setting("ADAPTIVE_INITIAL"),
+                min_limit=setting("ADAPTIVE_MIN"),
+                max_limit=setting("ADAPTIVE_MAX"),
+                name=f"{endpoint.rstrip('/')}/{deployment}",
+            )
+        model = AdaptiveConcurrencyModel(model, controller)
+
+    if not rpm and not tpm:
+        return model
+    from lab.rate_limit import RateLimitedModel, RateLimiter
+
+    limiter = _rate_limiters.get(key)
+    if limiter is None:
+        limiter = _rate_limiters[key] = RateLimiter(
+            rpm=rpm, tpm=tpm, name=f"{endpoint.rstrip('/')}/{deployment}",
+        )
+    return RateLimitedModel(model, limiter)
+
+
+def rate_limit_stats() -> list[dict]:
+    """Queue depth and wait-time metrics of every active rate limiter."""
+    return [limiter.stats() for limiter in _rate_limiters.values()]
+
+
+def concurrency_stats() -> list[dict]:
+    """Current limit and decision counters of every adaptive concurrency controller."""
+    return [controller.stats() for controller in _controllers.values()]
+
+
+# The response cache, shared by every model (created on first use)
+_response_cache = None
+_caching_models: list = []
+
+
+def cache_stats() -> dict | None:
+    """Hit rate and size of the response cache (None if LLM_CACHE is off)."""
+    if _response_cache is None:
+        return None
+    return {
+        **_response_cache.stats(),
+        "skipped": sum(model.skipped for model in _caching_models),
+    }
+
+
+def _build_model(deployment: str | None):
+    """The full model stack for a deployment: cache → balancer → limits → API."""
+    model = _build_backend(deployment)
+    if not setting("LLM_CACHE"):
+        return model
+
+    global _response_cache
+    from lab.cache import MODES, CachingModel, ResponseCache
+
+    if setting("LLM_CACHE_MODE") not in MODES:
+        raise ConfigError(f"LLM_CACHE_MODE must be one of {MODES}")
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            setting("LLM_CACHE_PATH"),
+            ttl=setting("LLM_CACHE_TTL"),
+            max_bytes=int(setting("LLM_CACHE_MAX_MB") * 1024 * 1024),
+        )
+    model = CachingModel(
+        model, _response_cache,
+        deployment=deployment or setting("AZURE_OPENAI_DEPLOYMENT"),
+        mode=setting("LLM_CACHE_MODE"),
+    )
+    _caching_models.append(model)
+    return model
+
+
+def _build_backend(deployment: str | None):
+    from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
+
+    # Several endpoints configured: balance across those serving this deployment
+    entries = [
+        e for e in endpoint_settings()
+        if deployment is None or e["deployment"] == deployment
+    ]
+    if entries:
+        from lab.balancer import STRATEGIES, BalancedModel, Endpoint
+
+        if setting("BALANCE_STRATEGY") not in STRATEGIES:
+            raise ConfigError(f"AZURE_OPENAI_BALANCE must be one of {STRATEGIES}")
+
+        return BalancedModel(
+            [
+                Endpoint(
+                    name=e["name"],
+                    model=_with_limits(
+                        OpenAIChatCompletionsModel(model=e["deployment"], openai_client=_endpoint_client(e)),
+                        e["endpoint"], e["deployment"], e["rpm"], e["tpm"],
+                    ),
+                )
+                for e in entries
+            ],
+            strategy=setting("BALANCE_STRATEGY"),
+            cooldown=setting("BALANCE_COOLDOWN"),
+        )
+
+    deployment = deployment or setting("AZURE_OPENAI_DEPLOYMENT")
+    model = OpenAIChatCompletionsModel(
+        model=deployment,
+        openai_client=get_client(),
+    )
+    return _with_limits(
+        model, setting("AZURE_OPENAI_ENDPOINT"), deployment,
+        setting("RATE_LIMIT_RPM"), setting("RATE_LIMIT_TPM"),
+    )
+
+
+def get_model(deployment: str | None = None):
     """Get a model instance, optionally for a different deployment.
 
+    Models are cached, so every call for the same deployment returns the
+    same instance.
+
     Args:
         deployment: Azure deployment name. Defaults to AZURE_OPENAI_DEPLOYMENT.
     """
-    if deployment is None or deployment == AZURE_OPENAI_DEPLOYMENT:
-        return MODEL
-    return OpenAIChatCompletionsModel(
-        model=deployment,
-        openai_client=_client,
-    )
+    model = _models.get(deployment)
+    if model is None:
+        from agents import set_tracing_disabled
+        from lab.models import LazyModel
+
+        # Disable tracing export to OpenAI (we're using Azure, not an OpenAI API key).
+        # Re-enable this if you set up a custom tracing backend.
+        set_tracing_disabled(True)
+
+        model = _models[deployment] = LazyModel(lambda: _model_stack(deployment))
+    return model
+
+
+def _model_stack(deployment: str | None):
+    # Resolved on the first LLM call, not in get_model(), so that importing
+    # an agent (config.MODEL) still doesn't load .env
+    if deployment == setting("AZURE_OPENAI_DEPLOYMENT"):
+        deployment = None
+    stack = _model_stacks.get(deployment)
+    if stack is None:
+        stack = _model_stacks[deployment] = _build_model(deployment)
+    return stack
+
+
+async def warm_up(connections: int = 1, force: bool = False) -> None:
+    """Open pooled connections to the endpoint(s) before the first LLM call.
+
+    Does nothing unless AZURE_OPENAI_WARMUP is set (or force=True).
+
+    Any HTTP response (even a 404) means TCP + TLS are done and the connection
+    is parked in the keep-alive pool. With HTTP/2 one connection is enough;
+    with HTTP/1.1 pass the number of calls you expect to run at once.
+
+    Args:
+        connections: How many connections to open concurrently.
+        force: Warm up even if AZURE_OPENAI_WARMUP is off.
+    """
+    if not (force or setting("WARMUP")):
+        return
+    import asyncio
+    import httpx
+
+    validate_config()
+    client = get_http_client()
+    endpoints = [e["endpoint"] for e in endpoint_settings()] or [setting("AZURE_OPENAI_ENDPOINT")]
+    count = 1 if _http2 else max(1, min(connections, setting("HTTP_MAX_KEEPALIVE")))
+
+    async def touch(endpoint):
+        try:
+            await client.get(endpoint)
+        except httpx.HTTPError:
+            pass  # Warm-up is best effort; the real call will report errors
+
+    await asyncio.gather(*(touch(endpoint) for endpoint in endpoints for _ in range(count)))
+
+
+def __getattr__(name: str):
+    # Lazy module attributes: config.MODEL and every name in _SETTINGS
+    if name == "MODEL":
+        return get_model()
+    if name in _SETTINGS:
+        return setting(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+"""
+Load balancing and failover across several model endpoints.
+
+BalancedModel is a Model that owns a list of endpoints (e.g. the same GPT-4o
+deployment in three Azure regions) and sends each call to one of them:
+
+  • "least_outstanding" — the endpoint with the fewest calls in flight
+  • "latency"           — the endpoint with the best recent latency,
+                          weighted by how busy it is
+
+If a call fails with a 429, a 5xx, a timeout or a connection error, the
+endpoint is ejected for a cooldown period and the call is retried on the
+next endpoint, so the caller never sees the failure unless every endpoint
+fails. Streaming calls only fail over before the first event is yielded.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+import openai
+from agents.models.interface import Model
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("least_outstanding", "latency")
+
+
+@dataclass
+class Endpoint:
+    """One backend of a BalancedModel, plus its live health statistics."""
+
+    name: str
+    model: Model
+    outstanding: int = 0  # Calls currently in flight
+    latency: float | None = None  # Exponentially weighted moving average, seconds
+    unhealthy_until: float = 0.0  # time.monotonic() when the cooldown ends
+    calls: int = 0
+    failures: int = 0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for errors another endpoint might not have: 429, 5xx, timeouts, connection errors."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class BalancedModel(Model):
+    """A Model that spreads calls over several endpoints with failover."""
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        strategy: str = "least_outstanding",
+        cooldown: float = 30.0,
+        latency_alpha: float = 0.3,
+    ):
+        """
+        Args:
+            endpoints: The endpoints to balance across (at least one).
+            strategy: "least_outstanding" or "latency".
+            cooldown: Seconds an endpoint is skipped after a retryable failure.
+            latency_alpha: Weight of the newest sample in the latency average.
+        """
+        if not endpoints:
+            raise ValueError("BalancedModel needs at least one endpoint")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}; expected one of {STRATEGIES}")
+        self.endpoints = endpoints
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.latency_alpha = latency_alpha
+
+    # ── Endpoint selection ───────────────────────────────────────────
+    def _score(self, endpoint: Endpoint):
+        if self.strategy == "latency":
+            # Unknown latency scores 0 so new endpoints get explored first
+            return ((endpoint.latency or 0.0) * (endpoint.outstanding + 1), endpoint.outstanding)
+        return (endpoint.outstanding, endpoint.latency or 0.0)
+
+    def _candidates(self) -> list[Endpoint]:
+        """Endpoints in the order they should be tried for the next call.
+
+        Healthy endpoints come first, best score first. Ejected endpoints are
+        still tried last (soonest-to-recover first), so a call never fails
+        just because every endpoint is cooling down.
+        """
+        now = time.monotonic()
+        healthy = sorted((e for e in self.endpoints if e.healthy(now)), key=self._score)
+        cooling = sorted((e for e in self.endpoints if not e.healthy(now)), key=lambda e: e.unhealthy_until)
+        return healthy + cooling
+
+    def _record_success(self, endpoint: Endpoint, seconds: float) -> None:
+        if endpoint.latency is None:
+            endpoint.latency = seconds
+        else:
+            endpoint.latency += self.latency_alpha * (seconds - endpoint.latency)
+
+    def _eject(self, endpoint: Endpoint, error: BaseException) -> None:
+        endpoint.failures += 1
+        endpoint.unhealthy_until = time.monotonic() + self.cooldown
+        logger.warning(
+            "Endpoint %s ejected for %.0fs after %s: %s",
+            endpoint.name, self.cooldown, type(error).__name__, error,
+        )
+
+    # ── Model interface ──────────────────────────────────────────────
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        last_error = None
+        for endpoint in self._candidates():
+            endpoint.outstanding += 1
+            endpoint.calls += 1
+            started = time.monotonic()
+            try:
+                response = await endpoint.model.get_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs,
+                    tracing, **kwargs,
+                )
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                self._eject(endpoint, e)
+                last_error = e
+                continue
+            finally:
+                endpoint.outstanding -= 1
+            self._record_success(endpoint, time.monotonic() - started)
+            return response
+        raise last_error
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        last_error = None
+        for endpoint in self._candidates():
+            endpoint.outstanding += 1
+            endpoint.calls += 1
+            started = time.monotonic()
+            yielded = False
+            try:
+                async for event in endpoint.model.stream_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs,
+                    tracing, **kwargs,
+                ):
+                    yielded = True
+                    yield event
+            except Exception as e:
+                # Once events have reached the caller we can't replay them elsewhere
+                if yielded or not is_retryable(e):
+                    raise
+                self._eject(endpoint, e)
+                last_error = e
+                continue
+            finally:
+                endpoint.outstanding -= 1
+            self._record_success(endpoint, time.monotonic() - started)
+            return
+        raise last_error
+
+    async def close(self) -> None:
+        for endpoint in self.endpoints:
+            await endpoint.model.close()
+
+    def stats(self) -> list[dict]:
+        """Per-endpoint health and load, e.g. for logging or a status page."""
+        now = time.monotonic()
+        return [
+            {
+                "name": e.name,
+                "healthy": e.healthy(now),
+                "outstanding": e.outstanding,
+                "latency": e.latency,
+                "calls": e.calls,
+                "failures": e.failures,
+            }
+            for e in self.endpoints
+        ]
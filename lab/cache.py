@@ -0,0 +1,248 @@
+"""
+Persistent cache for LLM responses.
+
+The same request is sent again and again: a topic gets rerun, a guardrail
+checks the same input, the reviewer looks at an unchanged draft. CachingModel
+answers those repeats from a local SQLite file instead of calling the API.
+
+  • Key — a SHA-256 of the canonical JSON of everything that shapes the
+    answer: deployment, system instructions, input messages, tool and handoff
+    schemas, output schema and model settings.
+  • Safety — a cached answer is only served when it is what the model would
+    (almost) certainly say again, i.e. temperature is 0. In the project that
+    is the Research Planner, Outline Planner and Reviewer; the Researcher and
+    Writers keep the default temperature and always reach the API. Set
+    mode="always" to cache regardless (handy for demos and tests).
+  • Eviction — entries expire after `ttl` seconds, and once the file holds
+    more than `max_bytes` of responses the least recently used are dropped.
+
+Streamed calls are passed straight through; only get_response() is cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from pydantic import TypeAdapter
+
+from lab.models import ModelWrapper
+
+MODES = ("deterministic", "always")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """A size-capped SQLite key/value store with TTL and LRU eviction.
+
+    Args:
+        path: SQLite file (created if needed).
+        ttl: Seconds an entry stays valid.
+        max_bytes: Total size of stored values before LRU eviction kicks in.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_bytes: int = 512 * 1024 * 1024):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until we're back under the cap
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+# ── Request keys ────────────────────────────────────────────────────
+def _tool_fingerprint(tool) -> dict:
+    return {
+        "type": type(tool).__name__,
+        "name": getattr(tool, "name", ""),
+        "description": getattr(tool, "description", ""),
+        "params": getattr(tool, "params_json_schema", None),
+        "strict": getattr(tool, "strict_json_schema", None),
+    }
+
+
+def request_key(
+    deployment: str,
+    system_instructions,
+    input,
+    model_settings,
+    tools,
+    output_schema,
+    handoffs,
+) -> str:
+    """Canonical hash of everything that determines a model's answer."""
+    payload = {
+        "deployment": deployment,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": model_settings.to_json_dict() if model_settings is not None else None,
+        "tools": [_tool_fingerprint(t) for t in tools or ()],
+        "handoffs": [
+            {"name": h.tool_name, "description": h.tool_description, "params": h.input_json_schema}
+            for h in handoffs or ()
+        ],
+        "output": (
+            None if output_schema is None or output_schema.is_plain_text()
+            else {"schema": output_schema.json_schema(), "strict": output_schema.is_strict_json_schema()}
+        ),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# ── Model wrapper ───────────────────────────────────────────────────
+class CachingModel(ModelWrapper):
+    """A Model that answers repeated, deterministic requests from a ResponseCache.
+
+    Args:
+        inner: The model to call on a cache miss.
+        cache: Where responses are stored.
+        deployment: Deployment name, part of every key.
+        mode: "deterministic" (only cache temperature=0 calls) or "always".
+    """
+
+    def __init__(self, inner, cache: ResponseCache, deployment: str, mode: str = "deterministic"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {MODES}")
+        super().__init__(inner)
+        self.cache = cache
+        self.deployment = deployment
+        self.mode = mode
+        self.skipped = 0  # Calls not eligible for caching
+        self._items = None
+
+    def _cacheable(self, model_settings) -> bool:
+        if self.mode == "always":
+            return True
+        return model_settings is not None and model_settings.temperature == 0
+
+    def _item_adapter(self) -> TypeAdapter:
+        if self._items is None:
+            from agents.items import TResponseOutputItem
+
+            self._items = TypeAdapter(list[TResponseOutputItem])
+        return self._items
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        from agents.items import ModelResponse
+        from agents.usage import Usage
+
+        if not self._cacheable(model_settings):
+            self.skipped += 1
+            return await self.inner.get_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                **kwargs,
+            )
+
+        key = request_key(
+            self.deployment, system_instructions, input, model_settings, tools, output_schema, handoffs,
+        )
+        # SQLite I/O runs in a worker thread, off the event loop
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            data = json.loads(cached)
+            # A cache hit costs nothing, so it reports zero usage
+            return ModelResponse(
+                output=self._item_adapter().validate_python(data["output"]),
+                usage=Usage(),
+                response_id=None,
+            )
+
+        response = await self.inner.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            **kwargs,
+        )
+        # exclude_unset keeps restored items identical to the originals, so a
+        # conversation replayed from cache hashes to the same keys next turn
+        output = self._item_adapter().dump_python(response.output, mode="json", exclude_unset=True)
+        await asyncio.to_thread(self.cache.put, key, json.dumps({"output": output}))
+        return response
+
+    def stats(self) -> dict:
+        """Cache hit rate, plus how many calls were ineligible for caching."""
+        return {**self.cache.stats(), "skipped": self.skipped}
@@ -0,0 +1,270 @@
+"""
+Adaptive concurrency for LLM calls (AIMD).
+
+A fixed cap on in-flight requests is either too low (quota left unused at
+night) or too high (429s at peak, when other teams share the quota). This
+controller finds the right cap on its own, the same way TCP finds the right
+window size:
+
+  • Additive increase — every call that finishes with healthy latency while
+    the cap is actually being used grows the cap by 1/cap, i.e. by about one
+    slot per "round" of calls.
+  • Multiplicative decrease — a 429, or latency well above the running
+    baseline, shrinks the cap by a factor (default: halve it). Decreases are
+    spaced out so one burst of errors only counts once.
+
+A call's expected latency is fitted as fixed cost + per-token cost (time to
+first token and prefill don't shrink for a 20-token tool call), so neither a
+long article nor a short tool turn is mistaken for a slowdown. Every decision
+is logged (logger "lab.concurrency") and counted in stats().
+"""
+
+import asyncio
+import logging
+import time
+
+import openai
+
+from lab.models import ModelWrapper
+
+logger = logging.getLogger(__name__)
+
+
+def is_throttle(error: BaseException) -> bool:
+    """True if the error means 'slow down' (HTTP 429)."""
+    return isinstance(error, openai.APIStatusError) and error.status_code == 429
+
+
+class LatencyModel:
+    """Exponentially weighted fit of latency ≈ fixed + per_token × output tokens.
+
+    Args:
+        alpha: Weight of each new sample once warmed up (the first 1/alpha
+            samples are averaged evenly).
+    """
+
+    def __init__(self, alpha: float = 0.05):
+        self.alpha = alpha
+        self.samples = 0
+        self._tokens = 0.0  # Weighted means and (co)variance
+        self._latency = 0.0
+        self._var_tokens = 0.0
+        self._cov = 0.0
+
+    def add(self, output_tokens: int, latency: float) -> None:
+        self.samples += 1
+        a = max(self.alpha, 1 / self.samples)
+        dx, dy = output_tokens - self._tokens, latency - self._latency
+        self._tokens += a * dx
+        self._latency += a * dy
+        self._var_tokens = (1 - a) * (self._var_tokens + a * dx * dx)
+        self._cov = (1 - a) * (self._cov + a * dx * dy)
+
+    def coefficients(self) -> tuple[float, float] | None:
+        """(fixed seconds, seconds per token), or None while token counts barely vary."""
+        spread = max(16.0, 0.25 * self._tokens)
+        if self._var_tokens < spread * spread:
+            return None
+        per_token = max(0.0, self._cov / self._var_tokens)
+        fixed = max(0.0, self._latency - per_token * self._tokens)
+        return fixed, per_token
+
+    def expected(self, output_tokens: int) -> float | None:
+        """Typical latency for a call with this many output tokens (None = no basis yet)."""
+        if not self.samples:
+            return None
+        fit = self.coefficients()
+        if fit is None:
+            # Only similar-sized calls seen so far: don't extrapolate far from them
+            near = abs(output_tokens - self._tokens) <= max(16.0, 0.5 * self._tokens)
+            return self._latency if near else None
+        fixed, per_token = fit
+        return fixed + per_token * output_tokens or self._latency
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on in-flight calls.
+
+    Args:
+        initial: Starting limit.
+        min_limit: The limit never drops below this.
+        max_limit: The limit never grows above this.
+        decrease: Factor applied to the limit on a 429 or latency spike.
+        latency_tolerance: A call is a spike if it is this many times slower
+            than expected for its output length.
+        baseline_alpha: Weight of each new sample in the latency model.
+        name: Label used in logs and stats().
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        baseline_alpha: float = 0.05,
+        name: str = "",
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.baseline_alpha = baseline_alpha
+        self.name = name
+
+        self.in_flight = 0
+        self.latency = LatencyModel(baseline_alpha)  # Calls with known output tokens
+        self.untimed = LatencyModel(baseline_alpha)  # Calls without usage (tokens unknown)
+        self.rtt: float | None = None  # Typical raw call latency, seconds
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+        # Metrics
+        self.increases = 0
+        self.decreases = 0
+        self.throttles = 0
+        self.spikes = 0
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free under the current limit."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < max(1, int(self.limit)))
+            self.in_flight += 1
+
+    async def release(
+        self,
+        latency: float | None,
+        output_tokens: int = 0,
+        throttled: bool = False,
+    ) -> None:
+        """Free the slot and adjust the limit from the call's outcome.
+
+        Args:
+            latency: Seconds the call took (None if it failed for another reason).
+            output_tokens: Completion tokens (0 if unknown), used to predict latency.
+            throttled: The call was rejected with a 429.
+        """
+        async with self._condition:
+            was_saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+
+            if throttled:
+                self.throttles += 1
+                self._back_off("429")
+            elif latency is not None:
+                self.rtt = latency if self.rtt is None else self.rtt + 0.2 * (latency - self.rtt)
+                model = self.latency if output_tokens else self.untimed
+                expected = model.expected(output_tokens)
+                if expected is not None and latency > expected * self.latency_tolerance:
+                    self.spikes += 1
+                    self._back_off(f"latency {latency:.2f}s, expected {expected:.2f}s")
+                else:
+                    # Only learn from healthy calls, so spikes don't raise the baseline
+                    model.add(output_tokens, latency)
+                    # Only grow when the limit is what's holding us back
+                    if was_saturated and self.limit < self.max_limit:
+                        old = self.limit
+                        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                        self.increases += 1
+                        if int(self.limit) != int(old):
+                            self._log("increase", old, "healthy latency")
+
+            self._condition.notify_all()
+
+    def _back_off(self, reason: str) -> None:
+        # One burst of failures shouldn't collapse the limit several times over,
+        # so decrease at most once per typical round-trip (1s until we know it).
+        now = time.monotonic()
+        if now - self._last_decrease < (self.rtt or 1.0):
+            return
+        self._last_decrease = now
+        old = self.limit
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+        self.decreases += 1
+        self._log("decrease", old, reason)
+
+    def _log(self, decision: str, old: float, reason: str) -> None:
+        logger.info(
+            "aimd %s name=%s limit=%.1f->%.1f in_flight=%d reason=%s",
+            decision, self.name, old, self.limit, self.in_flight, reason,
+        )
+
+    def stats(self) -> dict:
+        """Current limit and decision counters."""
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "latency_fit": self.latency.coefficients(),
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "throttles": self.throttles,
+            "latency_spikes": self.spikes,
+        }
+
+
+class AdaptiveConcurrencyModel(ModelWrapper):
+    """A Model whose calls are admitted by an AIMDController."""
+
+    def __init__(self, inner, controller: AIMDController):
+        super().__init__(inner)
+        self.controller = controller
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        await self.controller.acquire()
+        started = time.monotonic()
+        latency, output_tokens, throttled = None, 0, False
+        try:
+            response = await self.inner.get_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                **kwargs,
+            )
+            latency, output_tokens = time.monotonic() - started, response.usage.output_tokens
+            return response
+        except Exception as e:
+            throttled = is_throttle(e)
+            raise
+        finally:
+            # Also on cancellation, which only frees the slot (no latency sample)
+            await self.controller.release(latency, output_tokens, throttled)
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        await self.controller.acquire()
+        started = time.monotonic()
+        latency, output_tokens, throttled = None, 0, False
+        try:
+            async for event in self.inner.stream_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                **kwargs,
+            ):
+                if event.type == "response.completed" and event.response.usage is not None:
+                    output_tokens = event.response.usage.output_tokens
+                yield event
+            latency = time.monotonic() - started
+        except Exception as e:
+            throttled = is_throttle(e)
+            raise
+        finally:
+            await self.controller.release(latency, output_tokens, throttled)
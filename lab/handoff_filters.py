@@ -0,0 +1,209 @@
+"""
+Handoff input filters: what a specialist sees of the conversation so far.
+
+By default a handoff passes the whole conversation to the next agent — every
+earlier turn, every tool call and every tool result — so in a long session
+the specialist's first model call is far bigger (and slower) than it needs
+to be. A HandoffFilter is an SDK input_filter built from steps:
+
+  • drop_tools     — remove tool calls, tool results and reasoning items,
+                     keeping only the user / assistant messages
+  • last_turns:N   — keep only the last N turns (a turn starts at a user
+                     message)
+  • summary[:CHARS] — replace the history with one structured message: the
+                     original request, earlier user messages, which tools
+                     were used, the latest assistant reply and the current
+                     request, at most CHARS characters
+
+Steps run in order, so "drop_tools,last_turns:4" first strips tools, then
+keeps four turns. Tokens before and after (local estimate, lab/tokens.py)
+are logged per handoff (logger "lab.handoff_filters") and totalled in
+stats().
+
+    handoff(researcher, input_filter=HandoffFilter("drop_tools,last_turns:4", name="Researcher"))
+"""
+
+import json
+import logging
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from agents import Agent, Handoff, handoff
+from agents.handoffs import HandoffInputData
+
+from lab.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUMMARY_CHARS = 2000
+
+
+# ── Helpers over input items ────────────────────────────────────────
+def history_items(data: HandoffInputData) -> list[dict]:
+    """Everything the next agent would see, as Responses input items."""
+    history = data.input_history
+    items = [{"role": "user", "content": history}] if isinstance(history, str) else list(history)
+    run_items = data.input_items if data.input_items is not None else data.new_items
+    items += [item.to_input_item() for item in (*data.pre_handoff_items, *run_items)]
+    return items
+
+
+def item_text(item: dict) -> str:
+    """The text of a message item ('' for anything else)."""
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def count_tokens(items: list[dict]) -> int:
+    return estimate_tokens(json.dumps(items, default=str, ensure_ascii=False))
+
+
+def _truncate(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:max(0, limit - 1)].rstrip() + "…"
+
+
+# ── Steps ───────────────────────────────────────────────────────────
+def drop_tools(items: list[dict]) -> list[dict]:
+    """Keep only messages (items with a role)."""
+    return [item for item in items if "role" in item]
+
+
+def last_turns(n: int):
+    """Keep the last `n` turns; a turn starts at a user message."""
+    def step(items: list[dict]) -> list[dict]:
+        starts = [i for i, item in enumerate(items) if item.get("role") == "user"]
+        if len(starts) <= n:
+            return items
+        return items[starts[-n]:]
+    return step
+
+
+def summary(max_chars: int = DEFAULT_SUMMARY_CHARS):
+    """Replace the history with one structured summary message."""
+    def step(items: list[dict]) -> list[dict]:
+        user = [item_text(i) for i in items if i.get("role") == "user" and item_text(i)]
+        assistant = [item_text(i) for i in items if i.get("role") == "assistant" and item_text(i)]
+        tools = Counter(i.get("name", i.get("type", "")) for i in items if i.get("type") == "function_call")
+        if not user:
+            return items
+
+        budget = max_chars // 4
+        lines = ["[Conversation summary — the earlier history was condensed at this handoff]",
+                 f"Original request: {_truncate(user[0], budget)}"]
+        earlier = user[1:-1]
+        if earlier:
+            lines.append("Earlier user messages:")
+            lines += [f"- {_truncate(text, budget // max(1, len(earlier)))}" for text in earlier[-5:]]
+        if tools:
+            lines.append("Tools used: " + ", ".join(f"{name} ×{count}" for name, count in tools.items()))
+        if assistant:
+            lines.append(f"Latest assistant reply: {_truncate(assistant[-1], budget)}")
+        if len(user) > 1:
+            lines.append(f"Current request: {_truncate(user[-1], budget)}")
+        return [{"role": "user", "content": "\n".join(lines)[:max_chars]}]
+    return step
+
+
+def parse_steps(spec: str) -> list:
+    """Turn "drop_tools,last_turns:4" into steps ("" or "none" = no steps).
+
+    >>> len(parse_steps("drop_tools,last_turns:4,summary:1500"))
+    3
+    """
+    steps = []
+    for part in (p.strip() for p in spec.split(",")):
+        if not part or part == "none":
+            continue
+        name, _, arg = part.partition(":")
+        if name == "drop_tools":
+            steps.append(drop_tools)
+        elif name == "last_turns":
+            steps.append(last_turns(int(arg or 1)))
+        elif name == "summary":
+            steps.append(summary(int(arg) if arg else DEFAULT_SUMMARY_CHARS))
+        else:
+            raise ValueError(f"Unknown handoff filter step {part!r} (use drop_tools, last_turns:N, summary)")
+    return steps
+
+
+# ── The filter ──────────────────────────────────────────────────────
+@dataclass
+class FilterStats:
+    """Running totals for one HandoffFilter."""
+
+    handoffs: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "handoffs": self.handoffs,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_removed": self.tokens_before - self.tokens_after,
+        }
+
+
+class HandoffFilter:
+    """An input_filter that trims the history a handoff passes on.
+
+    Args:
+        spec: Steps to apply, e.g. "drop_tools,last_turns:4" or "summary" —
+            or a function returning them, called at the first handoff (so a
+            setting can be read then rather than at import time).
+        name: Shown in the log line (e.g. the target agent's name).
+    """
+
+    def __init__(self, spec: str | Callable[[], str], name: str = ""):
+        self._spec = spec
+        self.name = name
+        self._steps = None if callable(spec) else parse_steps(spec)
+        self._stats = FilterStats()
+
+    @property
+    def spec(self) -> str:
+        if callable(self._spec):
+            self._spec = self._spec()
+        return self._spec
+
+    @property
+    def steps(self) -> list:
+        if self._steps is None:
+            self._steps = parse_steps(self.spec)
+        return self._steps
+
+    def __call__(self, data: HandoffInputData) -> HandoffInputData:
+        if not self.steps:
+            return data
+        items = history_items(data)
+        before = count_tokens(items)
+        for step in self.steps:
+            items = step(items)
+        after = count_tokens(items)
+
+        self._stats.handoffs += 1
+        self._stats.tokens_before += before
+        self._stats.tokens_after += after
+        logger.info("Handoff%s: %d → %d tokens (%s, removed %d)",
+                    f" to {self.name}" if self.name else "", before, after, self.spec, before - after)
+
+        # The filtered items become the next agent's whole input; new_items are
+        # kept as they are so session history still records the full turn
+        return data.clone(input_history=tuple(items), pre_handoff_items=(), input_items=())
+
+    def stats(self) -> dict:
+        """Tokens removed across every handoff through this filter."""
+        return self._stats.as_dict()
+
+
+def filtered_handoff(agent: Agent, spec: str | Callable[[], str]) -> Handoff:
+    """handoff(agent) with a HandoffFilter(spec) (a plain handoff if spec is an empty string)."""
+    if not callable(spec) and not parse_steps(spec):
+        return handoff(agent)
+    return handoff(agent, input_filter=HandoffFilter(spec, name=agent.name))
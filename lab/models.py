@@ -0,0 +1,92 @@
+"""
+Model wrappers for the Agents SDK.
+
+A wrapper is itself a Model, so it can be passed to Agent(model=...) exactly
+like the OpenAIChatCompletionsModel it wraps. Each wrapper adds one behavior
+around the inner model's get_response() / stream_response() calls.
+
+  • ModelWrapper — base class that forwards everything to `inner`.
+  • LazyModel    — builds the inner model on first use (see config.py).
+"""
+
+from collections.abc import AsyncIterator, Callable
+
+from agents.models.interface import Model
+
+
+class ModelWrapper(Model):
+    """A Model that forwards every call to another Model.
+
+    Subclasses override get_response() / stream_response() and call the
+    inner model themselves. Extra keyword arguments (previous_response_id,
+    conversation_id, prompt, ...) are passed through untouched, so wrappers
+    keep working as the SDK's Model interface grows.
+    """
+
+    def __init__(self, inner: Model):
+        self._inner = inner
+
+    @property
+    def inner(self) -> Model:
+        return self._inner
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        return await self.inner.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            **kwargs,
+        )
+
+    def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ) -> AsyncIterator:
+        return self.inner.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            **kwargs,
+        )
+
+    def get_retry_advice(self, request):
+        return self.inner.get_retry_advice(request)
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+class LazyModel(ModelWrapper):
+    """A Model that is only built the first time it is called.
+
+    Agent definitions need a model object at import time, but building the
+    real one means reading settings and creating HTTP clients. LazyModel
+    defers that work (and any configuration error) to the first LLM call.
+    """
+
+    def __init__(self, factory: Callable[[], Model]):
+        self._factory = factory
+        self._inner = None
+
+    @property
+    def inner(self) -> Model:
+        if self._inner is None:
+            self._inner = self._factory()
+        return self._inner
+
+    async def close(self) -> None:
+        if self._inner is not None:
+            await self._inner.close()
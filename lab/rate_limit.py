@@ -0,0 +1,201 @@
+"""
+Client-side rate limiting against requests/minute and tokens/minute quotas.
+
+Azure OpenAI enforces RPM and TPM limits per deployment and answers with 429
+once you go over. Retrying after a 429 wastes a round-trip and, with many
+pipelines running, the retries pile up. It's faster to smooth traffic so it
+stays just under the quota in the first place.
+
+  • TokenBucket       — refills continuously at limit/60 per second.
+  • RateLimiter       — one RPM bucket + one TPM bucket. Callers wait in a
+                        FIFO queue (asyncio.Lock is fair), so nobody starves.
+  • RateLimitedModel  — a Model wrapper that estimates prompt tokens locally,
+                        waits for budget, then reconciles the estimate with
+                        the real `usage` once the response arrives.
+"""
+
+import asyncio
+import time
+
+from lab.models import ModelWrapper
+from lab.tokens import estimate_request_tokens
+
+
+class TokenBucket:
+    """A continuously refilling bucket of `capacity` units, `rate` units/second."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self.refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.refill()
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        """Return (or, if negative, additionally charge) units after the fact."""
+        self.refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Shared RPM + TPM budget for one deployment.
+
+    Args:
+        rpm: Requests per minute (0 or None = unlimited).
+        tpm: Tokens per minute (0 or None = unlimited).
+        burst_seconds: How many seconds of quota may be spent at once. Azure
+            checks limits over short windows, so bursting a full minute's
+            quota in one go still gets throttled.
+        name: Label used in stats().
+    """
+
+    def __init__(
+        self,
+        rpm: int | None = None,
+        tpm: int | None = None,
+        burst_seconds: float = 10.0,
+        name: str = "",
+    ):
+        self.name = name
+        self.requests = TokenBucket(rpm * burst_seconds / 60, rpm / 60) if rpm else None
+        self.tokens = TokenBucket(tpm * burst_seconds / 60, tpm / 60) if tpm else None
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self.waiting = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.estimated_tokens = 0
+        self.actual_tokens = 0
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait (in FIFO order) until a request of `tokens` tokens fits the budget.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = max(
+                        self.requests.wait_time(1) if self.requests else 0.0,
+                        self.tokens.wait_time(tokens) if self.tokens else 0.0,
+                    )
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                if self.requests:
+                    self.requests.take(1)
+                if self.tokens:
+                    self.tokens.take(tokens)
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.estimated_tokens += tokens
+        return waited
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Correct the TPM budget once the real token count is known."""
+        self.actual_tokens += actual
+        if self.tokens:
+            self.tokens.give_back(estimated - actual)
+
+    def stats(self) -> dict:
+        """Queue depth and wait-time metrics."""
+        return {
+            "name": self.name,
+            "queue_depth": self.waiting,
+            "acquired": self.acquired,
+            "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "max_wait": self.max_wait,
+            "estimated_tokens": self.estimated_tokens,
+            "actual_tokens": self.actual_tokens,
+        }
+
+
+class RateLimitedModel(ModelWrapper):
+    """A Model that waits for RPM/TPM budget before every call."""
+
+    def __init__(self, inner, limiter: RateLimiter):
+        super().__init__(inner)
+        self.limiter = limiter
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        prompt, completion = estimate_request_tokens(
+            system_instructions, input, model_settings, tools, output_schema, handoffs,
+        )
+        estimate = prompt + completion
+        await self.limiter.acquire(estimate)
+        try:
+            response = await self.inner.get_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                **kwargs,
+            )
+        except Exception:
+            # Failed calls (429s included) don't consume tokens
+            self.limiter.reconcile(estimate, 0)
+            raise
+        self.limiter.reconcile(estimate, response.usage.total_tokens or estimate)
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs,
+    ):
+        prompt, completion = estimate_request_tokens(
+            system_instructions, input, model_settings, tools, output_schema, handoffs,
+        )
+        estimate = prompt + completion
+        await self.limiter.acquire(estimate)
+        actual = 0
+        failed = True
+        try:
+            async for event in self.inner.stream_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                **kwargs,
+            ):
+                if event.type == "response.completed" and event.response.usage is not None:
+                    actual = event.response.usage.total_tokens
+                yield event
+            failed = False
+        finally:
+            # Failed calls don't consume tokens; without usage, trust the estimate
+            self.limiter.reconcile(estimate, 0 if failed else (actual or estimate))
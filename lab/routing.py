@@ -0,0 +1,256 @@
+"""
+Deterministic pre-routing in front of a triage agent.
+
+A triage agent (Lesson 04's triage_agent, the project's Orchestrator) spends
+a whole LLM round-trip just to pick a handoff target, and that call sits on
+the critical path of every request — even when the answer is obvious from a
+word like "refund". PreRouter classifies the request locally first:
+
+  • keyword rules   — per-specialist keywords (word prefixes, so "charge"
+                      also matches "charged"); one specialist matching
+                      alone, or clearly more than any other, wins
+  • similarity      — otherwise, TF-IDF cosine similarity between the request
+                      and each specialist's name + handoff_description +
+                      keywords; the best one wins if it is clearly ahead
+
+When either is confident, the request goes straight to the specialist and
+the router model is never called. Otherwise the triage agent runs as usual.
+
+Every decision is logged (logger "lab.routing") and counted in stats(). To
+catch misroutes, a sample of fast-path decisions (sample_rate) is checked in
+the background by asking the router model which specialist it would have
+picked; disagreements are logged as warnings and kept in .misroutes.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import re
+from collections import Counter, deque
+from dataclasses import dataclass
+
+from agents import Agent, RunResult, Runner
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have how i in is it its me my "
+    "of on or our please so that the their them they this to was we what when where "
+    "which who why will with you your".split()
+)
+
+
+def terms(text: str) -> list[str]:
+    """Lowercased words without stopwords, with a plural "s" stripped.
+
+    >>> terms("Handles billing: invoices, payments")
+    ['handle', 'billing', 'invoice', 'payment']
+    """
+    words = []
+    for word in _WORD.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+@dataclass
+class RouteDecision:
+    """Where the pre-router sent a request, and why."""
+
+    agent: Agent | None  # None = not confident, fall back to the router model
+    method: str  # "keyword", "similarity" or "fallback"
+    confidence: float
+    best_guess: str = ""  # Top-scoring specialist even when not confident
+
+
+@dataclass
+class RoutingStats:
+    """Running totals for one PreRouter."""
+
+    requests: int = 0
+    keyword: int = 0
+    similarity: int = 0
+    fallback: int = 0
+    sampled: int = 0
+    misroutes: int = 0
+
+    def as_dict(self) -> dict:
+        fast = self.keyword + self.similarity
+        return {
+            "requests": self.requests,
+            "keyword": self.keyword,
+            "similarity": self.similarity,
+            "fallback": self.fallback,
+            "hit_rate": fast / self.requests if self.requests else 0.0,
+            "sampled": self.sampled,
+            "misroutes": self.misroutes,
+            "misroute_rate": self.misroutes / self.sampled if self.sampled else 0.0,
+        }
+
+
+class _RouteChoice(BaseModel):
+    specialist: str = Field(description="The exact name of the specialist to hand off to")
+
+
+class PreRouter:
+    """Route requests to a triage agent's handoffs without a model call when possible.
+
+    Args:
+        router: The triage agent.
+        specialists: The agents it hands off to (default: its handoffs that
+            are plain Agents; pass them when handoffs are handoff() objects).
+        keywords: Specialist name → keywords that point to it.
+        keyword_confidence: Share of the keyword hits the top specialist needs.
+        min_similarity: Cosine similarity below which nothing is confident.
+        similarity_margin: How far (relative) the best match must lead the next.
+        sample_rate: Fraction of fast-path decisions audited by the router model.
+    """
+
+    def __init__(
+        self,
+        router: Agent,
+        specialists: list[Agent] | None = None,
+        keywords: dict[str, list[str]] | None = None,
+        keyword_confidence: float = 0.75,
+        min_similarity: float = 0.2,
+        similarity_margin: float = 0.5,
+        sample_rate: float = 0.05,
+        seed: int | None = None,
+    ):
+        self.router = router
+        if specialists is None:
+            specialists = [h for h in router.handoffs if isinstance(h, Agent)]
+        self.specialists = {agent.name: agent for agent in specialists}
+        keywords = keywords or {}
+        unknown = set(keywords) - set(self.specialists)
+        if unknown:
+            raise ValueError(f"Keywords for unknown specialists: {sorted(unknown)}")
+        self._patterns = {
+            name: [re.compile(r"\b" + re.escape(k.lower())) for k in words]
+            for name, words in keywords.items()
+        }
+        self.keyword_confidence = keyword_confidence
+        self.min_similarity = min_similarity
+        self.similarity_margin = similarity_margin
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+        self._stats = RoutingStats()
+        self.misroutes: deque = deque(maxlen=50)  # (request, routed to, router model's choice)
+        self._audits: set[asyncio.Task] = set()
+        self._judge: Agent | None = None
+
+        # TF-IDF vectors of each specialist's description
+        documents = {
+            name: terms(" ".join([name, agent.handoff_description or "", *keywords.get(name, [])]))
+            for name, agent in self.specialists.items()
+        }
+        df = Counter(t for words in documents.values() for t in set(words))
+        self._idf = {t: math.log(1 + len(documents) / n) for t, n in df.items()}
+        self._vectors = {name: self._vector(words) for name, words in documents.items()}
+
+    def _vector(self, words: list[str]) -> dict[str, float]:
+        counts = Counter(w for w in words if w in self._idf)
+        vector = {t: c * self._idf[t] for t, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {t: v / norm for t, v in vector.items()}
+
+    def classify(self, text: str) -> RouteDecision:
+        """Decide locally where `text` should go (agent=None if not confident)."""
+        lowered = text.lower()
+        hits = {
+            name: sum(1 for p in patterns if p.search(lowered))
+            for name, patterns in self._patterns.items()
+        }
+        ranked = sorted(hits.items(), key=lambda item: -item[1])
+        if ranked and ranked[0][1]:
+            total = sum(hits.values())
+            name, count = ranked[0]
+            confidence = count / total
+            if confidence >= self.keyword_confidence:
+                return RouteDecision(self.specialists[name], "keyword", confidence, name)
+
+        query = self._vector(terms(text))
+        scores = sorted(
+            ((sum(w * vector.get(t, 0.0) for t, w in query.items()), name)
+             for name, vector in self._vectors.items()),
+            reverse=True,
+        )
+        if not scores:
+            return RouteDecision(None, "fallback", 0.0)
+        best, name = scores[0]
+        second = scores[1][0] if len(scores) > 1 else 0.0
+        confidence = (best - second) / best if best > 0 else 0.0
+        if best >= self.min_similarity and confidence >= self.similarity_margin:
+            return RouteDecision(self.specialists[name], "similarity", confidence, name)
+        return RouteDecision(None, "fallback", confidence, name if best > 0 else "")
+
+    async def run(self, input: str, **kwargs):
+        """Runner.run() through the pre-router: straight to a specialist, or via the router.
+
+        Keyword arguments are passed on to Runner.run.
+        """
+        _, result = await self.route(input, **kwargs)
+        return result
+
+    async def route(self, input: str, **kwargs) -> tuple[RouteDecision, RunResult]:
+        """Like run(), but also returns the RouteDecision the request was routed by."""
+        decision = self.classify(input)
+        self._stats.requests += 1
+        if decision.agent is None:
+            self._stats.fallback += 1
+            result = await Runner.run(self.router, input, **kwargs)
+            logger.debug(
+                "%r → %s via %s (local best guess: %s)",
+                input[:60], result.last_agent.name, self.router.name, decision.best_guess or "none",
+            )
+            return decision, result
+
+        if decision.method == "keyword":
+            self._stats.keyword += 1
+        else:
+            self._stats.similarity += 1
+        logger.debug("%r → %s (%s, confidence %.2f)", input[:60], decision.agent.name,
+                     decision.method, decision.confidence)
+        if self._random.random() < self.sample_rate:
+            task = asyncio.create_task(self._audit(input, decision.agent.name))
+            self._audits.add(task)
+            task.add_done_callback(self._audits.discard)
+        return decision, await Runner.run(decision.agent, input, **kwargs)
+
+    async def _audit(self, text: str, routed_to: str) -> None:
+        if self._judge is None:
+            names = ", ".join(self.specialists)
+            self._judge = self.router.clone(
+                name=f"{self.router.name} (routing audit)",
+                instructions=f"{self.router.instructions}\n\nDo not hand off. Reply with the "
+                             f"name of the specialist you would hand off to, exactly one of: {names}.",
+                handoffs=[],
+                output_type=_RouteChoice,
+            )
+        try:
+            result = await Runner.run(self._judge, text)
+        except Exception as e:
+            logger.warning("Routing audit failed: %s: %s", type(e).__name__, e)
+            return
+        self._stats.sampled += 1
+        choice = result.final_output.specialist.strip()
+        if choice.lower() != routed_to.lower():
+            self._stats.misroutes += 1
+            self.misroutes.append((text, routed_to, choice))
+            logger.warning("Possible misroute: %r went to %s, %s would pick %s",
+                           text[:60], routed_to, self.router.name, choice)
+
+    async def drain(self) -> None:
+        """Wait for background routing audits to finish."""
+        if self._audits:
+            await asyncio.gather(*list(self._audits), return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Hit rate of the fast path, and misroutes among the audited decisions."""
+        return self._stats.as_dict()
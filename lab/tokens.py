@@ -0,0 +1,60 @@
+"""
+Cheap, local token estimates.
+
+We don't need exact counts — just something good enough to budget against
+a tokens-per-minute quota or trim text to fit a prompt. English text averages
+roughly 4 characters per token for GPT-4-class tokenizers, so that's what we
+use. Real usage numbers from the API are used wherever they are available.
+"""
+
+import json
+
+CHARS_PER_TOKEN = 4
+
+# Completion tokens to budget for when a request doesn't set max_tokens
+DEFAULT_OUTPUT_RESERVE = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for a piece of text."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _dumps(value) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def estimate_request_tokens(
+    system_instructions: str | None,
+    input,
+    model_settings=None,
+    tools=(),
+    output_schema=None,
+    handoffs=(),
+) -> tuple[int, int]:
+    """Estimate the prompt size and the completion budget of one model call.
+
+    Args mirror Model.get_response(). Tool, handoff and output schemas are sent
+    with every request, so they count towards the prompt too.
+
+    Returns:
+        (prompt_tokens, completion_tokens)
+    """
+    parts = [system_instructions or "", _dumps(input)]
+    for tool in tools or ():
+        parts.append(getattr(tool, "name", ""))
+        parts.append(getattr(tool, "description", "") or "")
+        parts.append(_dumps(getattr(tool, "params_json_schema", {})))
+    for handoff in handoffs or ():
+        parts.append(getattr(handoff, "tool_name", ""))
+        parts.append(getattr(handoff, "tool_description", "") or "")
+    if output_schema is not None and not output_schema.is_plain_text():
+        parts.append(_dumps(output_schema.json_schema()))
+
+    prompt = sum(estimate_tokens(p) for p in parts)
+    max_tokens = getattr(model_settings, "max_tokens", None) if model_settings is not None else None
+    return prompt, max_tokens or DEFAULT_OUTPUT_RESERVE
@@ -8,6 +8,12 @@ Key takeaways:
   • The LLM decides WHEN to hand off (based on instructions + handoff descriptions).
   • After handoff, the NEW agent takes over the conversation.
   • You can inspect result.last_agent to see WHO produced the final answer.
+  • Routing costs a full LLM call. A local pre-router (lab/routing.py) can
+    send obvious requests straight to the specialist and only ask the
+    triage agent when it isn't sure.
+  • A handoff passes the whole conversation on by default. An input_filter
+    (lab/handoff_filters.py) can drop tool calls, keep only recent turns or
+    send a summary, so the specialist's first call stays small.
 
 Think of it like a call center: a triage operator identifies what you need,
 then transfers you to the right department.
@@ -21,7 +27,9 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from config import MODEL
-from agents import Agent, Runner
+from agents import Agent
+from lab.handoff_filters import filtered_handoff
+from lab.routing import PreRouter
 
 
 # ── Define specialist agents ────────────────────────────────────────
@@ -66,6 +74,9 @@ general_support = Agent(
 
 # ── Define the triage agent (the router) ────────────────────────────
 # This agent doesn't answer questions itself — it routes to specialists.
+# Each handoff passes on only the last 3 turns, without tool calls/results.
+
+HANDOFF_FILTER = "drop_tools,last_turns:3"
 
 triage_agent = Agent(
     name="Triage Agent",
@@ -76,7 +87,26 @@ triage_agent = Agent(
         "Briefly acknowledge the user's issue, then hand off immediately."
     ),
     model=MODEL,
-    handoffs=[tech_support, billing_support, general_support],
+    handoffs=[
+        filtered_handoff(tech_support, HANDOFF_FILTER),
+        filtered_handoff(billing_support, HANDOFF_FILTER),
+        filtered_handoff(general_support, HANDOFF_FILTER),
+    ],
+)
+
+
+# ── Pre-router (the fast path) ──────────────────────────────────────
+# Keyword rules first, then similarity to each handoff_description. Only
+# when neither is confident does the triage agent's LLM call happen.
+
+router = PreRouter(
+    triage_agent,
+    specialists=[tech_support, billing_support, general_support],
+    keywords={
+        "Tech Support Specialist": ["error", "bug", "crash", "install", "setup", "not working", "log in"],
+        "Billing Specialist": ["charge", "invoice", "refund", "payment", "subscription", "billing", "price"],
+        "General Support": ["hours", "feedback", "contact", "address", "opening"],
+    },
 )
 
 
@@ -91,19 +121,33 @@ async def main():
         "I keep getting a 'connection refused' error when starting the app",
         "I was charged twice for my monthly subscription",
         "What are your office hours?",
+        "Can you help me with something?",  # Not obvious: goes to the triage agent
     ]
 
     for q in questions:
         print(f"\n🧑 Customer: {q}")
         print("-" * 40)
 
-        result = await Runner.run(triage_agent, q)
+        # Same as Runner.run(triage_agent, q), minus the triage call when the
+        # pre-router is confident
+        decision, result = await router.route(q)
 
         # result.last_agent tells us which agent produced the final answer
-        print(f"📋 Handled by: {result.last_agent.name}")
+        routed = f"pre-router: {decision.method}, triage skipped" if decision.agent else "triage agent"
+        print(f"📋 Handled by: {result.last_agent.name} (routed by {routed})")
         print(f"🤖 Response: {result.final_output}")
         print("=" * 60)
 
+    await router.drain()
+    stats = router.stats()
+    print(f"\n⚡ Pre-router hit rate: {stats['hit_rate']:.0%} "
+          f"({stats['requests'] - stats['fallback']}/{stats['requests']} triage calls skipped)")
+    for h in triage_agent.handoffs:
+        filtered = h.input_filter.stats()
+        if filtered["handoffs"]:
+            print(f"✂️  Handoffs to {h.agent_name}: {filtered['tokens_removed']} tokens removed "
+                  f"over {filtered['handoffs']} handoff(s)")
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -3,13 +3,22 @@ Orchestrator Agent
 ===================
 The coordinator that routes work to specialized agents.
 This is the "triage" pattern from Lesson 04, but in a real pipeline.
+
+orchestrator_router puts a local pre-router (lab/routing.py) in front of it:
+requests whose target is obvious from keywords go straight to the specialist,
+without the Orchestrator's model call. Use orchestrator_router.run(request)
+in place of Runner.run(orchestrator, request).
+
+Its handoffs pass the specialist a trimmed history (HANDOFF_FILTER, see
+lab/handoff_filters.py) rather than the whole conversation. The setting is
+read at the first handoff, so importing this module doesn't load .env.
 """
 
 from agents import Agent
 
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
-from config import MODEL
+from config import MODEL, setting
+from lab.handoff_filters import filtered_handoff
+from lab.routing import PreRouter
 
 from project.agents.researcher import researcher
 from project.agents.writer import writer
@@ -34,5 +43,20 @@ When a user asks for content on a topic:
 IMPORTANT: You are a coordinator. Do NOT try to research, write, or review yourself.
 Always delegate to the appropriate specialist.
 """,
-    handoffs=[researcher, writer, reviewer],
+    handoffs=[
+        filtered_handoff(a, lambda: setting("HANDOFF_FILTER")) for a in (researcher, writer, reviewer)
+    ],
+)
+
+
+orchestrator_router = PreRouter(
+    orchestrator,
+    specialists=[researcher, writer, reviewer],
+    keywords={
+        # New content always starts with research, even if it says "write"
+        "Researcher": ["research", "article about", "article on", "write about", "post about",
+                       "content on", "look up", "find out", "sources", "gather"],
+        "Writer": ["draft from", "rewrite", "polish", "from the research", "from these notes"],
+        "Reviewer": ["review", "critique", "proofread", "score this", "feedback on", "grade"],
+    },
 )
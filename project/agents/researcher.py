@@ -3,16 +3,20 @@ Researcher Agent
 =================
 Gathers and synthesizes information on a topic using search tools.
 Stores findings in the shared context for other agents to use.
+
+Two ways to use it:
+  • researcher — one agent that plans AND researches every subtopic itself.
+  • research_planner + subtopic_researcher — plan the subtopics once, then run
+    one subtopic_researcher per subtopic in parallel (see run_pipeline).
 """
 
-from agents import Agent
+from pydantic import BaseModel, Field
+from agents import Agent, ModelSettings
 
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 from config import MODEL
 
-from project.tools.web_search import web_search, web_search_detailed
-from project.tools.file_tools import save_research, get_all_research
+from project.tools.web_search import web_search, web_search_detailed, web_search_many
+from project.tools.file_tools import save_research, get_all_research, list_research
 
 
 researcher = Agent(
@@ -24,9 +28,11 @@ information on a given topic.
 
 Your workflow:
 1. Break the topic into 2-3 key subtopics to research.
-2. Use web_search for each subtopic.
+2. Search for ALL subtopics in a single web_search_many call (one query per
+   subtopic). Only use web_search afterwards to fill a specific gap.
 3. Synthesize the findings into clear, well-organized research notes.
-4. Save your findings using save_research (one save per subtopic).
+4. Save your findings using save_research (one save per subtopic), passing the
+   titles of the results you used as sources.
 
 Guidelines:
 - Be thorough but concise — focus on facts, data, and key insights.
@@ -34,6 +40,53 @@ Guidelines:
 - Always cite the source titles in your notes.
 - When done, summarize what you found and what subtopics you covered.
 """,
-    tools=[web_search, web_search_detailed, save_research, get_all_research],
+    tools=[web_search, web_search_many, web_search_detailed, save_research, list_research, get_all_research],
     handoff_description="Specialist that researches topics and gathers information",
 )
+
+
+# ── Fan-out variant: plan once, research subtopics in parallel ──────
+class ResearchPlan(BaseModel):
+    """The subtopics to research for a topic."""
+
+    subtopics: list[str] = Field(
+        description="2-3 focused, non-overlapping subtopics that together cover the topic",
+    )
+
+
+research_planner = Agent(
+    name="Research Planner",
+    model=MODEL,
+    # Same topic, same plan; reruns can then be answered by the LLM cache
+    model_settings=ModelSettings(temperature=0),
+    instructions="""\
+You are a research lead. Break the given topic into 2-3 key subtopics
+that can be researched independently of each other.
+
+Guidelines:
+- Each subtopic should be specific enough to search for directly.
+- Avoid overlap between subtopics.
+- Do NOT research anything yourself — only return the plan.
+""",
+    output_type=ResearchPlan,
+)
+
+subtopic_researcher = researcher.clone(
+    name="Subtopic Researcher",
+    instructions="""\
+You are an expert research analyst. You are given ONE subtopic of a larger
+topic. Research only that subtopic — other analysts cover the rest.
+
+Your workflow:
+1. Search for the subtopic. If it has several angles, cover them in a single
+   web_search_many call rather than one web_search call per angle.
+2. Synthesize the findings into clear, well-organized research notes.
+3. Save your findings ONCE using save_research, with the subtopic as the topic
+   and the titles of the results you used as sources.
+
+Guidelines:
+- Be thorough but concise — focus on facts, data, and key insights.
+- Note any conflicting information or gaps.
+- Always cite the source titles in your notes.
+""",
+)
@@ -6,13 +6,11 @@ Uses structured output to ensure consistent, actionable reviews.
 """
 
 from pydantic import BaseModel, Field
-from agents import Agent
+from agents import Agent, ModelSettings
 
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 from config import MODEL
 
-from project.tools.file_tools import get_draft
+from project.tools.file_tools import get_draft, get_draft_diff
 
 
 class ContentReview(BaseModel):
@@ -43,12 +41,16 @@ class ContentReview(BaseModel):
 reviewer = Agent(
     name="Reviewer",
     model=MODEL,
+    # Stable scores: an unchanged draft gets the same review (cacheable, lab/cache.py)
+    model_settings=ModelSettings(temperature=0),
     instructions="""\
 You are a senior content editor and quality reviewer. Your job is to
 critically evaluate written content and provide structured feedback.
 
 Your workflow:
-1. Use get_draft to read the current draft.
+1. Use get_draft to read the current draft. If you already reviewed an
+   earlier version, use get_draft_diff with that version number instead to
+   read only what changed.
 2. Evaluate it thoroughly.
 3. Return your structured review.
 
@@ -67,7 +69,7 @@ Scoring guide:
 
 Be constructive but honest. Give specific, actionable feedback.
 """,
-    tools=[get_draft],
+    tools=[get_draft, get_draft_diff],
     output_type=ContentReview,
     handoff_description="Specialist that reviews and critiques written content",
 )
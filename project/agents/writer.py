@@ -3,15 +3,20 @@ Writer Agent
 =============
 Creates polished content from research findings.
 Reads research from context and produces a well-structured draft.
+
+The outline planner and section writer below split the same job into an
+outline plus one model call per section, written in parallel
+(see project/outline_writer.py).
 """
 
-from agents import Agent
+from pydantic import BaseModel, Field
+from agents import Agent, ModelSettings
 
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 from config import MODEL
 
-from project.tools.file_tools import get_all_research, save_draft, get_draft
+from project.tools.file_tools import (
+    get_all_research, list_research, save_draft, get_draft, get_draft_diff, wait_for_research,
+)
 
 
 writer = Agent(
@@ -22,10 +27,14 @@ You are an expert content writer. Your job is to create engaging,
 well-structured articles from research notes.
 
 Your workflow:
-1. Use get_all_research to retrieve the research findings.
-2. Organize the information into a compelling narrative.
-3. Write the full article.
-4. Save the draft using save_draft.
+1. Use list_research to see which subtopics were researched.
+2. Plan your sections, then use get_all_research with a query per section
+   (e.g. the section heading) and max_tokens around 800 to pull only the
+   relevant passages. Call it without a query only if you need everything.
+3. Organize the information into a compelling narrative.
+4. Write the full article.
+5. Save the draft using save_draft. When revising, use get_draft_diff to
+   check what changed since a version you have already read.
 
 Writing guidelines:
 - Start with a hook that draws the reader in.
@@ -35,6 +44,70 @@ Writing guidelines:
 - End with a forward-looking conclusion.
 - Target length: 400-600 words.
 """,
-    tools=[get_all_research, save_draft, get_draft],
+    tools=[list_research, get_all_research, wait_for_research, save_draft, get_draft, get_draft_diff],
     handoff_description="Specialist that writes polished content from research",
 )
+
+
+# ── Outline-then-fill variant: sections written in parallel ─────────
+class OutlineSection(BaseModel):
+    """One section of the planned article."""
+
+    heading: str = Field(description="The section heading (without ##)")
+    points: list[str] = Field(description="2-4 points this section must make, in order")
+    research_query: str = Field(
+        description="Search query for the research passages this section needs",
+    )
+    words: int = Field(description="Target length of the section in words")
+
+
+class ArticleOutline(BaseModel):
+    """The plan for an article, section by section."""
+
+    title: str = Field(description="The article title")
+    sections: list[OutlineSection] = Field(
+        description="3-6 sections in reading order; the first opens with the hook, "
+                    "the last is the forward-looking conclusion",
+    )
+
+
+outline_planner = Agent(
+    name="Outline Planner",
+    model=MODEL,
+    model_settings=ModelSettings(temperature=0),
+    instructions="""\
+You are an editor planning an article from research notes. Other writers
+will each write ONE section in parallel, without seeing each other's work,
+so the outline must keep them from overlapping.
+
+Your workflow:
+1. Use list_research to see which subtopics were researched, and
+   get_all_research if you need to see what they contain.
+2. Return the outline: a title and 3-6 sections. Give every section distinct
+   points, a research query for the passages it needs, and a word target.
+   The word targets should add up to 400-600 words.
+
+Do NOT write the article yourself — only return the outline.
+""",
+    tools=[list_research, get_all_research],
+    output_type=ArticleOutline,
+)
+
+section_writer = Agent(
+    name="Section Writer",
+    model=MODEL,
+    instructions="""\
+You are an expert content writer. You write ONE section of a longer
+article; other writers are writing the other sections at the same time.
+
+You are given the article title, the full outline, your section's heading,
+the points to make, a word target, and research passages. Write only the
+body of your section:
+- Do not repeat the heading, and do not add other ## headings.
+- Make only your section's points — the outline shows what the others cover.
+- Use specific data points and examples from the research passages.
+- Write for an educated general audience; the first section opens with a
+  hook, the last ends with a forward-looking conclusion.
+Reply with the section text only.
+""",
+)
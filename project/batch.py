@@ -0,0 +1,322 @@
+"""
+Multi-Agent Content Team — Batch Entry Point
+==============================================
+Runs the full pipeline for MANY topics in one process.
+
+Instead of launching one Python process per topic (and paying the config.py
+startup cost every time), this runs many run_pipeline() calls concurrently
+on one event loop. A semaphore caps how many pipelines are in flight at once.
+
+  • Each topic gets its own isolated PipelineContext.
+  • Every finished topic is appended to a JSONL file as soon as it completes.
+  • A summary reports throughput, p50/p95 latency per phase, and failures.
+
+Usage:
+    python batch.py topics.txt                        # One topic per line
+    cat topics.txt | python batch.py -                # Read topics from stdin
+    python batch.py topics.txt -c 16 -o out.jsonl     # 16 pipelines at once
+    python batch.py topics.txt --resume               # Keep finished results, reuse checkpoints
+    python batch.py topics.txt --overlap              # Start writing while research arrives
+    python batch.py topics.txt --sections             # Write each article's sections in parallel
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+# Add project root to path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from rich.console import Console
+from rich.table import Table
+
+from config import ConfigError, validate_config, warm_up
+from project.main import run_pipeline, topic_key
+from project.tools.compaction import compaction_stats
+from project.tools.web_search import search_cache_stats
+
+
+# ── Results ─────────────────────────────────────────────────────────
+@dataclass
+class TopicResult:
+    """Outcome of one pipeline run in a batch."""
+
+    topic: str
+    ok: bool
+    seconds: float
+    phase_seconds: dict = field(default_factory=dict)
+    error: str = ""
+    record: dict = field(default_factory=dict)
+
+
+@dataclass
+class BatchSummary:
+    """Aggregate statistics for a finished batch."""
+
+    total: int
+    succeeded: int
+    failed: int
+    wall_seconds: float
+    topics_per_minute: float
+    # phase name -> {"p50": seconds, "p95": seconds}
+    phase_latency: dict = field(default_factory=dict)
+    failures: list[tuple[str, str]] = field(default_factory=list)
+    # Topics already finished in an earlier run (resume=True), not run again
+    reused: int = 0
+    # Search result cache counters (see project/tools/search_cache.py)
+    search_cache: dict = field(default_factory=dict)
+    # Tokens kept out of the conversation by compacting search results
+    compaction: dict = field(default_factory=dict)
+
+
+def read_topics(source: str) -> list[str]:
+    """Read one topic per line from a file, or from stdin when source is "-".
+
+    Blank lines and lines starting with '#' are skipped.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def unique_topics(topics: list[str]) -> list[str]:
+    """Topics in order, without repeats (same checkpoint key = same topic).
+
+    >>> unique_topics(["Fusion", "AI", "fusion "])
+    ['Fusion', 'AI']
+    """
+    unique: dict[str, str] = {}
+    for topic in topics:
+        unique.setdefault(topic_key(topic), topic)
+    return list(unique.values())
+
+
+def load_results(path: str) -> dict[str, dict]:
+    """Successful results already in a JSONL results file, by topic key."""
+    if not os.path.exists(path):
+        return {}
+    done = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue  # A line cut off by the crash being resumed from
+            if row.get("ok"):
+                done[topic_key(row["topic"])] = row
+    return done
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile (pct in 0-100) of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# ── Batch runner ────────────────────────────────────────────────────
+async def _run_one(
+    topic: str,
+    semaphore: asyncio.Semaphore,
+    resume: bool,
+    overlap: bool,
+    sections: bool,
+) -> TopicResult:
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            # A quiet console keeps concurrent pipelines from interleaving output
+            ctx, review = await run_pipeline(
+                topic, console=Console(quiet=True), resume=resume, overlap=overlap, sections=sections,
+            )
+        except Exception as e:
+            return TopicResult(
+                topic=topic,
+                ok=False,
+                seconds=time.perf_counter() - started,
+                error=f"{type(e).__name__}: {e}",
+            )
+
+    return TopicResult(
+        topic=topic,
+        ok=True,
+        seconds=time.perf_counter() - started,
+        phase_seconds=dict(ctx.phase_seconds),
+        record={
+            "subtopics": list(ctx.research.keys()),
+            "draft_version": ctx.draft_version,
+            "draft": ctx.draft,
+            "review": review.model_dump(),
+            "revisions": [asdict(i) for i in ctx.revisions],
+            "overlap": ctx.overlap_stats,
+            "writer": ctx.writer_stats,
+        },
+    )
+
+
+async def run_batch(
+    topics: list[str],
+    concurrency: int = 8,
+    output_path: str = "results.jsonl",
+    resume: bool = False,
+    overlap: bool = False,
+    sections: bool = False,
+) -> BatchSummary:
+    """Run the pipeline for every topic, at most `concurrency` at a time.
+
+    Results are appended to `output_path` (JSONL) in completion order.
+    Repeated topics are run once.
+
+    Args:
+        topics: The topics to process.
+        concurrency: Maximum number of pipelines running at once.
+        output_path: Where to write one JSON object per topic.
+        resume: Keep the successful results already in `output_path` (those
+            topics aren't run again), and skip phases already covered by
+            each remaining topic's checkpoint.
+        overlap: Start each Writer while its research is still arriving.
+        sections: Outline each article and write its sections in parallel.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: list[TopicResult] = []
+    started = time.perf_counter()
+
+    # Duplicate topics would share (and overwrite) one checkpoint file
+    topics = unique_topics(topics)
+    done = load_results(output_path) if resume else {}
+    previous = [done[key] for key in map(topic_key, topics) if key in done]
+    for row in previous:
+        results.append(TopicResult(
+            topic=row["topic"], ok=True, seconds=row.get("seconds", 0.0),
+            phase_seconds=row.get("phase_seconds", {}),
+        ))
+
+    await warm_up(connections=concurrency)  # No-op unless AZURE_OPENAI_WARMUP is set
+
+    tasks = [
+        asyncio.create_task(_run_one(topic, semaphore, resume, overlap, sections))
+        for topic in topics if topic_key(topic) not in done
+    ]
+    with open(output_path, "w", encoding="utf-8") as out:
+        # The file is rewritten, so carry over what the earlier run finished
+        for row in previous:
+            out.write(json.dumps(row) + "\n")
+        out.flush()
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            results.append(result)
+            out.write(json.dumps({
+                "topic": result.topic,
+                "ok": result.ok,
+                "error": result.error,
+                "seconds": round(result.seconds, 3),
+                "phase_seconds": {k: round(v, 3) for k, v in result.phase_seconds.items()},
+                **result.record,
+            }) + "\n")
+            out.flush()
+
+    wall = time.perf_counter() - started
+    succeeded = [r for r in results if r.ok]
+
+    phase_latency = {}
+    for phase in ("research", "writing", "review", "revision"):
+        values = [r.phase_seconds[phase] for r in succeeded if phase in r.phase_seconds]
+        phase_latency[phase] = {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+    totals = [r.seconds for r in succeeded]
+    phase_latency["total"] = {"p50": percentile(totals, 50), "p95": percentile(totals, 95)}
+
+    return BatchSummary(
+        total=len(results),
+        succeeded=len(succeeded),
+        failed=len(results) - len(succeeded),
+        wall_seconds=wall,
+        topics_per_minute=len(succeeded) / wall * 60 if wall > 0 else 0.0,
+        phase_latency=phase_latency,
+        failures=[(r.topic, r.error) for r in results if not r.ok],
+        search_cache=search_cache_stats(),
+        compaction=compaction_stats(),
+        reused=len(previous),
+    )
+
+
+def print_summary(summary: BatchSummary, console: Console) -> None:
+    """Pretty-print a BatchSummary."""
+    console.print(
+        f"\n[bold]Processed {summary.total} topics[/bold] in {summary.wall_seconds:.1f}s — "
+        f"[green]{summary.succeeded} ok[/green], [red]{summary.failed} failed[/red], "
+        f"{summary.topics_per_minute:.1f} topics/min"
+    )
+    if summary.reused:
+        console.print(f"{summary.reused} of them finished in an earlier run and were not run again")
+
+    table = Table(title="Latency per phase (seconds)")
+    table.add_column("Phase")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    for phase, stats in summary.phase_latency.items():
+        table.add_row(phase, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}")
+    console.print(table)
+
+    cache = summary.search_cache
+    if cache:
+        console.print(
+            f"Search cache: {cache['hits']} hits, {cache['coalesced']} coalesced, "
+            f"{cache['misses']} backend calls ({cache['hit_rate']:.0%} saved)"
+        )
+
+    compaction = summary.compaction
+    if compaction.get("calls"):
+        console.print(
+            f"Search result compaction: {compaction['saved_tokens']:,} of "
+            f"{compaction['original_tokens']:,} tokens saved over {compaction['calls']} calls"
+        )
+
+    for topic, error in summary.failures:
+        console.print(f"  [red]✗[/red] {topic}: {error}")
+
+
+# ── Entry point ──────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the content pipeline for many topics.")
+    parser.add_argument("topics", help="File with one topic per line, or '-' for stdin")
+    parser.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="Maximum pipelines running at once (default: 8)")
+    parser.add_argument("-o", "--output", default="results.jsonl",
+                        help="JSONL file for per-topic results (default: results.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep results already in the output file; skip checkpointed phases")
+    parser.add_argument("--overlap", action="store_true",
+                        help="Start writing while research is still arriving")
+    parser.add_argument("--sections", action="store_true",
+                        help="Outline each article, then write its sections in parallel")
+    args = parser.parse_args()
+
+    console = Console()
+    try:
+        validate_config()
+    except ConfigError as e:
+        console.print(f"[red]ERROR: {e}[/red]")
+        sys.exit(1)
+
+    topics = read_topics(args.topics)
+    if not topics:
+        console.print("[red]No topics to process.[/red]")
+        sys.exit(1)
+
+    console.print(f"Running {len(topics)} topics with concurrency {args.concurrency}...")
+    summary = asyncio.run(run_batch(
+        topics, args.concurrency, args.output, args.resume, args.overlap, args.sections,
+    ))
+    print_summary(summary, console)
+    console.print(f"\nResults written to {args.output}")
@@ -0,0 +1,100 @@
+"""
+Phase-level checkpoints for the pipeline.
+
+After each phase, run_pipeline writes the PipelineContext (topic, research,
+draft, draft_version, the delta-encoded draft history and the revision
+metrics) plus the list of completed phases to a small JSON file
+keyed by a hash of the topic. With resume=True, a rerun loads that file and
+skips every phase whose checkpoint is still valid — so a failure in Phase 3
+doesn't mean paying for research and writing again.
+
+A checkpoint is only trusted if:
+  • it was written by the same checkpoint format version,
+  • it belongs to exactly the same topic (not just the same hash), and
+  • the phases form an unbroken prefix of PHASES with their outputs present.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict
+
+# Bump this when the checkpoint layout changes; older files are then ignored
+CHECKPOINT_VERSION = 3
+
+# Pipeline phases, in order. A phase is only valid if all earlier ones are.
+PHASES = ("research", "writing", "review", "revision")
+
+
+def checkpoint_path(directory: str, key: str) -> str:
+    return os.path.join(directory, f"{key}.json")
+
+
+def save_checkpoint(directory: str, key: str, ctx, completed: list[str], review=None) -> str:
+    """Write the checkpoint for a topic, replacing any previous one.
+
+    Args:
+        directory: Folder that holds checkpoint files.
+        key: Topic key (see main.topic_key).
+        ctx: The PipelineContext to save.
+        completed: Names of the phases that have finished, in order.
+        review: The latest ContentReview, once the review phase has finished.
+
+    Returns:
+        The path of the checkpoint file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    data = {
+        "version": CHECKPOINT_VERSION,
+        "saved_at": time.time(),
+        "completed": list(completed),
+        "topic": ctx.topic,
+        "research": ctx.research,
+        "draft": ctx.draft,
+        "draft_version": ctx.draft_version,
+        "drafts": ctx.drafts.as_dict(),
+        "revisions": [asdict(i) for i in ctx.revisions],
+        "review": review.model_dump() if review is not None else None,
+    }
+    path = checkpoint_path(directory, key)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)  # Atomic: a crash never leaves a half-written checkpoint
+    return path
+
+
+def _phase_is_valid(data: dict, phase: str) -> bool:
+    if phase == "research":
+        return bool(data.get("research"))
+    if phase == "writing":
+        return bool(data.get("draft"))
+    if phase in ("review", "revision"):
+        return data.get("review") is not None
+    return False
+
+
+def load_checkpoint(directory: str, key: str, topic: str) -> tuple[dict, list[str]]:
+    """Load a topic's checkpoint and work out which phases can be skipped.
+
+    Returns:
+        (data, completed) — the saved fields and the valid completed phases.
+        Both are empty if there is no usable checkpoint.
+    """
+    try:
+        with open(checkpoint_path(directory, key), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}, []
+
+    if data.get("version") != CHECKPOINT_VERSION or data.get("topic") != topic:
+        return {}, []
+
+    completed = []
+    saved = set(data.get("completed", []))
+    for phase in PHASES:
+        if phase not in saved or not _phase_is_valid(data, phase):
+            break
+        completed.append(phase)
+    return data, completed
+
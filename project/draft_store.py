@@ -0,0 +1,135 @@
+"""
+Versioned draft history with delta encoding.
+
+save_draft used to overwrite the draft, so earlier versions were lost, and
+every get_draft call returned the whole article — in a revision loop the
+reviewer and writer re-read thousands of unchanged words each round.
+
+DraftHistory keeps every version. Most are stored as a line-level delta
+against the previous version (runs of lines copied from it, plus the new
+text); every SNAPSHOT_EVERY versions — or whenever a delta wouldn't be
+smaller — the full text is stored instead, so rebuilding any version applies
+at most a few deltas. diff(since) gives a unified diff from an older version
+to the current one, which is what get_draft_diff returns.
+"""
+
+import difflib
+from dataclasses import dataclass, field
+
+# Store a full snapshot at least this often, to bound the deltas to replay
+SNAPSHOT_EVERY = 8
+
+
+def _lines(text: str) -> list[str]:
+    return text.splitlines(keepends=True)
+
+
+def encode_delta(base: str, text: str) -> list:
+    """Encode `text` against `base`.
+
+    Returns:
+        A list of [start, end] (copy base lines start:end) and str (new text)
+        items, which decode_delta turns back into `text`.
+
+    >>> encode_delta("a\\nb\\nc\\n", "a\\nB\\nc\\n")
+    [[0, 1], 'B\\n', [2, 3]]
+    """
+    base_lines, lines = _lines(base), _lines(text)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:  # replace / insert (a delete only skips base lines)
+            ops.append("".join(lines[j1:j2]))
+    return ops
+
+
+def decode_delta(base: str, ops: list) -> str:
+    base_lines = _lines(base)
+    return "".join(op if isinstance(op, str) else "".join(base_lines[op[0]:op[1]]) for op in ops)
+
+
+def _delta_size(ops: list) -> int:
+    return sum(len(op) if isinstance(op, str) else 8 for op in ops)
+
+
+@dataclass
+class DraftHistory:
+    """Every saved version of a draft. Versions are numbered from 1.
+
+    Entries are {"snapshot": text} or {"delta": ops against the previous version}.
+    """
+
+    entries: list = field(default_factory=list)
+    _current: str = field(default="", repr=False)
+
+    @property
+    def version(self) -> int:
+        return len(self.entries)
+
+    @property
+    def current(self) -> str:
+        return self._current
+
+    def commit(self, text: str) -> int:
+        """Save a new version. Returns its version number."""
+        since_snapshot = 0
+        for entry in reversed(self.entries):
+            if "snapshot" in entry:
+                break
+            since_snapshot += 1
+
+        entry = {"snapshot": text}
+        if self.entries and since_snapshot + 1 < SNAPSHOT_EVERY:
+            ops = encode_delta(self._current, text)
+            if _delta_size(ops) < len(text):
+                entry = {"delta": ops}
+        self.entries.append(entry)
+        self._current = text
+        return self.version
+
+    def get(self, version: int) -> str:
+        """The text of a version (1 … self.version)."""
+        if not 1 <= version <= self.version:
+            raise ValueError(f"No draft v{version} (have v1–v{self.version})")
+        if version == self.version:
+            return self._current
+        return self._rebuild(version)
+
+    def _rebuild(self, version: int) -> str:
+        # Start from the nearest snapshot at or before `version`, replay deltas
+        start = version - 1
+        while "snapshot" not in self.entries[start]:
+            start -= 1
+        text = self.entries[start]["snapshot"]
+        for entry in self.entries[start + 1:version]:
+            text = decode_delta(text, entry["delta"])
+        return text
+
+    def diff(self, since: int, context: int = 2) -> str:
+        """Unified diff from version `since` to the current version ('' if unchanged)."""
+        lines = difflib.unified_diff(
+            _lines(self.get(since)), _lines(self._current),
+            fromfile=f"v{since}", tofile=f"v{self.version}", n=context,
+        )
+        return "".join(line if line.endswith("\n") else line + "\n" for line in lines)
+
+    def stats(self) -> dict:
+        """Characters stored vs. characters if every version were kept in full."""
+        stored = sum(
+            len(e["snapshot"]) if "snapshot" in e else _delta_size(e["delta"]) for e in self.entries
+        )
+        full = sum(len(self.get(v)) for v in range(1, self.version + 1))
+        snapshots = sum("snapshot" in e for e in self.entries)
+        return {"versions": self.version, "snapshots": snapshots, "stored_chars": stored, "full_chars": full}
+
+    def as_dict(self) -> dict:
+        return {"entries": self.entries}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DraftHistory":
+        history = cls(entries=list(data.get("entries", [])))
+        if history.entries:
+            history._current = history._rebuild(history.version)
+        return history
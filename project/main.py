@@ -1,35 +1,62 @@
 """
 Multi-Agent Content Team — Main Entry Point
 =============================================
-Runs the full pipeline: Research → Write → Review
+Runs the full pipeline: Research → Write → Review → Revise
 
 This demonstrates a SEQUENTIAL pipeline pattern:
-  1. Orchestrator hands off to Researcher
+  1. A planner splits the topic into subtopics, and one Researcher run per
+     subtopic gathers information IN PARALLEL (asyncio.gather)
   2. Then we run the Writer (with context from research)
   3. Then we run the Reviewer (which returns structured output)
+  4. Unless the verdict is "publish", the Writer revises and the Reviewer
+     re-reviews until the score plateaus or a budget runs out (revision.py)
 
 Usage:
     python main.py                              # Default topic
     python main.py "The future of renewable energy"   # Custom topic
+    python main.py --stream "quantum computing"       # Watch the draft being written
+    python main.py --resume "quantum computing"       # Skip phases finished by an earlier run
+    python main.py --max-revisions 0 "quantum computing"  # Review once, don't revise
+    python main.py --overlap "quantum computing"      # Start writing while research arrives
+    python main.py --sections "quantum computing"     # Write the sections in parallel
 """
 
+import argparse
 import asyncio
+import hashlib
 import os
 import sys
+import time
 from dataclasses import dataclass, field
 
 # Add project root to path so imports work
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from config import MODEL  # loads .env and sets up Azure OpenAI
+from config import ConfigError, setting, validate_config, warm_up
 from agents import Runner, trace
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 
-from project.agents.researcher import researcher
+from project.agents.researcher import research_planner, subtopic_researcher
 from project.agents.writer import writer
-from project.agents.reviewer import reviewer
+from project.agents.reviewer import reviewer, ContentReview
+from project.checkpoint import load_checkpoint, save_checkpoint
+from project.draft_store import DraftHistory
+from project.outline_writer import write_sectioned
+from project.research_feed import ResearchFeed
+from project.revision import RevisionBudget, RevisionIteration, print_revisions, run_revision_loop
+from project.research_store import get_research_store
+from project.streaming import run_streamed
+
+# Where the pipeline keeps files between runs (checkpoints, partial drafts, ...)
+PIPELINE_DIR = os.environ.get("PIPELINE_DIR", os.path.join(os.path.dirname(__file__), ".pipeline"))
+
+
+def topic_key(topic: str) -> str:
+    """Stable, filesystem-safe key for a topic."""
+    normalized = " ".join(topic.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
 
 
 # ── Shared context for the entire pipeline ───────────────────────────
@@ -41,57 +68,398 @@ class PipelineContext:
     research: dict = field(default_factory=dict)
     draft: str = ""
     draft_version: int = 0
+    # Every saved draft version, delta-encoded (see draft_store.py)
+    drafts: DraftHistory = field(default_factory=DraftHistory)
+    # One RevisionIteration per revise → re-review round (see revision.py)
+    revisions: list = field(default_factory=list)
+    # Research store run the phase's save_research calls belong to (see research_store.py)
+    research_run: str = ""
+    # Set while research and writing overlap (see research_feed.py)
+    research_feed: ResearchFeed | None = None
+    # How much of the research phase the Writer overlapped (overlap=True only)
+    overlap_stats: dict = field(default_factory=dict)
+    # Outline and per-section timings (sections=True only, see outline_writer.py)
+    writer_stats: dict = field(default_factory=dict)
+    # Wall-clock seconds spent in each phase, filled in by run_pipeline
+    phase_seconds: dict = field(default_factory=dict)
+    # TTFT and tokens/sec per streamed phase (only filled in with stream=True)
+    stream_stats: dict = field(default_factory=dict)
+
+
+# ── Phase 1 helper: parallel research fan-out ───────────────────────
+async def run_research_phase(ctx: PipelineContext, console: Console) -> list[str]:
+    """Plan subtopics once, then research them concurrently.
+
+    Each subtopic run gets its own PipelineContext, so its save_research calls
+    land in a private slot. The slots are merged into ctx.research once all
+    runs have finished — or, when ctx.research_feed is set, as each save is
+    published to the feed. Every save is also written to the research store
+    as part of this phase's run, which is only marked complete (and so
+    reusable by later runs) if every subtopic succeeded. A failed subtopic is
+    reported and skipped; the phase only fails if every subtopic failed.
+
+    Returns:
+        The planned subtopics.
+    """
+    plan = await Runner.run(
+        research_planner,
+        f"Plan the research for this topic: {ctx.topic}",
+        context=ctx,
+    )
+    subtopics = plan.final_output.subtopics or [ctx.topic]
+    console.print(f"  Planned subtopics: {subtopics}")
+    if ctx.research_feed is not None:
+        await ctx.research_feed.expect(len(subtopics))
+
+    # Opened only now that there is a plan; discarded below unless every subtopic succeeds
+    store = get_research_store()
+    ctx.research_run = store.begin(ctx.topic) if store is not None else ""
+
+    async def research_one(subtopic: str) -> dict:
+        slot = PipelineContext(
+            topic=ctx.topic, research_run=ctx.research_run, research_feed=ctx.research_feed,
+        )
+        await Runner.run(
+            subtopic_researcher,
+            f"Research this subtopic of '{ctx.topic}': {subtopic}",
+            context=slot,
+        )
+        return slot.research
+
+    try:
+        results = await asyncio.gather(
+            *(research_one(s) for s in subtopics),
+            return_exceptions=True,
+        )
+    except BaseException:
+        if store is not None:
+            store.discard(ctx.research_run)
+        raise
+
+    errors = []
+    for subtopic, result in zip(subtopics, results):
+        if isinstance(result, BaseException):
+            errors.append(result)
+            console.print(f"  [red]✗ {subtopic}: {type(result).__name__}: {result}[/red]")
+            continue
+        if ctx.research_feed is not None:
+            continue  # Already merged by the feed as it arrived
+        ctx.research.update(result)  # Latest save wins, as with the feed
+
+    if store is not None:
+        if errors:
+            store.discard(ctx.research_run)
+        else:
+            store.complete(ctx.research_run)
+    if len(errors) == len(subtopics):
+        raise errors[0]
+    return subtopics
+
+
+def load_stored_research(ctx: PipelineContext, console: Console) -> bool:
+    """Fill ctx.research from the topic's fresh, complete research set in the store.
+
+    Returns:
+        True if stored research was used (and the research phase can be skipped).
+    """
+    store = get_research_store()
+    if store is None:
+        return False
+    entries = store.entries(ctx.topic, max_age=setting("RESEARCH_MAX_AGE"))
+    if not entries:
+        return False
+
+    ctx.research = {e.subtopic: e.findings for e in entries}
+    oldest = max(e.age for e in entries)
+    console.print(
+        f"[yellow]↷ Using stored research: {len(entries)} subtopics, "
+        f"oldest saved {_format_age(oldest)} ago[/yellow]"
+    )
+    return True
+
+
+def _format_age(seconds: float) -> str:
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f}{unit}"
+    return f"{seconds:.0f}s"
+
+
+# ── Phase 2 helper: run the Writer ──────────────────────────────────
+async def run_writer(
+    ctx: PipelineContext,
+    console: Console,
+    prompt: str,
+    stream: bool,
+    sections: bool = False,
+) -> None:
+    """Run the Writer, streamed (echoing the draft and saving it as it grows) or not.
+
+    With sections=True the article is outlined and its sections are written in
+    parallel instead (outline_writer.py); `prompt` and `stream` don't apply.
+    """
+    if sections:
+        ctx.writer_stats = await write_sectioned(ctx, console)
+        return
+    if stream:
+        partial_path = os.path.join(PIPELINE_DIR, "drafts", f"{topic_key(ctx.topic)}.partial.md")
+        _, ctx.stream_stats["writing"] = await run_streamed(
+            writer, prompt, ctx, console=console, echo=True, partial_path=partial_path,
+        )
+    else:
+        await Runner.run(writer, prompt, context=ctx)
+
+
+# ── Phases 1 + 2 overlapped ─────────────────────────────────────────
+async def run_overlapped_phases(
+    ctx: PipelineContext,
+    console: Console,
+    stream: bool,
+    start_share: float = 0.5,
+    sections: bool = False,
+) -> None:
+    """Research and write at the same time.
+
+    Subtopic researchers publish their findings to a ResearchFeed as they
+    finish. The Writer starts once `start_share` of the planned subtopics have
+    arrived and picks up the rest with wait_for_research (with sections=True,
+    the outline is planned early and the sections are filled once all research
+    is in). How long the two phases overlapped is recorded in ctx.overlap_stats.
+    """
+    feed = ctx.research_feed = ResearchFeed()
+    drain = asyncio.create_task(feed.drain_into(ctx.research))
+    research = asyncio.create_task(run_research_phase(ctx, console))
+    ready = asyncio.create_task(feed.wait_for_share(start_share))
+
+    try:
+        await asyncio.wait({research, ready}, return_when=asyncio.FIRST_COMPLETED)
+        if research.done() and research.exception() is not None:
+            raise research.exception()
+
+        writer_started = time.perf_counter()
+        at_start = len(ctx.research)
+        console.print(f"  Writer starting with {at_start} subtopic(s) in...\n")
+        prompt = (
+            f"Write a compelling article about: {ctx.topic}. Use the research that has been "
+            f"gathered. Research is still arriving: start from the subtopics that are there, "
+            f"and before saving the draft call wait_for_research until it says all research "
+            f"is in, reading any new subtopics with get_all_research."
+        )
+        writing = asyncio.create_task(run_writer(ctx, console, prompt, stream, sections))
+
+        try:
+            await research
+        except BaseException:
+            # Let the Writer actually stop before the feed is taken away below
+            writing.cancel()
+            await asyncio.gather(writing, return_exceptions=True)
+            raise
+        feed.close()
+        await drain
+        research_ended = time.perf_counter()
+        await writing
+    finally:
+        ready.cancel()
+        if not drain.done():
+            drain.cancel()
+        await asyncio.gather(ready, drain, return_exceptions=True)
+        ctx.research_feed = None
+
+    finished = time.perf_counter()
+    research_seconds = research_ended - feed.started
+    overlap = max(0.0, research_ended - writer_started)
+    late = [s for s, arrived in feed.arrived if arrived > writer_started - feed.started]
+    ctx.phase_seconds["research"] = research_seconds
+    ctx.phase_seconds["writing"] = finished - writer_started
+    ctx.overlap_stats = {
+        "writer_start_seconds": writer_started - feed.started,
+        "subtopics_at_writer_start": at_start,
+        "late_subtopics": len(late),
+        "overlap_seconds": overlap,
+        "overlap_share": overlap / research_seconds if research_seconds > 0 else 0.0,
+        "sequential_seconds": research_seconds + (finished - writer_started),
+        "overlapped_seconds": finished - feed.started,
+    }
+
+
+def _print_writer_stats(console: Console, ctx: PipelineContext) -> None:
+    stats = ctx.writer_stats
+    if not stats:
+        return
+    console.print(
+        f"  {stats['sections']} sections in parallel: outline {stats['outline_seconds']:.1f}s, "
+        f"fill {stats['fill_seconds']:.1f}s (sections one after another: "
+        f"{stats['sequential_seconds']:.1f}s), {stats['duplicates_dropped']} duplicate paragraphs dropped"
+    )
+
+
+def _print_stream_stats(console: Console, ctx: PipelineContext, phase: str) -> None:
+    stats = ctx.stream_stats.get(phase)
+    if stats is None:
+        return
+    ttft = f"{stats.ttft:.2f}s" if stats.ttft is not None else "n/a"
+    console.print(
+        f"  Time to first token: {ttft} · "
+        f"{stats.output_tokens} tokens at {stats.tokens_per_sec:.1f} tokens/sec"
+    )
 
 
 # ── Main pipeline ───────────────────────────────────────────────────
-async def run_pipeline(topic: str):
-    console = Console()
+async def run_pipeline(
+    topic: str,
+    console: Console | None = None,
+    stream: bool = False,
+    resume: bool = False,
+    refresh_research: bool = False,
+    budget: RevisionBudget | None = None,
+    overlap: bool = False,
+    sections: bool = False,
+):
+    """Run Research → Write → Review → Revise for one topic.
+
+    The context is checkpointed to PIPELINE_DIR/checkpoints/ after every phase.
+
+    Args:
+        topic: The topic to write about.
+        console: Where to print progress. Pass Console(quiet=True) to run silently
+            (batch.py does this so concurrent pipelines don't interleave output).
+        stream: Stream the Writer and Reviewer phases. The draft is printed as it
+            is generated, saved to PIPELINE_DIR/drafts/ as it grows, and
+            time-to-first-token and tokens/sec are recorded in ctx.stream_stats.
+        resume: Load this topic's checkpoint and skip the phases it already covers.
+        refresh_research: Forget the topic's stored research sets and research
+            it again, even if the store has one younger than RESEARCH_MAX_AGE.
+        budget: Limits for the revision loop (default: REVISION_* settings;
+            max_iterations=0 skips it).
+        overlap: Start the Writer while research is still arriving, instead
+            of after the whole research phase (see run_overlapped_phases).
+        sections: Outline the article and write its sections in parallel
+            instead of in one Writer run (see outline_writer.py).
+    """
+    console = console or Console()
 
     # Create shared context
     ctx = PipelineContext(topic=topic)
+    review = None
+
+    # Restore finished phases from a previous run
+    key = topic_key(topic)
+    checkpoint_dir = os.path.join(PIPELINE_DIR, "checkpoints")
+    completed = []
+    if resume:
+        saved, completed = load_checkpoint(checkpoint_dir, key, topic)
+        if "research" in completed:
+            ctx.research = saved["research"]
+        if "writing" in completed:
+            ctx.draft = saved["draft"]
+            ctx.draft_version = saved["draft_version"]
+            ctx.drafts = DraftHistory.from_dict(saved["drafts"])
+        if "review" in completed:
+            review = ContentReview.model_validate(saved["review"])
+            ctx.revisions = [RevisionIteration(**i) for i in saved["revisions"]]
 
     console.print(Panel(f"[bold]Topic:[/bold] {topic}", title="🚀 Content Pipeline", border_style="blue"))
+    if completed:
+        console.print(f"[yellow]↷ Resuming from checkpoint — skipping: {', '.join(completed)}[/yellow]")
 
     # ── Phase 1: Research ────────────────────────────────────────────
-    with trace("Phase 1: Research"):
-        console.print("\n[bold cyan]Phase 1: Research[/bold cyan]")
-        console.print("Handing off to the Researcher agent...\n")
-
-        result = await Runner.run(
-            researcher,
-            f"Research the following topic thoroughly: {topic}",
-            context=ctx,
-        )
-        console.print(f"[green]✓ Research complete[/green]")
-        console.print(f"  Topics researched: {list(ctx.research.keys())}")
-        console.print(f"  Handled by: {result.last_agent.name}")
+    if "research" not in completed and refresh_research and (store := get_research_store()) is not None:
+        store.delete(topic)  # Forget the finished sets; other processes' runs in progress stay
+    if "research" not in completed and not refresh_research and load_stored_research(ctx, console):
+        ctx.phase_seconds["research"] = 0.0
+        completed.append("research")
+        save_checkpoint(checkpoint_dir, key, ctx, completed)
+
+    if overlap and "research" not in completed:
+        with trace("Phase 1 + 2: Research ∥ Writing"):
+            console.print("\n[bold cyan]Phase 1 + 2: Research ∥ Writing[/bold cyan]")
+            console.print("Fanning out to one Researcher per subtopic; the Writer starts early...\n")
+
+            await run_overlapped_phases(ctx, console, stream, sections=sections)
+            stats = ctx.overlap_stats
+            console.print(f"[green]✓ Research and draft v{ctx.draft_version} complete[/green]")
+            console.print(f"  Topics researched: {list(ctx.research.keys())}")
+            console.print(
+                f"  Writer started at {stats['writer_start_seconds']:.1f}s with "
+                f"{stats['subtopics_at_writer_start']} subtopic(s); {stats['late_subtopics']} arrived later"
+            )
+            console.print(
+                f"  Overlap: {stats['overlap_seconds']:.1f}s ({stats['overlap_share']:.0%} of research) — "
+                f"{stats['overlapped_seconds']:.1f}s vs {stats['sequential_seconds']:.1f}s back to back"
+            )
+            _print_stream_stats(console, ctx, "writing")
+            _print_writer_stats(console, ctx)
+
+        completed += ["research", "writing"]
+        save_checkpoint(checkpoint_dir, key, ctx, completed)
+
+    if "research" not in completed:
+        with trace("Phase 1: Research"):
+            console.print("\n[bold cyan]Phase 1: Research[/bold cyan]")
+            console.print("Fanning out to one Researcher per subtopic...\n")
+
+            started = time.perf_counter()
+            await run_research_phase(ctx, console)
+            ctx.phase_seconds["research"] = time.perf_counter() - started
+            console.print(f"[green]✓ Research complete[/green]")
+            console.print(f"  Topics researched: {list(ctx.research.keys())}")
+
+        completed.append("research")
+        save_checkpoint(checkpoint_dir, key, ctx, completed)
 
     # ── Phase 2: Writing ─────────────────────────────────────────────
-    with trace("Phase 2: Writing"):
-        console.print("\n[bold cyan]Phase 2: Writing[/bold cyan]")
-        console.print("Handing off to the Writer agent...\n")
-
-        result = await Runner.run(
-            writer,
-            f"Write a compelling article about: {topic}. Use the research that has been gathered.",
-            context=ctx,
-        )
-        console.print(f"[green]✓ Draft v{ctx.draft_version} complete[/green]")
-        console.print(f"  Draft length: {len(ctx.draft)} characters")
+    if "writing" not in completed:
+        with trace("Phase 2: Writing"):
+            console.print("\n[bold cyan]Phase 2: Writing[/bold cyan]")
+            console.print("Handing off to the Writer agent...\n")
+
+            started = time.perf_counter()
+            prompt = f"Write a compelling article about: {topic}. Use the research that has been gathered."
+            await run_writer(ctx, console, prompt, stream, sections)
+            ctx.phase_seconds["writing"] = time.perf_counter() - started
+            console.print(f"[green]✓ Draft v{ctx.draft_version} complete[/green]")
+            console.print(f"  Draft length: {len(ctx.draft)} characters")
+            _print_stream_stats(console, ctx, "writing")
+            _print_writer_stats(console, ctx)
+
+        completed.append("writing")
+        save_checkpoint(checkpoint_dir, key, ctx, completed)
 
     # ── Phase 3: Review ──────────────────────────────────────────────
-    with trace("Phase 3: Review"):
-        console.print("\n[bold cyan]Phase 3: Review[/bold cyan]")
-        console.print("Handing off to the Reviewer agent...\n")
-
-        result = await Runner.run(
-            reviewer,
-            f"Review the current draft about: {topic}",
-            context=ctx,
-        )
-        review = result.final_output  # This is a ContentReview Pydantic model
+    if "review" not in completed:
+        with trace("Phase 3: Review"):
+            console.print("\n[bold cyan]Phase 3: Review[/bold cyan]")
+            console.print("Handing off to the Reviewer agent...\n")
+
+            started = time.perf_counter()
+            prompt = f"Review the current draft about: {topic}"
+            if stream:
+                result, ctx.stream_stats["review"] = await run_streamed(reviewer, prompt, ctx)
+            else:
+                result = await Runner.run(reviewer, prompt, context=ctx)
+            review = result.final_output  # This is a ContentReview Pydantic model
+            ctx.phase_seconds["review"] = time.perf_counter() - started
+
+            console.print(f"[green]✓ Review complete[/green]")
+            _print_stream_stats(console, ctx, "review")
+
+        completed.append("review")
+        save_checkpoint(checkpoint_dir, key, ctx, completed, review=review)
 
-        console.print(f"[green]✓ Review complete[/green]")
+    # ── Phase 4: Revision ────────────────────────────────────────────
+    if "revision" not in completed:
+        with trace("Phase 4: Revision"):
+            console.print("\n[bold cyan]Phase 4: Revision[/bold cyan]")
+            console.print(f"Initial score {review.overall_score}/10 ({review.verdict})\n")
+
+            started = time.perf_counter()
+            review, reason = await run_revision_loop(ctx, review, budget, console, stream)
+            ctx.phase_seconds["revision"] = time.perf_counter() - started
+            console.print(f"[green]✓ Revision complete[/green] — stopped: {reason}")
+            print_revisions(console, ctx.revisions)
+
+        completed.append("revision")
+        save_checkpoint(checkpoint_dir, key, ctx, completed, review=review)
 
     # ── Display results ──────────────────────────────────────────────
     console.print("\n" + "=" * 70)
@@ -118,10 +486,41 @@ async def run_pipeline(topic: str):
 
 # ── Entry point ──────────────────────────────────────────────────────
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the content pipeline for one topic.")
+    parser.add_argument("topic", nargs="*", help="Topic to write about (default: quantum computing)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream the draft as it is written and report time-to-first-token")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip phases that a previous run for this topic already checkpointed")
+    parser.add_argument("--max-revisions", type=int, default=None,
+                        help="Revise → re-review rounds after the first review (0 = none; "
+                             "default: REVISION_MAX_ITERATIONS)")
+    parser.add_argument("--overlap", action="store_true",
+                        help="Start writing while research is still arriving")
+    parser.add_argument("--sections", action="store_true",
+                        help="Outline the article, then write its sections in parallel")
+    parser.add_argument("--refresh-research", action="store_true",
+                        help="Research the topic again even if fresh stored research exists")
+    args = parser.parse_args()
+
     # Get topic from command line or use default
-    if len(sys.argv) > 1:
-        topic = " ".join(sys.argv[1:])
-    else:
-        topic = "quantum computing"
+    topic = " ".join(args.topic) or "quantum computing"
+
+    try:
+        validate_config()
+    except ConfigError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    async def main():
+        await warm_up()
+        budget = RevisionBudget.from_settings()
+        if args.max_revisions is not None:
+            budget.max_iterations = args.max_revisions
+        await run_pipeline(
+            topic, stream=args.stream, resume=args.resume,
+            refresh_research=args.refresh_research, budget=budget,
+            overlap=args.overlap, sections=args.sections,
+        )
 
-    asyncio.run(run_pipeline(topic))
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+"""
+Outline-then-fill writing: article sections decoded in parallel.
+
+The Writer generates the whole article in one sequential stream of output
+tokens, and decoding is the slowest part of Phase 2 — a longer article
+means proportionally more waiting. Instead:
+
+  1. outline — the Outline Planner returns the title and the sections, each
+     with its points, a research query and a word target
+  2. fill    — one Section Writer call per section, all at once; each gets
+     the outline (so it knows what the others cover) and only the research
+     passages its query selects
+  3. stitch  — the sections are joined under their ## headings and lightly
+     harmonized locally: a repeated heading is removed, extra headings are
+     demoted to ###, and paragraphs that mostly repeat an earlier section's
+     are dropped
+
+Writing time becomes roughly outline + the slowest section, instead of the
+sum of all sections, so it stays flat as articles grow.
+"""
+
+import asyncio
+import re
+import time
+
+from agents import Runner
+from rich.console import Console
+
+from project.agents.writer import ArticleOutline, outline_planner, section_writer
+from project.tools.compaction import fingerprint, is_near_duplicate
+from project.tools.retrieval import select_research
+
+# Research passages given to each section writer
+SECTION_RESEARCH_TOKENS = 600
+
+# Shorter paragraphs are never treated as duplicates
+MIN_DUPLICATE_WORDS = 8
+
+_HEADING = re.compile(r"^\s*#{1,6}\s+(.*?)\s*#*\s*$")
+
+
+def section_prompt(outline: ArticleOutline, index: int, passages: dict[str, list[str]]) -> str:
+    """The Section Writer's input for section `index` of the outline."""
+    section = outline.sections[index]
+    plan = "\n".join(
+        f"{i + 1}. {s.heading}" + (" ← your section" if i == index else "")
+        for i, s in enumerate(outline.sections)
+    )
+    research = "\n\n".join(f"### {name}\n" + "\n".join(chunks) for name, chunks in passages.items())
+    return (
+        f"Article title: {outline.title}\n\nOutline:\n{plan}\n\n"
+        f"Your section: {section.heading} (about {section.words} words)\n"
+        "Points to make:\n" + "\n".join(f"- {p}" for p in section.points) +
+        f"\n\nResearch passages:\n{research or '(none matched — stay general)'}"
+    )
+
+
+def clean_section(heading: str, text: str) -> str:
+    """Drop a repeated heading at the top, and demote other headings to ###."""
+    lines = text.strip().splitlines()
+    match = _HEADING.match(lines[0]) if lines else None
+    if match and match.group(1).strip().lower() == heading.strip().lower():
+        lines = lines[1:]
+    cleaned = []
+    for line in lines:
+        match = _HEADING.match(line)
+        cleaned.append(f"\n### {match.group(1)}\n" if match else line)
+    return "\n".join(cleaned).strip()
+
+
+def stitch(outline: ArticleOutline, bodies: list[str]) -> tuple[str, int]:
+    """Join section bodies into one article.
+
+    Returns:
+        (markdown article, number of duplicate paragraphs dropped)
+    """
+    parts = [f"# {outline.title}"]
+    seen: list[frozenset] = []
+    dropped = 0
+    for section, body in zip(outline.sections, bodies):
+        paragraphs = []
+        for paragraph in re.split(r"\n\s*\n", clean_section(section.heading, body)):
+            words = fingerprint(paragraph)
+            if len(words) >= MIN_DUPLICATE_WORDS:
+                if is_near_duplicate(words, seen):
+                    dropped += 1
+                    continue
+                seen.append(words)
+            paragraphs.append(paragraph.strip())
+        parts.append(f"## {section.heading}\n\n" + "\n\n".join(p for p in paragraphs if p))
+    return "\n\n".join(parts) + "\n", dropped
+
+
+async def write_sectioned(ctx, console: Console | None = None, prompt: str = "") -> dict:
+    """Outline the article, write its sections in parallel, and save the draft.
+
+    If research is still arriving (ctx.research_feed), the outline is made from
+    what is there, and the sections are filled once all of it is in.
+
+    Args:
+        ctx: The PipelineContext (research in, draft out).
+        console: Where to print progress.
+        prompt: Input for the outline planner (default: plan an article about
+            ctx.topic).
+
+    Returns:
+        Timing stats: outline_seconds, fill_seconds, section_seconds (per
+        section), sequential_seconds (their sum) and duplicates_dropped.
+    """
+    console = console or Console()
+    started = time.perf_counter()
+    result = await Runner.run(
+        outline_planner,
+        prompt or f"Plan an article about: {ctx.topic}",
+        context=ctx,
+    )
+    outline: ArticleOutline = result.final_output
+    outline_seconds = time.perf_counter() - started
+    console.print(f"  Outline: {[s.heading for s in outline.sections]}")
+
+    if ctx.research_feed is not None:
+        await ctx.research_feed.wait_for_share(1.0)
+
+    async def write_one(index: int) -> tuple[str, float]:
+        section = outline.sections[index]
+        passages, _ = select_research(
+            ctx.research, section.research_query or section.heading, max_tokens=SECTION_RESEARCH_TOKENS,
+        )
+        section_started = time.perf_counter()
+        result = await Runner.run(section_writer, section_prompt(outline, index, passages), context=ctx)
+        return result.final_output, time.perf_counter() - section_started
+
+    fill_started = time.perf_counter()
+    written = await asyncio.gather(*(write_one(i) for i in range(len(outline.sections))))
+    fill_seconds = time.perf_counter() - fill_started
+
+    draft, dropped = stitch(outline, [text for text, _ in written])
+    ctx.draft_version = ctx.drafts.commit(draft)
+    ctx.draft = draft
+
+    section_seconds = [seconds for _, seconds in written]
+    return {
+        "sections": len(outline.sections),
+        "outline_seconds": outline_seconds,
+        "fill_seconds": fill_seconds,
+        "section_seconds": section_seconds,
+        "sequential_seconds": sum(section_seconds),
+        "duplicates_dropped": dropped,
+    }
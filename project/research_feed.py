@@ -0,0 +1,83 @@
+"""
+Streaming handoff from the research phase to the writer.
+
+Normally Phase 2 waits for every subtopic researcher to finish, so the
+slowest subtopic sets the start of writing. With overlap on, each
+save_research call publishes its subtopic to a ResearchFeed (an asyncio
+queue); a drain task merges arrivals into ctx.research as they come in, and
+the Writer starts once a share of the planned subtopics is there. Later
+subtopics keep arriving while it writes — wait_for_research lets it pick
+them up before it saves the draft.
+"""
+
+import asyncio
+import math
+import time
+
+
+class ResearchFeed:
+    """Research findings published by subtopic runs, in arrival order.
+
+    Create it on the event loop that drains it.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        self.expected: int | None = None  # Planned subtopics, once known
+        self.arrived: list[tuple[str, float]] = []  # (subtopic, seconds since start)
+        self.done = False
+        self.delivered = 0  # Arrivals already reported by wait_for_research
+        self._changed = asyncio.Condition()
+        self._loop = asyncio.get_running_loop()
+
+    def publish(self, subtopic: str, findings: str) -> None:
+        """Queue findings for drain_into. Safe to call from a worker thread
+        (sync tools such as save_research run in one)."""
+        self._loop.call_soon_threadsafe(self.queue.put_nowait, (subtopic, findings))
+
+    async def expect(self, count: int) -> None:
+        """Record how many subtopics were planned."""
+        self.expected = count
+        await self._notify()
+
+    def close(self) -> None:
+        """No more research is coming (drain_into finishes once the queue is empty)."""
+        self.queue.put_nowait(None)
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def drain_into(self, research: dict) -> None:
+        """Merge published findings into `research` until the feed is closed."""
+        while (item := await self.queue.get()) is not None:
+            subtopic, findings = item
+            if subtopic not in research:
+                self.arrived.append((subtopic, time.perf_counter() - self.started))
+            research[subtopic] = findings  # Latest save wins, as in save_research
+            await self._notify()
+        self.done = True
+        await self._notify()
+
+    async def wait_for_share(self, fraction: float) -> None:
+        """Wait until `fraction` of the planned subtopics (at least one) have arrived."""
+        def ready():
+            if self.done:
+                return True
+            if self.expected is None:
+                return False
+            return len(self.arrived) >= max(1, math.ceil(self.expected * fraction))
+
+        async with self._changed:
+            await self._changed.wait_for(ready)
+
+    async def wait_for_new(self, seen: int, timeout: float) -> None:
+        """Wait up to `timeout` seconds for arrivals beyond the first `seen`."""
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self.done or len(self.arrived) > seen), timeout,
+                )
+            except asyncio.TimeoutError:
+                pass
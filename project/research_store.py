@@ -0,0 +1,208 @@
+"""
+Durable research store shared across runs and processes.
+
+save_research used to write only into the in-memory PipelineContext, so the
+research for a topic was thrown away after every run, and parallel workers
+couldn't see each other's. Topics recur, so every save now also lands in a
+SQLite database (WAL mode: readers never block the writer, and several
+processes can write safely), with the source titles and timestamps.
+
+Each research phase is one run: begin() opens it once the subtopics are
+planned, save() records them, and complete() marks it done once every
+subtopic succeeded — replacing the topic's earlier sets. A run that fails or
+loses a subtopic is discarded. Only complete sets are ever read back,
+so a crashed run or one with failed subtopics is never mistaken for the
+whole picture.
+
+Before Phase 1, run_pipeline looks up a complete set for the topic that is
+younger than RESEARCH_MAX_AGE and, if there is one, skips searching altogether.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from config import setting
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_runs (
+    run_id        TEXT PRIMARY KEY,
+    topic_key     TEXT NOT NULL,
+    topic         TEXT NOT NULL,
+    started_at    REAL NOT NULL,
+    completed_at  REAL  -- NULL until every subtopic of the run succeeded
+);
+CREATE INDEX IF NOT EXISTS research_runs_topic ON research_runs (topic_key, completed_at);
+CREATE TABLE IF NOT EXISTS research_notes (
+    run_id      TEXT NOT NULL,
+    subtopic    TEXT NOT NULL,
+    findings    TEXT NOT NULL,
+    sources     TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (run_id, subtopic)
+);
+"""
+
+
+# An unfinished run this old was abandoned (its process crashed or was killed)
+STALE_RUN_SECONDS = 24 * 3600
+
+
+def normalize_topic(topic: str) -> str:
+    """Case- and whitespace-insensitive form of a topic, used as its key."""
+    return " ".join(topic.lower().split())
+
+
+@dataclass
+class ResearchEntry:
+    """One subtopic's saved research."""
+
+    topic: str
+    subtopic: str
+    findings: str
+    sources: list[str] = field(default_factory=list)
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at
+
+
+class ResearchStore:
+    """SQLite-backed research notes, grouped into one set per research run.
+
+    Args:
+        path: SQLite file (created if needed).
+        timeout: Seconds to wait for another process's write lock.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def begin(self, topic: str) -> str:
+        """Open a research run for a topic. Returns its run id."""
+        run_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO research_runs VALUES (?, ?, ?, ?, NULL)",
+                (run_id, normalize_topic(topic), topic, time.time()),
+            )
+        return run_id
+
+    def save(self, run_id: str, subtopic: str, findings: str, sources=()) -> None:
+        """Insert or replace one subtopic's research in a run (keeps its first created_at)."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO research_notes VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, subtopic) DO UPDATE SET
+                    findings = excluded.findings,
+                    sources = excluded.sources,
+                    updated_at = excluded.updated_at
+                """,
+                (run_id, subtopic, findings, json.dumps(list(sources), ensure_ascii=False), now, now),
+            )
+
+    def complete(self, run_id: str) -> None:
+        """Mark a run's research as complete; it replaces the topic's earlier sets.
+
+        Runs of the topic still in progress elsewhere are left alone, unless
+        they were started over STALE_RUN_SECONDS ago (their process is gone).
+        """
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("UPDATE research_runs SET completed_at = ? WHERE run_id = ?", (now, run_id))
+            stale = (
+                "SELECT run_id FROM research_runs WHERE run_id != ? "
+                "AND topic_key = (SELECT topic_key FROM research_runs WHERE run_id = ?) "
+                "AND (completed_at IS NOT NULL OR started_at < ?)"
+            )
+            params = (run_id, run_id, now - STALE_RUN_SECONDS)
+            self._db.execute(f"DELETE FROM research_notes WHERE run_id IN ({stale})", params)
+            self._db.execute(f"DELETE FROM research_runs WHERE run_id IN ({stale})", params)
+
+    def discard(self, run_id: str) -> None:
+        """Drop a run that failed or lost subtopics (it can never be complete)."""
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM research_notes WHERE run_id = ?", (run_id,))
+            self._db.execute("DELETE FROM research_runs WHERE run_id = ?", (run_id,))
+
+    def entries(self, topic: str, max_age: float | None = None) -> list[ResearchEntry]:
+        """The topic's latest complete research set, oldest subtopic first.
+
+        Args:
+            topic: The topic (matched case- and whitespace-insensitively).
+            max_age: Only a set completed within this many seconds (None = any age).
+        """
+        since = time.time() - max_age if max_age is not None else 0.0
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT r.topic, n.subtopic, n.findings, n.sources, n.created_at, n.updated_at
+                FROM research_notes n JOIN research_runs r USING (run_id)
+                WHERE r.run_id = (
+                    SELECT run_id FROM research_runs
+                    WHERE topic_key = ? AND completed_at >= ?
+                    ORDER BY completed_at DESC LIMIT 1
+                )
+                ORDER BY n.created_at
+                """,
+                (normalize_topic(topic), since),
+            ).fetchall()
+        return [
+            ResearchEntry(topic, subtopic, findings, json.loads(sources), created, updated)
+            for topic, subtopic, findings, sources, created, updated in rows
+        ]
+
+    def load(self, topic: str, max_age: float | None = None) -> dict[str, str]:
+        """Fresh research for a topic as {subtopic: findings} (empty if none)."""
+        return {e.subtopic: e.findings for e in self.entries(topic, max_age)}
+
+    def delete(self, topic: str) -> int:
+        """Forget a topic's complete research sets. Returns the number of subtopics removed.
+
+        Runs still in progress (possibly in another process) are left alone.
+        """
+        runs = "SELECT run_id FROM research_runs WHERE topic_key = ? AND completed_at IS NOT NULL"
+        key = normalize_topic(topic)
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            cursor = self._db.execute(f"DELETE FROM research_notes WHERE run_id IN ({runs})", (key,))
+            self._db.execute("DELETE FROM research_runs WHERE topic_key = ? AND completed_at IS NOT NULL", (key,))
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            topics, subtopics = self._db.execute(
+                "SELECT COUNT(DISTINCT r.topic_key), COUNT(*) FROM research_notes n "
+                "JOIN research_runs r USING (run_id) WHERE r.completed_at IS NOT NULL"
+            ).fetchone()
+        return {"topics": topics, "subtopics": subtopics}
+
+
+_store: ResearchStore | None = None
+
+
+def get_research_store() -> ResearchStore | None:
+    """The shared research store, or None if RESEARCH_STORE is off."""
+    global _store
+    if not setting("RESEARCH_STORE"):
+        return None
+    if _store is None:
+        _store = ResearchStore(setting("RESEARCH_STORE_PATH"))
+    return _store
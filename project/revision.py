@@ -0,0 +1,203 @@
+"""
+Reviewer-driven revision loop.
+
+The Reviewer's verdict used to be printed and nothing more: a draft marked
+needs_revision or major_rewrite meant rerunning the whole pipeline by hand,
+research included. After the first review, run_pipeline now runs
+
+    Writer (revise, given the review) → Reviewer (re-review the diff) → …
+
+in the same PipelineContext, so research is never repeated. The loop stops
+as soon as one of these holds:
+
+  • the verdict is "publish"
+  • the score improved by less than min_gain (quality has plateaued)
+  • another iteration would exceed max_iterations, max_tokens or
+    max_seconds (the next iteration is assumed to cost as much as the
+    average one so far, so budgets are not overshot by a whole round)
+
+If a revision scored worse than an earlier draft, the best draft is restored
+at the end. Latency, tokens and score change per iteration are recorded in
+ctx.revisions.
+"""
+
+import time
+from dataclasses import dataclass
+
+from agents import Runner
+from rich.console import Console
+from rich.table import Table
+
+from config import setting
+from project.agents.reviewer import reviewer
+from project.agents.writer import writer
+from project.streaming import run_streamed
+
+
+@dataclass
+class RevisionBudget:
+    """Limits for the revision loop (0 = no limit, except max_iterations)."""
+
+    max_iterations: int = 2
+    max_tokens: int = 0
+    max_seconds: float = 0.0
+    # Stop once a revision improves the score by less than this
+    min_gain: float = 0.5
+
+    @classmethod
+    def from_settings(cls) -> "RevisionBudget":
+        return cls(
+            max_iterations=setting("REVISION_MAX_ITERATIONS"),
+            max_tokens=setting("REVISION_MAX_TOKENS"),
+            max_seconds=setting("REVISION_MAX_SECONDS"),
+            min_gain=setting("REVISION_MIN_GAIN"),
+        )
+
+
+@dataclass
+class RevisionIteration:
+    """What one revise → re-review round cost and achieved."""
+
+    iteration: int
+    draft_version: int
+    score: float
+    score_delta: float
+    verdict: str
+    seconds: float
+    tokens: int
+
+
+def revision_prompt(topic: str, review, version: int) -> str:
+    """The Writer's instructions for revising draft v`version` after `review`."""
+    lines = [
+        f"Revise the article about: {topic}.",
+        f"The Reviewer scored draft v{version} {review.overall_score}/10 ({review.verdict}).",
+        f"Review summary: {review.summary}",
+        "Weaknesses:",
+        *(f"- {w}" for w in review.weaknesses),
+        "Suggestions to apply:",
+        *(f"- {s}" for s in review.suggestions),
+        "Read the draft with get_draft, fix these points (keep what works), pull more "
+        "research with get_all_research only if a suggestion needs it, and save the "
+        "complete revised article with save_draft.",
+    ]
+    return "\n".join(lines)
+
+
+def stop_reason(review, iterations: list[RevisionIteration], budget: RevisionBudget, started: float) -> str:
+    """Why the loop should stop before another iteration ('' = keep going)."""
+    if review.verdict == "publish":
+        return "verdict is publish"
+    if iterations and iterations[-1].score_delta < budget.min_gain:
+        return f"score gain below {budget.min_gain:g}"
+    if len(iterations) >= budget.max_iterations:
+        return f"reached {budget.max_iterations} iterations"
+    if iterations:
+        tokens = sum(i.tokens for i in iterations)
+        if budget.max_tokens and tokens + tokens / len(iterations) > budget.max_tokens:
+            return f"token budget ({budget.max_tokens})"
+        elapsed = time.perf_counter() - started
+        if budget.max_seconds and elapsed + elapsed / len(iterations) > budget.max_seconds:
+            return f"time budget ({budget.max_seconds:g}s)"
+    return ""
+
+
+async def _run(agent, prompt: str, ctx, stream: bool):
+    if stream:
+        result, _ = await run_streamed(agent, prompt, ctx)
+        return result
+    return await Runner.run(agent, prompt, context=ctx)
+
+
+async def run_revision_loop(
+    ctx,
+    review,
+    budget: RevisionBudget | None = None,
+    console: Console | None = None,
+    stream: bool = False,
+):
+    """Revise and re-review the draft until it's good enough or the budget is spent.
+
+    Args:
+        ctx: The PipelineContext (draft, research, draft history).
+        review: The ContentReview of the current draft.
+        budget: Stop conditions (default: from REVISION_* settings).
+        console: Where to print progress.
+        stream: Run the agents with streaming.
+
+    Returns:
+        (review, reason) — the review of the draft that was kept, and why the
+        loop stopped. Per-iteration metrics are appended to ctx.revisions.
+    """
+    budget = budget or RevisionBudget.from_settings()
+    console = console or Console()
+    if not ctx.draft_version:
+        # The writer never called save_draft: keep its text as v1, or stop
+        if not ctx.draft:
+            return review, "no saved draft to revise"
+        ctx.draft_version = ctx.drafts.commit(ctx.draft)
+
+    started = time.perf_counter()
+    iterations: list[RevisionIteration] = []
+    best = (review.overall_score, ctx.draft_version, review)
+
+    while not (reason := stop_reason(review, iterations, budget, started)):
+        iteration_started = time.perf_counter()
+        reviewed_version = ctx.draft_version
+
+        result = await _run(writer, revision_prompt(ctx.topic, review, reviewed_version), ctx, stream)
+        tokens = result.context_wrapper.usage.total_tokens
+
+        prompt = (
+            f"Review the revised draft about: {ctx.topic}. You reviewed v{reviewed_version} "
+            f"(score {review.overall_score}/10); use get_draft_diff with since_version="
+            f"{reviewed_version} to see what changed. Your previous suggestions were:\n"
+            + "\n".join(f"- {s}" for s in review.suggestions)
+        )
+        result = await _run(reviewer, prompt, ctx, stream)
+        tokens += result.context_wrapper.usage.total_tokens
+        new_review = result.final_output
+
+        iteration = RevisionIteration(
+            iteration=len(iterations) + 1,
+            draft_version=ctx.draft_version,
+            score=new_review.overall_score,
+            score_delta=new_review.overall_score - review.overall_score,
+            verdict=new_review.verdict,
+            seconds=time.perf_counter() - iteration_started,
+            tokens=tokens,
+        )
+        iterations.append(iteration)
+        ctx.revisions.append(iteration)
+        console.print(
+            f"  Revision {iteration.iteration}: v{iteration.draft_version} scored "
+            f"{iteration.score:g} ({iteration.score_delta:+g}), {iteration.verdict} · "
+            f"{iteration.seconds:.1f}s, {iteration.tokens} tokens"
+        )
+
+        review = new_review
+        if review.overall_score > best[0]:
+            best = (review.overall_score, ctx.draft_version, review)
+
+    if best[1] != ctx.draft_version:
+        # A later revision scored worse: keep the best draft as the newest version
+        ctx.draft = ctx.drafts.get(best[1])
+        ctx.draft_version = ctx.drafts.commit(ctx.draft)
+        review = best[2]
+        console.print(f"  [yellow]Kept draft v{best[1]} (score {best[0]:g}) as v{ctx.draft_version}[/yellow]")
+    return review, reason
+
+
+def print_revisions(console: Console, iterations: list[RevisionIteration]) -> None:
+    """Table of per-iteration latency, tokens and score change."""
+    if not iterations:
+        return
+    table = Table(title="Revisions")
+    for column in ("#", "Draft", "Score", "Δ", "Verdict", "Seconds", "Tokens"):
+        table.add_column(column, justify="left" if column == "Verdict" else "right")
+    for i in iterations:
+        table.add_row(
+            str(i.iteration), f"v{i.draft_version}", f"{i.score:g}", f"{i.score_delta:+g}",
+            i.verdict, f"{i.seconds:.1f}", str(i.tokens),
+        )
+    console.print(table)
@@ -0,0 +1,167 @@
+"""
+Streaming helpers for the pipeline.
+
+Runs an agent with Runner.run_streamed() instead of Runner.run(), so tokens
+can be shown as soon as the model produces them. Along the way it measures:
+
+  • time-to-first-token (TTFT) — how long until the first visible token
+  • tokens/sec — output tokens divided by the time spent generating them
+
+The Writer doesn't answer in plain text: it passes the article to save_draft
+as a tool argument. So besides normal text deltas we also follow the streamed
+JSON arguments of save_draft and decode the partial "content" string.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from agents import Agent, Runner
+from rich.console import Console
+
+# Rewrite the partial-draft file after this many new characters
+PARTIAL_FLUSH_CHARS = 200
+
+
+@dataclass
+class StreamStats:
+    """Latency numbers for one streamed phase."""
+
+    ttft: float | None  # Seconds until the first visible token (None if nothing was streamed)
+    seconds: float  # Total wall-clock seconds for the run
+    output_tokens: int
+    tokens_per_sec: float
+
+
+def partial_json_string(raw: str, key: str) -> str:
+    """Decode the (possibly unfinished) string value of `key` in partial JSON.
+
+    >>> partial_json_string('{"content": "## Hello\\\\nWor', "content")
+    '## Hello\\nWor'
+    """
+    marker = raw.find(f'"{key}"')
+    if marker == -1:
+        return ""
+    colon = raw.find(":", marker + len(key) + 2)
+    start = raw.find('"', colon + 1) if colon != -1 else -1
+    if start == -1:
+        return ""
+
+    # Find the closing quote, skipping escaped characters
+    i = start + 1
+    while i < len(raw):
+        if raw[i] == "\\":
+            i += 2
+            continue
+        if raw[i] == '"':
+            return json.loads(raw[start:i + 1])
+        i += 1
+
+    # Unfinished string: drop a trailing partial escape sequence (at most "\uXXX")
+    body = raw[start + 1:]
+    for cut in range(0, 6):
+        try:
+            return json.loads('"' + body[:len(body) - cut] + '"')
+        except json.JSONDecodeError:
+            continue
+    return ""
+
+
+def _write_partial(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+async def run_streamed(
+    agent: Agent,
+    prompt: str,
+    context,
+    console: Console | None = None,
+    echo: bool = False,
+    partial_path: str | None = None,
+):
+    """Run an agent with streaming and measure TTFT and tokens/sec.
+
+    Args:
+        agent: The agent to run.
+        prompt: The user input.
+        context: The shared run context.
+        console: Where to echo tokens (only used when echo=True).
+        echo: Print text and save_draft content as it arrives.
+        partial_path: If set, the growing save_draft content is written here.
+
+    Returns:
+        (result, stats) — the finished RunResultStreaming and its StreamStats.
+    """
+    started = time.perf_counter()
+    first_token_at = None
+    last_token_at = None
+    chunks = 0
+
+    # Output index of the save_draft call being streamed. Item IDs can't be
+    # used: on the chat-completions path every item has the same placeholder ID
+    draft_index = None
+    draft_args = ""  # Raw JSON arguments of the current save_draft call
+    shown = 0  # Characters of the draft already echoed
+    flushed = 0  # Characters of the draft already persisted
+
+    result = Runner.run_streamed(agent, prompt, context=context)
+    async for event in result.stream_events():
+        if event.type != "raw_response_event":
+            continue
+        data = event.data
+
+        text = ""
+        if data.type == "response.output_item.added":
+            item = data.item
+            if getattr(item, "type", "") == "function_call" and item.name == "save_draft":
+                draft_index = data.output_index
+                draft_args, shown, flushed = "", 0, 0
+            continue
+        elif data.type == "response.output_item.done":
+            if data.output_index == draft_index:
+                draft_index = None  # Indexes restart with the next model response
+            continue
+        elif data.type == "response.output_text.delta":
+            text = data.delta
+        elif data.type == "response.function_call_arguments.delta" and data.output_index == draft_index:
+            draft_args += data.delta
+            draft = partial_json_string(draft_args, "content")
+            text = draft[shown:]
+            shown = len(draft)
+            if partial_path and len(draft) - flushed >= PARTIAL_FLUSH_CHARS:
+                _write_partial(partial_path, draft)
+                flushed = len(draft)
+        else:
+            continue
+
+        if not text:
+            continue
+        now = time.perf_counter()
+        if first_token_at is None:
+            first_token_at = now
+        last_token_at = now
+        chunks += 1
+        if echo and console is not None:
+            console.print(text, end="", markup=False, highlight=False, soft_wrap=True)
+
+    if partial_path and draft_args:
+        _write_partial(partial_path, partial_json_string(draft_args, "content"))
+    if echo and console is not None and chunks:
+        console.print()
+
+    seconds = time.perf_counter() - started
+    # Prefer the real usage numbers; fall back to counting streamed chunks
+    output_tokens = result.context_wrapper.usage.output_tokens or chunks
+    generating = (last_token_at - first_token_at) if first_token_at is not None else 0.0
+    stats = StreamStats(
+        ttft=(first_token_at - started) if first_token_at is not None else None,
+        seconds=seconds,
+        output_tokens=output_tokens,
+        tokens_per_sec=output_tokens / generating if generating > 0 else 0.0,
+    )
+    return result, stats
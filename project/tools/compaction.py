@@ -0,0 +1,172 @@
+"""
+Token-budgeted compaction of search results.
+
+Whatever a search tool returns stays in the researcher's conversation and
+is re-sent with every later turn, so a few verbose results early on are paid
+for many times over. Before results are returned they are compacted locally:
+
+  1. Near-duplicates go — a snippet whose words are mostly (80%) those of
+     one already kept (also across the queries of one call) is dropped.
+  2. Sentences compete for the budget — each is scored by how many query
+     terms it contains, with a bonus for leading sentences and better-ranked
+     results. The best ones are kept, in their original order.
+  3. The budget is a hard cap — a result is dropped rather than overflow it;
+     if not even one sentence fits, the best one is truncated.
+
+Token counts are the usual local estimate (lab/tokens.py). Savings per call
+are logged (logger "project.tools.compaction") and totalled in
+compaction_stats().
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+
+from lab.tokens import CHARS_PER_TOKEN, estimate_tokens
+from project.tools.search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# A snippet is a duplicate if this fraction of its distinct words (or of the
+# other snippet's, whichever is shorter) also occur in a kept snippet
+DUPLICATE_THRESHOLD = 0.8
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences (good enough for search snippets).
+
+    >>> split_sentences("Solar is cheap. Wind too! Costs fell 90% since 2010.")
+    ['Solar is cheap.', 'Wind too!', 'Costs fell 90% since 2010.']
+    """
+    return [s.strip() for s in _SENTENCE_END.split(text.strip()) if s.strip()]
+
+
+def fingerprint(text: str) -> frozenset:
+    """The distinct words of a text, for near-duplicate detection."""
+    return frozenset(tokenize(text))
+
+
+def is_near_duplicate(candidate: frozenset, kept: list[frozenset]) -> bool:
+    for other in kept:
+        overlap = len(candidate & other) / (min(len(candidate), len(other)) or 1)
+        if overlap >= DUPLICATE_THRESHOLD:
+            return True
+    return False
+
+
+@dataclass
+class CompactionStats:
+    """Running totals over every compacted tool call."""
+
+    calls: int = 0
+    original_tokens: int = 0
+    returned_tokens: int = 0
+    duplicates_dropped: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.returned_tokens
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "original_tokens": self.original_tokens,
+            "returned_tokens": self.returned_tokens,
+            "saved_tokens": self.saved_tokens,
+            "duplicates_dropped": self.duplicates_dropped,
+        }
+
+
+_stats = CompactionStats()
+
+
+def compaction_stats() -> dict:
+    """Tokens saved by compaction so far in this process."""
+    return _stats.as_dict()
+
+
+def _document_tokens(document: dict) -> int:
+    return estimate_tokens(document.get("title", "")) + estimate_tokens(document.get("snippet", ""))
+
+
+def compact_results(
+    query: str,
+    documents: list[dict],
+    max_tokens: int,
+    seen: list[frozenset] | None = None,
+) -> list[tuple[int, dict]]:
+    """Fit ranked search results into a token budget.
+
+    Args:
+        query: The query the results answer; sentences mentioning its terms win.
+        documents: {"title", "snippet", ...} results, best first.
+        max_tokens: Budget for titles + snippets (0 = no limit, dedupe only).
+        seen: Fingerprints of snippets already returned in this call; the
+            returned results are added in place (results cut for budget are
+            not), so duplicates across queries are dropped too.
+
+    Returns:
+        (index into `documents`, copy with compacted snippet) for every kept
+        result, in rank order.
+    """
+    seen = [] if seen is None else seen
+    unique = []  # (index into documents, document)
+    prints = []  # Fingerprints of `unique`, added to `seen` only if returned
+    for index, document in enumerate(documents):
+        words = fingerprint(document.get("snippet", ""))
+        if is_near_duplicate(words, seen + prints):
+            _stats.duplicates_dropped += 1
+            continue
+        prints.append(words)
+        unique.append((index, document))
+
+    if not max_tokens:
+        seen.extend(prints)
+        return [(index, dict(document)) for index, document in unique]
+
+    # Score every sentence of every result against the query
+    terms = set(tokenize(query))
+    candidates = []  # (score, result rank, sentence position, sentence, tokens)
+    for rank, (_, document) in enumerate(unique):
+        for position, sentence in enumerate(split_sentences(document.get("snippet", ""))):
+            relevance = len(terms & set(tokenize(sentence)))
+            score = relevance + (0.5 if position == 0 else 0.0) + 0.5 / (1 + rank)
+            candidates.append((score, rank, position, sentence, estimate_tokens(sentence)))
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+
+    chosen: dict[int, list[tuple[int, str]]] = {}
+    remaining = max_tokens
+    for _, rank, position, sentence, tokens in candidates:
+        # A result's title is paid for with its first chosen sentence
+        cost = tokens + (0 if rank in chosen else estimate_tokens(unique[rank][1].get("title", "")))
+        if cost <= remaining:
+            chosen.setdefault(rank, []).append((position, sentence))
+            remaining -= cost
+
+    if not chosen and candidates:
+        # Not even one sentence fits: truncate the best one
+        _, rank, position, sentence, _ = candidates[0]
+        room = max(0, max_tokens - estimate_tokens(unique[rank][1].get("title", ""))) * CHARS_PER_TOKEN
+        chosen[rank] = [(position, sentence[:max(0, room - 1)].rstrip() + "…")]
+
+    compacted = []
+    for rank in sorted(chosen):
+        sentences = [s for _, s in sorted(chosen[rank])]
+        index, document = unique[rank]
+        compacted.append((index, {**document, "snippet": " ".join(sentences)}))
+        seen.append(prints[rank])
+    return compacted
+
+
+def record(tool: str, original: list[dict], returned: list[dict]) -> None:
+    """Count and log what one tool call saved."""
+    if not original:
+        return
+    before = sum(_document_tokens(d) for d in original)
+    after = sum(_document_tokens(d) for d in returned)
+    _stats.calls += 1
+    _stats.original_tokens += before
+    _stats.returned_tokens += after
+    logger.info("%s compacted %d → %d tokens (saved %d)", tool, before, after, before - after)
@@ -0,0 +1,250 @@
+"""
+On-disk search corpus: JSONL in, memory-mapped index out.
+
+Documents are ingested as JSONL (one {"title", "snippet", ...} object per
+line) and compiled into a directory of flat binary files:
+
+  meta.json      counts, BM25 parameters and a hash of the documents
+                 (written last: the index is complete once it exists)
+  docs.jsonl     the documents, one per line
+  offsets.bin    uint64 × (documents + 1) — byte offset of each line
+  norms.bin      float64 × documents — BM25 length factor of each document
+  lexicon.bin    uint64 triples (term hash, postings offset, document
+                 frequency), sorted by hash for binary search
+  postings.bin   uint32 — per term, its document ids then its term freqs
+
+MappedIndex serves searches straight from mmap'd files. Nothing is parsed
+at startup, only the pages a query touches are read, and documents are
+decoded only for the hits returned. The OS page cache is shared, so many
+worker processes serving the same index hold one copy of it between them.
+Files are native-endian: build the index on the architecture that serves it.
+
+Embeddings precomputed by project/tools/semantic.py live in the same
+directory; rebuilding the index deletes them, since they describe the old
+documents.
+
+Build an index from JSONL:
+    python -m project.tools.corpus build project/data/search_corpus.jsonl -o project/data/search_index
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+from array import array
+
+from project.tools.search_index import BM25Index, length_norms, term_counts
+
+INDEX_VERSION = 1
+
+# Written by SemanticIndex.save() for the documents of one build
+EMBEDDING_FILES = ("embedder.json", "embeddings.npy", "embedding_scales.npy", "embedding_idf.npy")
+
+
+def term_hash(term: str) -> int:
+    """64-bit hash a term is stored under in the lexicon."""
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def read_jsonl(path: str):
+    """Yield the documents of a JSONL file, skipping blank lines."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ── Building ────────────────────────────────────────────────────────
+def _write(path: str, data) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        if isinstance(data, array):
+            data.tofile(f)
+        else:
+            f.write(data)
+    os.replace(tmp, path)
+
+
+def build_index(
+    source: str,
+    directory: str,
+    k1: float = 1.2,
+    b: float = 0.75,
+    title_weight: int = 2,
+) -> dict:
+    """Compile a JSONL corpus into an on-disk index.
+
+    Documents are streamed from `source`, so only the postings (8 bytes per
+    term occurrence) are held in memory while building. Embeddings of an
+    earlier build in `directory` are deleted.
+
+    Args:
+        source: JSONL file of {"title", "snippet", ...} documents.
+        directory: Where to write the index (created if needed).
+        k1: BM25 term-frequency saturation.
+        b: BM25 length normalization.
+        title_weight: How many times a title term counts compared to a
+            snippet term.
+
+    Returns:
+        The index metadata (also written to meta.json).
+    """
+    os.makedirs(directory, exist_ok=True)
+    meta_path = os.path.join(directory, "meta.json")
+    # A half-rebuilt index must not look complete, and old embeddings don't fit it
+    for name in ("meta.json", *EMBEDDING_FILES):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    postings: dict[str, tuple[array, array]] = {}
+    offsets = array("Q", [0])
+    lengths = array("I")
+    digest = hashlib.sha256()
+
+    docs_path = os.path.join(directory, "docs.jsonl")
+    with open(docs_path + ".tmp", "wb") as docs:
+        for doc_id, document in enumerate(read_jsonl(source)):
+            counts = term_counts(document, title_weight)
+            for term, tf in counts.items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array("I"), array("I"))
+                entry[0].append(doc_id)
+                entry[1].append(tf)
+            lengths.append(sum(counts.values()))
+            line = json.dumps(document, ensure_ascii=False).encode("utf-8") + b"\n"
+            docs.write(line)
+            digest.update(line)
+            offsets.append(offsets[-1] + len(line))
+    os.replace(docs_path + ".tmp", docs_path)
+
+    lexicon = array("Q")
+    position = 0
+    with open(os.path.join(directory, "postings.bin.tmp"), "wb") as f:
+        for key, term in sorted((term_hash(t), t) for t in postings):
+            ids, tfs = postings.pop(term)
+            ids.tofile(f)
+            tfs.tofile(f)
+            lexicon.extend((key, position, len(ids)))
+            position += 2 * len(ids)
+    os.replace(os.path.join(directory, "postings.bin.tmp"), os.path.join(directory, "postings.bin"))
+
+    _write(os.path.join(directory, "offsets.bin"), offsets)
+    _write(os.path.join(directory, "norms.bin"), length_norms(lengths, k1, b))
+    _write(os.path.join(directory, "lexicon.bin"), lexicon)
+
+    meta = {
+        "version": INDEX_VERSION,
+        "documents": len(lengths),
+        "terms": len(lexicon) // 3,
+        "k1": k1,
+        "b": b,
+        "title_weight": title_weight,
+        # Identifies these exact documents (embeddings record which they were built for)
+        "corpus": digest.hexdigest()[:16],
+    }
+    _write(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+    return meta
+
+
+# ── Serving ─────────────────────────────────────────────────────────
+def _map(path: str, fmt: str) -> tuple[mmap.mmap | None, memoryview]:
+    """Memory-map a file read-only and view it as an array of `fmt` items."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, memoryview(b"").cast(fmt)  # mmap can't map empty files
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return mapped, memoryview(mapped).cast(fmt)
+
+
+class MappedIndex(BM25Index):
+    """A BM25 index served from memory-mapped files written by build_index().
+
+    Args:
+        directory: The index directory.
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"{directory} has index version {self.meta.get('version')}, "
+                f"expected {INDEX_VERSION}; rebuild it"
+            )
+        self.directory = directory
+        self.k1 = self.meta["k1"]
+
+        self._maps = []
+        self._docs = self._open("docs.jsonl", "B")
+        self._offsets = self._open("offsets.bin", "Q")
+        self._norms = self._open("norms.bin", "d")
+        self._lexicon = self._open("lexicon.bin", "Q")
+        self._postings = self._open("postings.bin", "I")
+
+    def _open(self, name: str, fmt: str) -> memoryview:
+        mapped, view = _map(os.path.join(self.directory, name), fmt)
+        self._maps.append((mapped, view))
+        return view
+
+    def __len__(self) -> int:
+        return self.meta["documents"]
+
+    def postings(self, term: str):
+        key = term_hash(term)
+        lexicon = self._lexicon
+        lo, hi = 0, len(lexicon) // 3
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found = lexicon[3 * mid]
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                start, df = lexicon[3 * mid + 1], lexicon[3 * mid + 2]
+                return self._postings[start:start + df], self._postings[start + df:start + 2 * df]
+        return None
+
+    def length_norms(self) -> memoryview:
+        return self._norms
+
+    def document(self, doc_id: int) -> dict:
+        start, end = self._offsets[doc_id], self._offsets[doc_id + 1]
+        return json.loads(bytes(self._docs[start:end]))
+
+    def close(self) -> None:
+        for mapped, view in self._maps:
+            view.release()
+            if mapped is not None:
+                mapped.close()
+        self._maps = []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query an on-disk search index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Compile a JSONL corpus into an index")
+    build.add_argument("source", help="JSONL file, one {title, snippet, ...} per line")
+    build.add_argument("-o", "--output", required=True, help="Index directory")
+    build.add_argument("--k1", type=float, default=1.2)
+    build.add_argument("--b", type=float, default=0.75)
+    build.add_argument("--title-weight", type=int, default=2)
+
+    search = commands.add_parser("search", help="Query an index")
+    search.add_argument("directory")
+    search.add_argument("query", nargs="+")
+    search.add_argument("-k", type=int, default=5)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        meta = build_index(args.source, args.output, args.k1, args.b, args.title_weight)
+        print(f"Indexed {meta['documents']:,} documents, {meta['terms']:,} terms → {args.output}")
+    else:
+        index = MappedIndex(args.directory)
+        for hit in index.search(" ".join(args.query), args.k):
+            print(f"{hit.score:7.3f}  {hit.document.get('title', '')}")
+        index.close()
@@ -2,38 +2,137 @@
 File tools for reading and writing content.
 
 These tools let agents save their work (research notes, drafts, final articles)
-to the shared context and optionally to disk.
+to the shared context and optionally to disk. Research notes saved during a
+research run are also written to the research store (project/research_store.py),
+so later runs and other processes can reuse them.
 """
 
 from agents import function_tool, RunContextWrapper
 
+from config import setting
+from lab.tokens import estimate_tokens
+from project.research_store import get_research_store
+from project.tools.retrieval import select_research
+
 
 @function_tool
-def save_research(ctx: RunContextWrapper, topic: str, findings: str) -> str:
+def save_research(
+    ctx: RunContextWrapper,
+    topic: str,
+    findings: str,
+    sources: list[str] | None = None,
+) -> str:
     """Save research findings to shared context.
 
     Args:
         topic: The research topic or subtopic.
         findings: The research findings/notes to save.
+        sources: Titles of the search results the findings are based on.
     """
     if not hasattr(ctx.context, "research"):
         ctx.context.research = {}
     ctx.context.research[topic] = findings
+
+    feed = getattr(ctx.context, "research_feed", None)
+    if feed is not None:
+        feed.publish(topic, findings)  # Hand it to a writer that is already running
+
+    store = get_research_store()
+    run_id = getattr(ctx.context, "research_run", "")
+    if store is not None and run_id:
+        store.save(run_id, topic, findings, sources or [])
     return f"Research saved for topic: {topic} ({len(findings)} chars)"
 
 
+def _research(ctx: RunContextWrapper) -> dict:
+    """Research in the context, else a fresh complete set from the store for its topic.
+
+    Returns a copy: sync tools run in a worker thread, while a ResearchFeed
+    may still be adding subtopics to ctx.research on the event loop.
+    """
+    research = getattr(ctx.context, "research", None)
+    if research:
+        return dict(research)
+    store = get_research_store()
+    topic = getattr(ctx.context, "topic", "")
+    if store is None or not topic:
+        return {}
+    return store.load(topic, max_age=setting("RESEARCH_MAX_AGE"))
+
+
+@function_tool
+def list_research(ctx: RunContextWrapper) -> str:
+    """List the saved research subtopics and their sizes (cheap — no content)."""
+    research = _research(ctx)
+    if not research:
+        return "No research has been saved yet."
+
+    lines = [f"{len(research)} subtopics researched:"]
+    for topic, findings in research.items():
+        lines.append(f"- {topic} ({len(findings)} chars, ~{estimate_tokens(findings)} tokens)")
+    return "\n".join(lines)
+
+
 @function_tool
-def get_all_research(ctx: RunContextWrapper) -> str:
-    """Retrieve all saved research findings from context."""
-    if not hasattr(ctx.context, "research") or not ctx.context.research:
+def get_all_research(
+    ctx: RunContextWrapper,
+    query: str = "",
+    subtopic: str = "",
+    max_tokens: int = 0,
+) -> str:
+    """Retrieve saved research findings from context.
+
+    With no arguments, returns everything. Pass a query to get only the most
+    relevant passages, best first within the token budget.
+
+    Args:
+        query: What you need the research for, e.g. a section heading
+            (empty = everything, in original order).
+        subtopic: Only search subtopics whose name contains this (empty = all).
+        max_tokens: Token budget for the returned passages (0 = no limit).
+    """
+    research = _research(ctx)
+    if not research:
         return "No research has been saved yet."
 
+    grouped, left_out = select_research(research, query, subtopic, max_tokens)
+    if not grouped:
+        what = f" for '{query}'" if query else ""
+        where = f" in subtopics matching '{subtopic}'" if subtopic else ""
+        return f"No research found{what}{where}. Subtopics: {', '.join(research)}"
+
     sections = []
-    for topic, findings in ctx.context.research.items():
-        sections.append(f"## {topic}\n{findings}")
+    for topic, chunks in grouped.items():
+        sections.append(f"## {topic}\n" + "\n".join(chunks))
+    if left_out:
+        sections.append(f"[{left_out} less relevant passages omitted]")
     return "\n\n".join(sections)
 
 
+@function_tool
+async def wait_for_research(ctx: RunContextWrapper, max_seconds: float = 60) -> str:
+    """Wait for research that is still arriving, and list the new subtopics.
+
+    Call this before saving the draft if you were told research is still
+    coming in; then read the new subtopics with get_all_research.
+
+    Args:
+        max_seconds: Longest to wait for a new subtopic.
+    """
+    feed = getattr(ctx.context, "research_feed", None)
+    research = getattr(ctx.context, "research", None) or {}
+    if feed is None:
+        return f"All research is in: {len(research)} subtopics."
+
+    await feed.wait_for_new(feed.delivered, max_seconds)
+    new = [subtopic for subtopic, _ in feed.arrived[feed.delivered:]]
+    feed.delivered = len(feed.arrived)
+    status = "All research is in" if feed.done else "More research is still arriving"
+    if not new:
+        return f"{status}. No new subtopics since you last checked."
+    return f"{status}. New subtopics: {', '.join(new)}"
+
+
 @function_tool
 def save_draft(ctx: RunContextWrapper, content: str) -> str:
     """Save a draft article to shared context.
@@ -41,8 +140,12 @@ def save_draft(ctx: RunContextWrapper, content: str) -> str:
     Args:
         content: The full draft content.
     """
+    history = getattr(ctx.context, "drafts", None)
+    if history is not None:
+        ctx.context.draft_version = history.commit(content)
+    else:
+        ctx.context.draft_version = getattr(ctx.context, "draft_version", 0) + 1
     ctx.context.draft = content
-    ctx.context.draft_version = getattr(ctx.context, "draft_version", 0) + 1
     return f"Draft v{ctx.context.draft_version} saved ({len(content)} chars)"
 
 
@@ -54,3 +157,31 @@ def get_draft(ctx: RunContextWrapper) -> str:
         return "No draft has been written yet."
     version = getattr(ctx.context, "draft_version", "?")
     return f"[Draft v{version}]\n\n{draft}"
+
+
+@function_tool
+def get_draft_diff(ctx: RunContextWrapper, since_version: int) -> str:
+    """Show only what changed in the draft since an earlier version.
+
+    Much cheaper than get_draft when you have already read that version.
+
+    Args:
+        since_version: The draft version you last read.
+    """
+    draft = getattr(ctx.context, "draft", None)
+    if not draft:
+        return "No draft has been written yet."
+    history = getattr(ctx.context, "drafts", None)
+    version = getattr(ctx.context, "draft_version", 0)
+    if since_version >= version:
+        return f"The draft is still v{version} — nothing changed since v{since_version}."
+    if history is None or not 1 <= since_version < history.version:
+        return f"[Draft v{version} — v{since_version} is not available, full text follows]\n\n{draft}"
+
+    diff = history.diff(since_version)
+    if len(diff) >= len(draft):
+        # Mostly rewritten: the full text is shorter than the diff
+        return f"[Draft v{version} — rewritten since v{since_version}, full text follows]\n\n{draft}"
+    added = sum(1 for line in diff.splitlines() if line.startswith("+") and not line.startswith("+++"))
+    removed = sum(1 for line in diff.splitlines() if line.startswith("-") and not line.startswith("---"))
+    return f"[Draft v{since_version} → v{version}: +{added} / -{removed} lines]\n\n{diff}"
@@ -0,0 +1,95 @@
+"""
+Selective retrieval over saved research notes.
+
+Returning every research note on every call doesn't scale: with dozens of
+subtopics the dump alone outgrows a sensible prompt, and it is re-sent on
+every later writer turn. Instead the notes are:
+
+  • chunked — split on paragraphs / bullet points into pieces of about
+    CHUNK_TOKENS tokens
+  • ranked  — with the same BM25 index the search tools use, the subtopic
+    name counting as the chunk's title
+  • packed  — the best chunks are returned, grouped by subtopic and in their
+    original order, until the token budget is spent
+"""
+
+import re
+
+from lab.tokens import estimate_tokens
+from project.tools.search_index import SearchIndex
+
+# Target size of a research chunk
+CHUNK_TOKENS = 120
+
+_BLOCK = re.compile(r"\n\s*\n|\n(?=\s*(?:[-*•]|\d+[.)])\s)")
+
+
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """Split notes into chunks of whole paragraphs/bullets, about `max_tokens` each.
+
+    >>> chunk_text("Intro.\\n\\n- one\\n- two", max_tokens=1)
+    ['Intro.', '- one', '- two']
+    """
+    chunks, current = [], ""
+    for block in (b.strip() for b in _BLOCK.split(text)):
+        if not block:
+            continue
+        if current and estimate_tokens(current) + estimate_tokens(block) > max_tokens:
+            chunks.append(current)
+            current = block
+        else:
+            current = f"{current}\n{block}" if current else block
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def matching_subtopics(research: dict[str, str], subtopic: str) -> list[str]:
+    """Subtopic names containing `subtopic` (case-insensitive); all if it's empty."""
+    needle = subtopic.strip().lower()
+    return [name for name in research if needle in name.lower()]
+
+
+def select_research(
+    research: dict[str, str],
+    query: str = "",
+    subtopic: str = "",
+    max_tokens: int = 0,
+) -> tuple[dict[str, list[str]], int]:
+    """Pick the research chunks to return.
+
+    Args:
+        research: Subtopic name → notes.
+        query: Rank chunks by relevance to this (empty = keep original order).
+        subtopic: Only consider subtopics whose name contains this.
+        max_tokens: Budget for the chunks returned (0 = no limit).
+
+    Returns:
+        (subtopic → chosen chunks in original order, number of chunks left out)
+    """
+    chunks = [
+        (name, position, chunk)
+        for name in matching_subtopics(research, subtopic)
+        for position, chunk in enumerate(chunk_text(research[name]))
+    ]
+
+    if query.strip():
+        index = SearchIndex()
+        index.extend({"title": name, "snippet": chunk} for name, _, chunk in chunks)
+        ranked = [chunks[hit.doc_id] for hit in index.search(query, k=len(chunks))]
+    else:
+        ranked = chunks
+
+    chosen, remaining = [], max_tokens
+    for item in ranked:
+        tokens = estimate_tokens(item[2])
+        if max_tokens and tokens > remaining:
+            continue
+        chosen.append(item)
+        remaining -= tokens
+
+    order = {name: i for i, name in enumerate(research)}
+    grouped: dict[str, list[str]] = {}
+    for name, _, chunk in sorted(chosen, key=lambda c: (order[c[0]], c[1])):
+        grouped.setdefault(name, []).append(chunk)
+    return grouped, len(chunks) - len(chosen)
@@ -0,0 +1,247 @@
+"""
+Search backends behind the web_search tools.
+
+A SearchBackend answers a batch of queries with ranked SearchHits, without
+blocking the event loop:
+
+  • LocalBackend — the simulated corpus (project/data), ranked in memory or
+    from a memory-mapped index. Searches run in a worker thread.
+  • HttpBackend  — any HTTP search API (Tavily, Brave, SerpAPI behind a thin
+    adapter, or the stand-in server in project/tools/search_server.py).
+    Queries go through a pooled httpx.AsyncClient built from config.py's
+    HTTP settings (one per event loop), run concurrently up to a limit, time
+    out per request and are retried with jittered exponential backoff on
+    timeouts, connection errors, 429s and 5xx.
+
+HttpBackend expects GET {url}/search?q=<query>&k=<k> to return
+{"results": [{"id": ..., "title": ..., "snippet": ..., "score": ...}, ...]}.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+
+from project.tools.corpus import MappedIndex, read_jsonl
+from project.tools.search_index import BM25Index, SearchHit, SearchIndex
+
+MODES = ("keyword", "semantic", "hybrid")
+
+logger = logging.getLogger(__name__)
+
+
+class SearchBackend(ABC):
+    """Interface: ranked search for a batch of queries."""
+
+    name = "search"
+
+    @abstractmethod
+    async def search_many(self, queries: list[str], k: int) -> list[list[SearchHit]]:
+        """Top `k` hits for each query, best first."""
+
+    async def search(self, query: str, k: int) -> list[SearchHit]:
+        return (await self.search_many([query], k))[0]
+
+    async def aclose(self) -> None:
+        pass
+
+
+# ── Local corpus ────────────────────────────────────────────────────
+class LocalBackend(SearchBackend):
+    """The local JSONL corpus, or a prebuilt index of it, ranked in process.
+
+    Args:
+        corpus: JSONL documents, indexed in memory if there is no prebuilt index.
+        index_dir: Directory of a prebuilt index (python -m project.tools.corpus build).
+        mode: "keyword" (BM25), "semantic" (embeddings) or "hybrid" (both, fused).
+    """
+
+    name = "local"
+
+    def __init__(self, corpus: str, index_dir: str, mode: str = "keyword"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown search mode {mode!r}; expected one of {MODES}")
+        self.corpus = corpus
+        self.index_dir = index_dir
+        self.mode = mode
+        self._index: BM25Index | None = None
+        self._semantic = None
+        self._lock = threading.RLock()  # Searches run in worker threads
+
+    def index(self) -> BM25Index:
+        """The keyword index (opened or built on first use)."""
+        with self._lock:
+            if self._index is None:
+                if os.path.exists(os.path.join(self.index_dir, "meta.json")):
+                    self._index = MappedIndex(self.index_dir)
+                else:
+                    index = SearchIndex()
+                    index.extend(read_jsonl(self.corpus))
+                    self._index = index
+            return self._index
+
+    def semantic_index(self):
+        """Embeddings of the corpus (loaded or computed on first use)."""
+        with self._lock:
+            if self._semantic is None:
+                from project.tools.semantic import SemanticIndex
+
+                index = self.index()
+                if isinstance(index, MappedIndex) and os.path.exists(os.path.join(self.index_dir, "embeddings.npy")):
+                    try:
+                        self._semantic = SemanticIndex.load(index, self.index_dir)
+                    except ValueError as e:
+                        logger.warning("%s — embedding the corpus in memory instead", e)
+                if self._semantic is None:
+                    self._semantic = SemanticIndex.build(index)
+            return self._semantic
+
+    def search_sync(self, query: str, k: int) -> list[SearchHit]:
+        if self.mode == "keyword":
+            return self.index().search(query, k)
+        if self.mode == "semantic":
+            return self.semantic_index().search(query, k)
+        from project.tools.semantic import hybrid_search
+
+        return hybrid_search(self.index(), self.semantic_index(), query, k)
+
+    def search_many_sync(self, queries: list[str], k: int) -> list[list[SearchHit]]:
+        """Semantic ranking answers all queries in one batch."""
+        if self.mode == "semantic":
+            return self.semantic_index().search_many(queries, k)
+        return [self.search_sync(query, k) for query in queries]
+
+    async def search_many(self, queries: list[str], k: int) -> list[list[SearchHit]]:
+        # A big corpus takes a while to rank; don't stall other pipelines meanwhile
+        return await asyncio.to_thread(self.search_many_sync, queries, k)
+
+
+# ── HTTP API ────────────────────────────────────────────────────────
+class HttpBackend(SearchBackend):
+    """An async client for an HTTP search API.
+
+    Args:
+        url: Base URL of the API (the backend calls {url}/search).
+        client: A pooled httpx.AsyncClient to use from one event loop (default:
+            one built from config's HTTP settings for each running loop).
+        api_key: Sent as a Bearer token, if set.
+        timeout: Seconds per request attempt.
+        retries: Extra attempts after a retryable failure.
+        backoff: Base delay in seconds; attempt n waits up to backoff * 2**n
+            (a Retry-After header is honored, up to `timeout`).
+        concurrency: Maximum requests in flight at once.
+    """
+
+    name = "http"
+
+    def __init__(
+        self,
+        url: str,
+        client=None,
+        api_key: str | None = None,
+        timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.25,
+        concurrency: int = 16,
+    ):
+        self.url = url.rstrip("/")
+        self._client = client
+        self.api_key = api_key
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.concurrency = concurrency
+        # Semaphores and clients are bound to an event loop, so the backend
+        # keeps one of each per running loop (batch mode, tests: several asyncio.run)
+        self._loops: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # loop → (semaphore, client)
+
+        # Metrics
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    def _loop_state(self) -> tuple:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            client = self._client
+            if client is None:
+                from config import make_http_client
+
+                client = make_http_client()
+            state = self._loops[loop] = (asyncio.Semaphore(self.concurrency), client)
+        return state
+
+    @property
+    def client(self):
+        """The httpx client for the running event loop."""
+        return self._loop_state()[1]
+
+    async def aclose(self) -> None:
+        """Close the client this backend built for the running loop."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None and state[1] is not self._client:
+            await state[1].aclose()
+
+    @staticmethod
+    def _retryable(error: BaseException) -> bool:
+        import httpx
+
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+    def _delay(self, attempt: int, error: BaseException) -> float:
+        import httpx
+
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("retry-after", "")
+            if retry_after.replace(".", "", 1).isdigit():
+                return min(float(retry_after), self.timeout)
+        # Full jitter: concurrent clients that failed together retry apart
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    async def _fetch(self, query: str, k: int) -> dict:
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        semaphore, client = self._loop_state()
+        attempt = 0
+        while True:
+            try:
+                async with semaphore:
+                    self.requests += 1
+                    response = await client.get(
+                        f"{self.url}/search", params={"q": query, "k": k},
+                        headers=headers, timeout=self.timeout,
+                    )
+                    response.raise_for_status()
+                    return response.json()
+            except Exception as e:
+                if attempt >= self.retries or not self._retryable(e):
+                    self.failures += 1
+                    raise
+                delay = self._delay(attempt, e)
+            attempt += 1
+            self.retried += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _hits(payload: dict) -> list[SearchHit]:
+        hits = []
+        for rank, result in enumerate(payload.get("results", [])):
+            # Stable id from the API's id (or title) so duplicates can be spotted
+            key = str(result.get("id") or result.get("url") or result.get("title", ""))
+            document = {"title": result.get("title", ""), "snippet": result.get("snippet", "")}
+            score = result.get("score")
+            hits.append(SearchHit(zlib.crc32(key.encode("utf-8")), -rank if score is None else score, document))
+        return hits
+
+    async def search_many(self, queries: list[str], k: int) -> list[list[SearchHit]]:
+        payloads = await asyncio.gather(*(self._fetch(query, k) for query in queries))
+        return [self._hits(payload) for payload in payloads]
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "retried": self.retried, "failures": self.failures}
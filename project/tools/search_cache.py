@@ -0,0 +1,150 @@
+"""
+Single-flight TTL cache for search results.
+
+Concurrent pipelines on related topics fire the same queries at the same
+moment. SearchCache makes sure each distinct query reaches the backend once:
+
+  • Hit       — a fresh cached result is returned immediately.
+  • Coalesced — the same query is already being fetched; wait for that call
+                instead of starting another one.
+  • Miss      — call the backend, then share the result with every waiter.
+
+Entries expire after `ttl` seconds and the least recently used are evicted
+beyond `max_entries`. Failures are passed to every waiter but never cached.
+If the caller that owns a load is cancelled, its waiters are not: they start
+the load again (one of them becomes the new owner).
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used in cache keys.
+
+    >>> normalize_query("  Quantum   Computing ")
+    'quantum computing'
+    """
+    return " ".join(query.lower().split())
+
+
+class _OwnerGone(Exception):
+    """The caller loading a key was cancelled before the load finished."""
+
+
+class SearchCache:
+    """An async LRU + TTL cache that coalesces concurrent identical loads.
+
+    Args:
+        ttl: Seconds a result stays fresh.
+        max_entries: Cached results kept before LRU eviction.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # key → (expires_at, value)
+        self._in_flight: dict = {}  # key → Future of the running load
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _lookup(self, key):
+        """(found, value) for a fresh cached entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def _store(self, key, value) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key, load):
+        """The cached value for `key`, or the result of `await load()`."""
+        return (await self.get_or_load_many([key], lambda keys: _single(load)))[0]
+
+    async def get_or_load_many(self, keys: list, load_many) -> list:
+        """Values for several keys; the misses are loaded in ONE call.
+
+        Args:
+            keys: Cache keys (duplicates allowed).
+            load_many: async function taking the missing keys and returning
+                their values in the same order.
+        """
+        results = {}
+        waiting = {}  # key → Future owned by another caller
+        missing = []
+        for key in dict.fromkeys(keys):
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                results[key] = value
+            elif key in self._in_flight:
+                self.coalesced += 1
+                waiting[key] = self._in_flight[key]
+            else:
+                self.misses += 1
+                missing.append(key)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self._in_flight.update(futures)
+            try:
+                values = await load_many(missing)
+            except BaseException as e:
+                # Waiters were not cancelled themselves: tell them to retry
+                error = _OwnerGone() if isinstance(e, asyncio.CancelledError) else e
+                for future in futures.values():
+                    future.set_exception(error)
+                    future.exception()  # Mark retrieved: nobody else may be waiting
+                raise
+            else:
+                for key, value in zip(missing, values):
+                    self._store(key, value)
+                    futures[key].set_result(value)
+                    results[key] = value
+            finally:
+                for key in missing:
+                    self._in_flight.pop(key, None)
+
+        retry = []
+        for key, future in waiting.items():
+            try:
+                results[key] = await asyncio.shield(future)
+            except _OwnerGone:
+                retry.append(key)
+        if retry:
+            results.update(zip(retry, await self.get_or_load_many(retry, load_many)))
+        return [results[key] for key in keys]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit / miss / coalesced counters and current size."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+        }
+
+
+async def _single(load) -> list:
+    return [await load()]
@@ -0,0 +1,182 @@
+"""
+Inverted index with BM25 ranking.
+
+web_search used to scan every topic for every query and return the first
+one sharing a word with the query. That's wrong as often as it's right
+("computing" matches anything with "computing" in its name) and costs time
+linear in the size of the corpus. SearchIndex instead:
+
+  • tokenizes every document (title + snippet) once, when it is added
+  • keeps a postings list per term: the ids of the documents containing it
+    and how often it occurs there (compact arrays, not Python objects)
+  • scores only the documents that share a term with the query, using
+    Okapi BM25, and returns the top k
+
+Query cost depends on how many documents contain the query terms, not on
+how many documents there are. The same ranking runs over a memory-mapped,
+on-disk index for large corpora (project/tools/corpus.py).
+"""
+
+import heapq
+import math
+import re
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Words too common to say anything about relevance
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the "
+    "this to was were what when where which who why will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens of `text`, without stopwords.
+
+    >>> tokenize("What is Quantum Computing? — IBM")
+    ['quantum', 'computing', 'ibm']
+    """
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def term_counts(document: dict, title_weight: int = 2) -> Counter:
+    """Term frequencies of a {"title", "snippet"} document, titles weighted up."""
+    counts = Counter(tokenize(document.get("snippet", "")))
+    for term in tokenize(document.get("title", "")):
+        counts[term] += title_weight
+    return counts
+
+
+@dataclass
+class SearchHit:
+    """One ranked result of a search()."""
+
+    doc_id: int
+    score: float
+    document: dict
+
+
+class BM25Index(ABC):
+    """Okapi BM25 ranking over postings lists.
+
+    Subclasses decide where postings, length norms and documents live
+    (in memory here, memory-mapped files in project/tools/corpus.py).
+    """
+
+    k1: float
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of documents."""
+
+    @abstractmethod
+    def postings(self, term: str):
+        """(doc ids, term frequencies) for `term`, or None if it never occurs."""
+
+    @abstractmethod
+    def length_norms(self):
+        """Per-document k1 * (1 - b + b * length / average length)."""
+
+    @abstractmethod
+    def document(self, doc_id: int) -> dict:
+        """The {"title", "snippet", ...} document with this id."""
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (always positive)."""
+        postings = self.postings(term)
+        df = len(postings[0]) if postings else 0
+        n = len(self)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 5) -> list[SearchHit]:
+        """The top `k` documents for `query`, best first.
+
+        Only documents sharing at least one term with the query are scored,
+        and only the top `k` documents are loaded.
+        """
+        if not len(self) or k <= 0:
+            return []
+        norms = self.length_norms()
+        k1 = self.k1
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings(term)
+            if postings is None:
+                continue
+            weight = self.idf(term) * (k1 + 1)
+            get = scores.get
+            for doc_id, tf in zip(*postings):
+                scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + norms[doc_id])
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [SearchHit(doc_id, score, self.document(doc_id)) for doc_id, score in top]
+
+
+class SearchIndex(BM25Index):
+    """An in-memory BM25 index over {"title", "snippet", ...} documents.
+
+    Args:
+        k1: Term-frequency saturation. Higher values reward repeated terms more.
+        b: Length normalization (0 = none, 1 = full).
+        title_weight: How many times a title term counts compared to a
+            snippet term.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.documents: list[dict] = []
+        self._postings: dict[str, tuple[array, array]] = {}  # term → (doc ids, term freqs)
+        self._lengths = array("I")
+        self._norms: array | None = None  # Built on first search
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, document: dict) -> int:
+        """Index a document and return its id.
+
+        Args:
+            document: Must have "title" and "snippet"; other keys are kept
+                and returned with search hits.
+        """
+        doc_id = len(self.documents)
+        counts = term_counts(document, self.title_weight)
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"))
+            postings[0].append(doc_id)
+            postings[1].append(tf)
+
+        length = sum(counts.values())
+        self.documents.append(document)
+        self._lengths.append(length)
+        self._norms = None
+        return doc_id
+
+    def extend(self, documents) -> None:
+        for document in documents:
+            self.add(document)
+
+    def postings(self, term: str):
+        return self._postings.get(term)
+
+    def length_norms(self) -> array:
+        if self._norms is None:
+            self._norms = length_norms(self._lengths, self.k1, self.b)
+        return self._norms
+
+    def document(self, doc_id: int) -> dict:
+        return self.documents[doc_id]
+
+
+def length_norms(lengths, k1: float, b: float) -> array:
+    """BM25 length factor of every document, from the document lengths."""
+    avg = (sum(lengths) / len(lengths)) if len(lengths) else 1.0
+    return array("d", (k1 * (1 - b + b * n / (avg or 1.0)) for n in lengths))
@@ -0,0 +1,121 @@
+"""
+Local stand-in for an HTTP search API.
+
+Serves the local corpus over the protocol HttpBackend speaks, so the HTTP
+path (pooling, timeouts, retries, concurrency) can be exercised without an
+external service:
+
+    GET /search?q=<query>&k=<k>
+    → {"results": [{"id": ..., "title": ..., "snippet": ..., "score": ...}]}
+
+--latency adds a delay per request, like a real API's round-trip, and
+--fail-rate answers that fraction of requests with a 503 to exercise retries.
+
+Run it:
+    python -m project.tools.search_server --port 8765 --latency 0.2
+    SEARCH_BACKEND=http SEARCH_API_URL=http://127.0.0.1:8765 python project/main.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from project.tools.search_backends import LocalBackend
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "SearchServer"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/search":
+            self._reply(404, {"error": "not found"})
+            return
+        params = parse_qs(url.query)
+        query = params.get("q", [""])[0]
+        try:
+            k = int(params.get("k", ["5"])[0])
+        except ValueError:
+            self._reply(400, {"error": "k must be an integer"})
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if random.random() < self.server.fail_rate:
+            self._reply(503, {"error": "simulated failure"})
+            return
+
+        hits = self.server.backend.search_sync(query, k)
+        self._reply(200, {"results": [
+            {"id": h.doc_id, "title": h.document.get("title", ""),
+             "snippet": h.document.get("snippet", ""), "score": h.score}
+            for h in hits
+        ]})
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+class SearchServer(ThreadingHTTPServer):
+    """A threaded HTTP server answering /search from a LocalBackend."""
+
+    daemon_threads = True
+
+    def __init__(self, address, backend: LocalBackend, latency: float = 0.0, fail_rate: float = 0.0):
+        super().__init__(address, _Handler)
+        self.backend = backend
+        self.latency = latency
+        self.fail_rate = fail_rate
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(
+    backend: LocalBackend | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    fail_rate: float = 0.0,
+) -> SearchServer:
+    """Start a SearchServer in a background thread (port 0 = any free port).
+
+    Call .shutdown() on the returned server to stop it.
+    """
+    if backend is None:
+        from config import setting
+
+        backend = LocalBackend(setting("SEARCH_CORPUS"), setting("SEARCH_INDEX"), setting("SEARCH_MODE"))
+    server = SearchServer((host, port), backend, latency, fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the local search corpus over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    server = start_server(host=args.host, port=args.port, latency=args.latency, fail_rate=args.fail_rate)
+    print(f"Search API on {server.url}/search?q=... (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,303 @@
+"""
+Semantic search over the search corpus with NumPy.
+
+Keyword search only finds documents that share a query's exact terms, so a
+rephrased query ("quantum computer problems" vs "challenges in quantum
+computing") can come back empty and cost the researcher another LLM turn.
+SemanticIndex ranks by vector similarity instead:
+
+  • Every document is embedded once and stored as one contiguous matrix
+    (float32, or float16 / int8 to cut memory 2x / 4x).
+  • A batch of queries is answered with one matrix multiply per block of
+    rows, then an argpartition for the top k of each query.
+  • HashingEmbedder runs locally with no network: hashed word and character
+    trigram features, TF-IDF weighted. It catches inflections and partial
+    overlaps ("computers" ~ "computing"); anything with an
+    embed(texts) -> (n, dim) float32 method, e.g. a real embedding model,
+    can replace it.
+
+SEARCH_MODE=hybrid fuses keyword and semantic rankings (reciprocal rank
+fusion), which is usually better than either alone.
+
+Precompute embeddings for an on-disk index (loaded with mmap afterwards;
+they are rejected if the index has been rebuilt from other documents since):
+    python -m project.tools.semantic build project/data/search_index --dtype int8
+"""
+
+import argparse
+import json
+import math
+import os
+import zlib
+
+import numpy as np
+
+from project.tools.search_index import BM25Index, SearchHit, tokenize
+
+DTYPES = ("float32", "float16", "int8")
+
+
+# ── Embedding ───────────────────────────────────────────────────────
+class HashingEmbedder:
+    """Local text embedder: signed feature hashing + optional IDF weighting.
+
+    Args:
+        dim: Embedding size.
+        trigram_weight: Weight of character trigram features relative to
+            whole words (0 disables them).
+    """
+
+    def __init__(self, dim: int = 256, trigram_weight: float = 0.5):
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+        self.idf: np.ndarray | None = None
+
+    def _features(self, text: str):
+        for token in tokenize(text):
+            yield token, 1.0
+            if self.trigram_weight:
+                padded = f"#{token}#"
+                for i in range(len(padded) - 2):
+                    yield padded[i:i + 3], self.trigram_weight
+
+    def _hashed(self, texts: list[str]) -> np.ndarray:
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                rows.append(row)
+                cols.append(h % self.dim)
+                # The sign bit keeps colliding features from always adding up
+                values.append(weight if h & 0x80000000 else -weight)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), values)
+        return matrix
+
+    def fit(self, batches) -> "HashingEmbedder":
+        """Learn per-dimension IDF weights from a corpus, given as batches of texts."""
+        df = np.zeros(self.dim, dtype=np.int64)
+        n = 0
+        for texts in batches:
+            df += np.count_nonzero(self._hashed(texts), axis=0)
+            n += len(texts)
+        self.idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        return self
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Unit-length embeddings, shape (len(texts), dim)."""
+        matrix = self._hashed(texts)
+        if self.idf is not None:
+            matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def to_dict(self) -> dict:
+        return {"dim": self.dim, "trigram_weight": self.trigram_weight}
+
+
+def _corpus_id(index: BM25Index) -> dict:
+    """Which documents an index holds: their count, and its corpus hash if on disk."""
+    return {"documents": len(index), "corpus": getattr(index, "meta", {}).get("corpus")}
+
+
+def document_text(document: dict) -> str:
+    return f"{document.get('title', '')}. {document.get('snippet', '')}"
+
+
+# ── Quantization ────────────────────────────────────────────────────
+def quantize(matrix: np.ndarray, dtype: str) -> tuple[np.ndarray, np.ndarray | None]:
+    """Store float32 rows as `dtype`. int8 rows get a per-row scale.
+
+    Returns:
+        (stored matrix, per-row scales or None)
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype {dtype!r}; expected one of {DTYPES}")
+    if dtype != "int8":
+        return np.ascontiguousarray(matrix, dtype=dtype), None
+    scales = np.abs(matrix).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return np.ascontiguousarray(quantized), scales.astype(np.float32)
+
+
+# ── Index ───────────────────────────────────────────────────────────
+class SemanticIndex:
+    """Cosine top-k search over embedded documents of a keyword index.
+
+    Documents themselves stay in `index` (in memory or memory-mapped); this
+    class only holds the embedding matrix.
+
+    Args:
+        index: The keyword index the documents come from.
+        embedder: Embeds queries (must be the one that embedded the matrix).
+        matrix: One unit-length embedding per document, float32/float16/int8.
+        scales: Per-row scales when `matrix` is int8.
+    """
+
+    def __init__(self, index: BM25Index, embedder, matrix: np.ndarray, scales: np.ndarray | None = None):
+        if len(matrix) != len(index):
+            raise ValueError(f"{len(matrix)} embeddings for {len(index)} documents")
+        self.index = index
+        self.embedder = embedder
+        self.matrix = matrix
+        self.scales = scales
+
+    @classmethod
+    def build(
+        cls,
+        index: BM25Index,
+        embedder: HashingEmbedder | None = None,
+        dtype: str = "float32",
+        batch_size: int = 4096,
+    ) -> "SemanticIndex":
+        """Embed every document of `index` (in batches of `batch_size`).
+
+        A HashingEmbedder without IDF weights is fitted on the corpus first,
+        which takes a second pass over the documents.
+        """
+        embedder = embedder or HashingEmbedder()
+
+        def batches():
+            for start in range(0, len(index), batch_size):
+                stop = min(start + batch_size, len(index))
+                yield start, [document_text(index.document(i)) for i in range(start, stop)]
+
+        if isinstance(embedder, HashingEmbedder) and embedder.idf is None:
+            embedder.fit(texts for _, texts in batches())
+
+        stored, scales = None, None
+        for start, texts in batches():
+            block, block_scales = quantize(embedder.embed(texts), dtype)
+            if stored is None:
+                stored = np.empty((len(index), embedder.dim), dtype=block.dtype)
+                scales = np.empty(len(index), dtype=np.float32) if block_scales is not None else None
+            stored[start:start + len(texts)] = block
+            if scales is not None:
+                scales[start:start + len(texts)] = block_scales
+        if stored is None:
+            stored = np.empty((0, embedder.dim), dtype=dtype)
+            scales = np.empty(0, dtype=np.float32) if dtype == "int8" else None
+        return cls(index, embedder, stored, scales)
+
+    def save(self, directory: str) -> None:
+        """Write embeddings next to an on-disk index (see load()).
+
+        embedder.json also records which documents were embedded (their count
+        and the index's corpus hash), so load() can tell they went stale.
+        """
+        np.save(os.path.join(directory, "embeddings.npy"), self.matrix)
+        if self.scales is not None:
+            np.save(os.path.join(directory, "embedding_scales.npy"), self.scales)
+        if self.embedder.idf is not None:
+            np.save(os.path.join(directory, "embedding_idf.npy"), self.embedder.idf)
+        with open(os.path.join(directory, "embedder.json"), "w", encoding="utf-8") as f:
+            json.dump({**self.embedder.to_dict(), **_corpus_id(self.index)}, f)
+
+    @classmethod
+    def load(cls, index: BM25Index, directory: str) -> "SemanticIndex":
+        """Open saved embeddings memory-mapped, so workers share one copy.
+
+        Raises:
+            ValueError: The embeddings were built for other documents than
+                `index` holds (rebuild them).
+        """
+        with open(os.path.join(directory, "embedder.json"), encoding="utf-8") as f:
+            settings = json.load(f)
+        built_for = {key: settings.pop(key, None) for key in ("documents", "corpus")}
+        if built_for != _corpus_id(index):
+            raise ValueError(
+                f"Embeddings in {directory} were built for a different corpus; "
+                f"rebuild them with: python -m project.tools.semantic build {directory}"
+            )
+        embedder = HashingEmbedder(**settings)
+        idf_path = os.path.join(directory, "embedding_idf.npy")
+        if os.path.exists(idf_path):
+            embedder.idf = np.load(idf_path)
+        scales_path = os.path.join(directory, "embedding_scales.npy")
+        scales = np.load(scales_path) if os.path.exists(scales_path) else None
+        matrix = np.load(os.path.join(directory, "embeddings.npy"), mmap_mode="r")
+        return cls(index, embedder, matrix, scales)
+
+    def scores(self, queries: np.ndarray, block_size: int = 65536) -> np.ndarray:
+        """Cosine similarity of every document to every query, shape (docs, queries).
+
+        Rows are processed in blocks so float16/int8 matrices are only widened
+        to float32 one block at a time.
+        """
+        queries_t = np.ascontiguousarray(queries.T, dtype=np.float32)
+        if self.matrix.dtype == np.float32 and len(self.matrix) <= block_size:
+            return self.matrix @ queries_t
+        out = np.empty((len(self.matrix), queries_t.shape[1]), dtype=np.float32)
+        for start in range(0, len(self.matrix), block_size):
+            block = np.asarray(self.matrix[start:start + block_size], dtype=np.float32)
+            out[start:start + len(block)] = block @ queries_t
+        if self.scales is not None:
+            out *= self.scales[:, None]
+        return out
+
+    def search_many(self, queries: list[str], k: int = 5) -> list[list[SearchHit]]:
+        """Top `k` documents for each query, best first (one matrix multiply)."""
+        if not queries or not len(self.index) or k <= 0:
+            return [[] for _ in queries]
+        scores = self.scores(self.embedder.embed(queries))
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1, axis=0)[:k]
+
+        results = []
+        for q in range(len(queries)):
+            ids = top[:, q][np.argsort(-scores[top[:, q], q])]
+            results.append([
+                SearchHit(int(i), float(scores[i, q]), self.index.document(int(i)))
+                for i in ids if scores[i, q] > 0
+            ])
+        return results
+
+    def search(self, query: str, k: int = 5) -> list[SearchHit]:
+        return self.search_many([query], k)[0]
+
+
+def hybrid_search(keyword: BM25Index, semantic: SemanticIndex, query: str, k: int = 5) -> list[SearchHit]:
+    """Fuse keyword and semantic rankings with reciprocal rank fusion.
+
+    Each document scores sum(1 / (60 + rank)) over the rankings it appears
+    in, so agreeing rankings reinforce each other and score scales don't
+    need to be comparable.
+    """
+    fused: dict[int, float] = {}
+    hits: dict[int, SearchHit] = {}
+    for ranking in (keyword.search(query, 2 * k), semantic.search(query, 2 * k)):
+        for rank, hit in enumerate(ranking):
+            fused[hit.doc_id] = fused.get(hit.doc_id, 0.0) + 1 / (60 + rank)
+            hits.setdefault(hit.doc_id, hit)
+    best = sorted(fused, key=fused.get, reverse=True)[:k]
+    return [SearchHit(doc_id, fused[doc_id], hits[doc_id].document) for doc_id in best]
+
+
+if __name__ == "__main__":
+    from project.tools.corpus import MappedIndex
+
+    parser = argparse.ArgumentParser(description="Build or query semantic embeddings for an index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Embed every document of an on-disk index")
+    build.add_argument("directory", help="Index directory (from project.tools.corpus build)")
+    build.add_argument("--dtype", choices=DTYPES, default="float32")
+    build.add_argument("--dim", type=int, default=256)
+
+    search = commands.add_parser("search", help="Semantic query against an index")
+    search.add_argument("directory")
+    search.add_argument("query", nargs="+")
+    search.add_argument("-k", type=int, default=5)
+
+    args = parser.parse_args()
+    index = MappedIndex(args.directory)
+    if args.command == "build":
+        semantic = SemanticIndex.build(index, HashingEmbedder(dim=args.dim), dtype=args.dtype)
+        semantic.save(args.directory)
+        size = semantic.matrix.nbytes / 1024 / 1024
+        print(f"Embedded {len(index):,} documents ({args.dtype}, {math.ceil(size)} MB) → {args.directory}")
+    else:
+        semantic = SemanticIndex.load(index, args.directory)
+        for hit in semantic.search(" ".join(args.query), args.k):
+            print(f"{hit.score:7.3f}  {hit.document.get('title', '')}")
@@ -1,116 +1,106 @@
 """
 Simulated web search tool.
 
-In a real project, you'd replace this with:
+By default it searches a small local corpus. In a real project, point
+SEARCH_BACKEND=http at a search API (see project/tools/search_backends.py):
   - Tavily API (tavily.com) — built for AI agents
   - Brave Search API
   - SerpAPI / Google Custom Search
-  - Or httpx calls to any search API
+  - Or any service answering GET /search?q=...&k=...
 """
 
 from agents import function_tool, RunContextWrapper
 
-# ── Simulated search database ───────────────────────────────────────
-# Enough content to make the demos realistic and educational.
-
-SEARCH_DATA = {
-    "quantum computing": [
-        {
-            "title": "What is Quantum Computing? — IBM",
-            "snippet": (
-                "Quantum computing uses quantum bits (qubits) that can exist in superposition, "
-                "representing both 0 and 1 simultaneously. This enables quantum computers to "
-                "solve certain problems exponentially faster than classical computers."
-            ),
-        },
-        {
-            "title": "Quantum Computing Applications — Nature",
-            "snippet": (
-                "Key applications include drug discovery, cryptography, optimization problems, "
-                "financial modeling, and materials science. Google's Sycamore achieved quantum "
-                "supremacy in 2019, solving a problem in 200 seconds that would take a "
-                "classical supercomputer 10,000 years."
-            ),
-        },
-        {
-            "title": "Challenges in Quantum Computing — MIT Technology Review",
-            "snippet": (
-                "Major challenges include qubit decoherence, error correction, and the need for "
-                "extremely low temperatures (near absolute zero). Current quantum computers have "
-                "50-1000+ qubits, but millions may be needed for practical applications."
-            ),
-        },
-    ],
-    "renewable energy": [
-        {
-            "title": "State of Renewable Energy 2025 — IEA",
-            "snippet": (
-                "Renewable energy accounted for 30% of global electricity generation in 2024. "
-                "Solar and wind are now the cheapest sources of new electricity in most countries. "
-                "Global investment in clean energy reached $1.8 trillion in 2024."
-            ),
-        },
-        {
-            "title": "Future of Energy Storage — Bloomberg NEF",
-            "snippet": (
-                "Battery storage costs have fallen 90% since 2010. Grid-scale storage is essential "
-                "for renewable reliability. New technologies like solid-state batteries and green "
-                "hydrogen are emerging as game-changers."
-            ),
-        },
-        {
-            "title": "Renewable Energy Challenges — World Economic Forum",
-            "snippet": (
-                "Key challenges include grid infrastructure, intermittency, supply chain for "
-                "critical minerals, and political/regulatory barriers. However, the economic case "
-                "for renewables continues to strengthen."
-            ),
-        },
-    ],
-    "artificial intelligence": [
-        {
-            "title": "The State of AI — Stanford HAI Report",
-            "snippet": (
-                "AI systems now match or exceed human performance in image classification, "
-                "language understanding, and code generation. Foundation models (LLMs) are "
-                "being applied across every industry."
-            ),
-        },
-        {
-            "title": "AI Agents — OpenAI Research",
-            "snippet": (
-                "Agentic AI systems can autonomously plan, use tools, and complete multi-step "
-                "tasks. Multi-agent systems enable collaboration between specialized AI agents, "
-                "mimicking how human teams work."
-            ),
-        },
-        {
-            "title": "AI Risks and Governance — OECD",
-            "snippet": (
-                "Key concerns include bias, misinformation, job displacement, and autonomous "
-                "weapons. Over 60 countries have published AI governance frameworks. "
-                "The EU AI Act is the most comprehensive regulation to date."
-            ),
-        },
-    ],
-}
+from config import ConfigError, setting
+from project.tools.search_backends import MODES, HttpBackend, LocalBackend, SearchBackend
+from project.tools.compaction import compact_results, record
+from project.tools.search_cache import SearchCache, normalize_query
+
+# ── Backend ─────────────────────────────────────────────────────────
+# SEARCH_BACKEND=local ranks the simulated corpus in project/data (see
+# LocalBackend); SEARCH_BACKEND=http calls the API at SEARCH_API_URL.
+
+_backend: SearchBackend | None = None
+
+
+def get_backend() -> SearchBackend:
+    """The configured search backend (created on first use)."""
+    global _backend
+    if _backend is None:
+        kind = setting("SEARCH_BACKEND")
+        if kind == "local":
+            mode = setting("SEARCH_MODE")
+            if mode not in MODES:
+                raise ConfigError(f"SEARCH_MODE must be one of {MODES}, not {mode!r}")
+            _backend = LocalBackend(setting("SEARCH_CORPUS"), setting("SEARCH_INDEX"), mode)
+        elif kind == "http":
+            if not setting("SEARCH_API_URL"):
+                raise ConfigError("SEARCH_BACKEND=http needs SEARCH_API_URL")
+            _backend = HttpBackend(
+                setting("SEARCH_API_URL"),
+                api_key=setting("SEARCH_API_KEY") or None,
+                timeout=setting("SEARCH_TIMEOUT"),
+                retries=setting("SEARCH_RETRIES"),
+                concurrency=setting("SEARCH_CONCURRENCY"),
+            )
+        else:
+            raise ConfigError(f"SEARCH_BACKEND must be local or http, not {kind!r}")
+    return _backend
+
+
+# ── Result cache ────────────────────────────────────────────────────
+# Identical queries from concurrent pipelines hit the backend once.
+
+_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    global _cache
+    if _cache is None:
+        _cache = SearchCache(ttl=setting("SEARCH_CACHE_TTL"), max_entries=setting("SEARCH_CACHE_SIZE"))
+    return _cache
+
+
+def search_cache_stats() -> dict:
+    """Hit / miss / coalesced counters of the search result cache."""
+    return get_search_cache().stats()
+
+
+async def cached_search_many(queries: list[str], k: int):
+    """Backend search_many() through the single-flight cache."""
+    backend = get_backend()
+    keys = [(backend.name, setting("SEARCH_MODE"), normalize_query(query), k) for query in queries]
+
+    async def load(missing):
+        return await backend.search_many([key[2] for key in missing], k)
+
+    return await get_search_cache().get_or_load_many(keys, load)
+
+
+async def cached_search(query: str, k: int):
+    return (await cached_search_many([query], k))[0]
+
+
+def _compact(tool: str, query: str, hits, max_tokens: int, seen=None) -> list:
+    """(hit, compacted document) for the hits that fit the token budget."""
+    original = [h.document for h in hits]
+    compacted = compact_results(query, original, max_tokens, seen)
+    record(tool, original, [document for _, document in compacted])
+    return [(hits[index], document) for index, document in compacted]
 
 
 @function_tool
-def web_search(query: str) -> str:
+async def web_search(query: str, max_tokens: int = 400) -> str:
     """Search the web for information on a topic.
 
     Args:
         query: The search query string.
+        max_tokens: Token budget for the results; the most relevant sentences
+            are kept (0 = no limit).
     """
-    # Find the best matching topic
-    query_lower = query.lower()
-    for topic, results in SEARCH_DATA.items():
-        if topic in query_lower or any(word in query_lower for word in topic.split()):
-            formatted = []
-            for r in results:
-                formatted.append(f"**{r['title']}**\n{r['snippet']}")
-            return "\n\n".join(formatted)
+    results = _compact("web_search", query, await cached_search(query, k=3), max_tokens)
+    if results:
+        return "\n\n".join(f"**{d['title']}**\n{d['snippet']}" for _, d in results)
 
     # Fallback: return generic results
     return (
@@ -121,20 +111,56 @@ def web_search(query: str) -> str:
 
 
 @function_tool
-def web_search_detailed(query: str, num_results: int) -> str:
+async def web_search_detailed(query: str, num_results: int, max_tokens: int = 400) -> str:
     """Search the web with a specified number of results.
 
     Args:
         query: The search query string.
         num_results: Maximum number of results to return (1-5).
+        max_tokens: Token budget for the results; the most relevant sentences
+            are kept (0 = no limit).
+    """
+    hits = await cached_search(query, k=num_results)
+    results = _compact("web_search_detailed", query, hits, max_tokens)
+    if not results:
+        return f"No results found for '{query}'"
+
+    formatted = []
+    for i, (_, d) in enumerate(results, 1):
+        formatted.append(f"{i}. **{d['title']}**\n   {d['snippet']}")
+    return "\n\n".join(formatted)
+
+
+@function_tool
+async def web_search_many(queries: list[str], k: int = 3, max_tokens: int = 800) -> str:
+    """Run several searches in one call, instead of calling web_search repeatedly.
+
+    Results are grouped by query. A source already listed under an earlier
+    query is only referenced, not repeated.
+
+    Args:
+        queries: The search queries, e.g. one per subtopic.
+        k: Maximum number of results per query (1-5).
+        max_tokens: Token budget for all results together, split evenly
+            across queries (0 = no limit).
     """
-    query_lower = query.lower()
-    for topic, results in SEARCH_DATA.items():
-        if topic in query_lower or any(word in query_lower for word in topic.split()):
-            limited = results[:num_results]
-            formatted = []
-            for i, r in enumerate(limited, 1):
-                formatted.append(f"{i}. **{r['title']}**\n   {r['snippet']}")
-            return "\n\n".join(formatted)
-
-    return f"No results found for '{query}'"
+    if not queries:
+        return "No queries given."
+
+    budget = max_tokens // len(queries) if max_tokens else 0
+    seen_docs: dict[int, int] = {}  # doc id → number of the query that first listed it
+    seen_text: list = []  # Snippet fingerprints, for near-duplicates with other ids
+    sections = []
+    for n, (query, hits) in enumerate(zip(queries, await cached_search_many(queries, k)), 1):
+        lines = [f"## Query {n}: {query}"]
+        repeats = [h for h in hits if h.doc_id in seen_docs]
+        fresh = [h for h in hits if h.doc_id not in seen_docs]
+        for i, (h, d) in enumerate(_compact("web_search_many", query, fresh, budget, seen_text), 1):
+            seen_docs[h.doc_id] = n
+            lines.append(f"{i}. **{d['title']}**\n   {d['snippet']}")
+        for h in repeats:
+            lines.append(f"- **{h.document['title']}** (see Query {seen_docs[h.doc_id]})")
+        if len(lines) == 1:
+            lines.append("No results found.")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)